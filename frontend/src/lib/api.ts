@@ -85,8 +85,8 @@ export const collectionApi = {
   trigger: (sourceId: string, maxPosts?: number) =>
     api.post<CollectionResult>(`/collection/trigger/${sourceId}`, { max_posts: maxPosts }),
   getStatus: (sourceId: string) => api.get(`/collection/status/${sourceId}`),
-  getPosts: (params?: { source_id?: string; limit?: number; offset?: number }) =>
-    api.get<{ items: Post[]; total: number; page: number; size: number }>('/collection/posts', { params }),
+  getPosts: (params?: { source_id?: string; limit?: number; cursor?: string; page?: number }) =>
+    api.get<{ items: Post[]; total: number; page: number; size: number; next_cursor: string | null }>('/collection/posts', { params }),
   getPost: (postId: string) => api.get<Post>(`/collection/posts/${postId}`),
 };
 
@@ -95,8 +95,8 @@ export const factcheckApi = {
   checkPost: (postId: string, manualSources?: string[]) =>
     api.post<FactCheckResult>(`/factcheck/${postId}`, { manual_sources: manualSources }),
   getResult: (postId: string) => api.get<FactCheckResult>(`/factcheck/${postId}`),
-  listResults: (params?: { post_id?: string; verdict?: string; limit?: number }) =>
-    api.get<{ items: FactCheckResult[]; total: number; page: number; size: number }>('/factcheck/results/list', { params }),
+  listResults: (params?: { post_id?: string; verdict?: string; limit?: number; cursor?: string; page?: number }) =>
+    api.get<{ items: FactCheckResult[]; total: number; page: number; size: number; next_cursor: string | null }>('/factcheck/results/list', { params }),
 };
 
 // Statistics API
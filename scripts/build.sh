@@ -311,6 +311,8 @@ if [ "$BUILD_MODE" = "4" ] || [ "$BUILD_MODE" = "6" ]; then
     # Tesztek futtatása
     if ask_yes_no "Szeretnéd futtatni a teszteket?" "y"; then
         print_info "Pytest futtatása..."
+        # A hot query indexlefedettség tesztjei a fenti MongoDB-n futnak
+        MONGODB_TEST_URL="${MONGODB_TEST_URL:-mongodb://localhost:27017}" \
         pytest tests/ -v --cov=src --cov-report=html --cov-report=term || {
             print_warning "Néhány teszt sikertelen lehet. Nézd meg a részleteket fent."
         }
@@ -0,0 +1,109 @@
+"""
+Concurrency Helpers for the API
+Bounded thread pool for blocking work and event loop lag monitoring
+"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for blocking work of request handlers"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().API_BLOCKING_THREADS,
+            thread_name_prefix="api-blocking"
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking callable (upstream HTTP, synchronous services) off the event loop
+
+    At most API_BLOCKING_THREADS calls run at once; further calls wait for a
+    free thread without blocking the loop.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_blocking_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_blocking_executor() -> None:
+    """Stop the thread pool (on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed sleep
+
+    A handler blocking the loop shows up as lag of roughly its blocking time.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - started - self.interval, 0.0)
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag > get_settings().API_LOOP_LAG_WARNING:
+                logger.warning(f"Event loop lag: {lag * 1000:.0f} ms")
+
+    def start(self) -> None:
+        """Start sampling on the running loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag statistics in milliseconds"""
+        return {
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,158 @@
+"""
+Keyset Pagination for the API
+Opaque cursor tokens over (sort field, _id) and cheap list totals
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+
+from src.models.counters import counter_key, placeholder_update, seeded_count_update
+
+
+def encode_cursor(sort_value: datetime, document_id: ObjectId) -> str:
+    """
+    Build the cursor token that resumes after a document
+
+    Args:
+        sort_value: Sort field value of the last document on the page
+        document_id: _id of the last document on the page
+
+    Returns:
+        URL-safe opaque token
+    """
+    payload = json.dumps({"v": sort_value.isoformat(), "id": str(document_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """
+    Read a cursor token
+
+    Args:
+        token: Token from a previous page's next_cursor
+
+    Returns:
+        Tuple of (sort field value, _id)
+
+    Raises:
+        HTTPException: 400 if the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["v"]), ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(
+    query: Dict[str, Any],
+    sort_field: str,
+    cursor: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Add the "after cursor" condition for a (sort_field desc, _id desc) order
+
+    Args:
+        query: Base find filter
+        sort_field: Descending sort field
+        cursor: Optional cursor token
+
+    Returns:
+        Find filter for the page
+    """
+    if not cursor:
+        return query
+    sort_value, document_id = decode_cursor(cursor)
+    after = {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": document_id}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    sort_field: str,
+    size: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read one page in (sort_field desc, _id desc) order
+
+    The page is found with an index seek, so every page costs the same
+    regardless of how deep it is.
+
+    Args:
+        collection: Motor collection
+        query: Base find filter
+        sort_field: Descending sort field
+        size: Page size
+        cursor: Optional cursor token of the previous page
+
+    Returns:
+        Tuple of (documents, next cursor token or None on the last page)
+    """
+    documents = await (
+        collection
+        .find(keyset_filter(query, sort_field, cursor))
+        .sort([(sort_field, -1), ("_id", -1)])
+        .limit(size + 1)
+        .to_list(length=size + 1)
+    )
+
+    next_cursor = None
+    if len(documents) > size:
+        documents = documents[:size]
+        last = documents[-1]
+        next_cursor = encode_cursor(last[sort_field], last["_id"])
+    return documents, next_cursor
+
+
+async def count_total(db, collection_name: str, query: Dict[str, Any]) -> int:
+    """
+    Total for a list response without counting on every request
+
+    Unfiltered lists use the collection metadata count. Filters with a
+    maintained counter (see src.models.counters) read it, creating it with
+    one full count on first use; it is an estimate corrected nightly by
+    reconcile_counters. Other filters are counted.
+
+    Args:
+        db: Motor database
+        collection_name: Collection name
+        query: Base find filter (without the cursor condition)
+
+    Returns:
+        Number of matching documents (estimated for unfiltered and counted lists)
+    """
+    collection = db[collection_name]
+    if not query:
+        return await collection.estimated_document_count()
+
+    key = counter_key(collection_name, query)
+    if key is None:
+        return await collection.count_documents(query)
+
+    counter = await db.counters.find_one({"_id": key})
+    if counter is None:
+        await db.counters.update_one({"_id": key}, placeholder_update(collection_name, query), upsert=True)
+        count = await collection.count_documents(query)
+        # Only one of concurrent first readers seeds the counter
+        counter = await db.counters.find_one_and_update(
+            {"_id": key, "seeding": True},
+            seeded_count_update(count),
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["count"] if counter else count
+    if counter.get("seeding"):
+        # Another request is counting right now
+        return await collection.count_documents(query)
+    return counter["count"]
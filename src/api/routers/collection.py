@@ -7,14 +7,18 @@ from typing import Optional, List
 from datetime import datetime
 
 from src.services.collection.tasks import (
-    collect_facebook_posts_task,
     collect_mti_feed_task,
     collect_magyar_kozlony_task,
-    collect_rss_feed_task
+    collect_rss_feed_task,
+    get_task_for_source_type,
+    get_queue_for_source_type
 )
+from src.celery_app import celery_app
 from src.services.collection.news import MTIService, MagyarKozlonyService, RSSReaderService
 from src.services.core.source_service import SourceService
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_mongodb
+from src.api.concurrency import run_blocking
+from src.api.pagination import fetch_page, count_total
 
 router = APIRouter(prefix="/api/collection", tags=["collection"])
 
@@ -38,11 +42,22 @@ class PostResponse(BaseModel):
         from_attributes = True
 
 
+class PostListResponse(BaseModel):
+    items: List[PostResponse]
+    total: int
+    page: int
+    size: int
+    next_cursor: Optional[str] = None
+
+
 class CollectionStatusResponse(BaseModel):
     source_id: str
     is_active: bool
     last_collected_at: Optional[datetime]
     last_collection_status: Optional[str]
+    next_collection_at: Optional[datetime] = None
+    collection_interval_seconds: Optional[float] = None
+    new_items_rate: Optional[float] = None  # Smoothed new items per hour
 
 
 @router.post("/trigger/{source_id}", response_model=CollectionTriggerResponse)
@@ -68,8 +83,13 @@ async def trigger_collection(source_id: str, background_tasks: BackgroundTasks):
                 detail="Source is not active"
             )
         
-        # Trigger collection task
-        task = collect_facebook_posts_task.delay(source_id)
+        # Trigger the collection task of the source type
+        task = await run_blocking(
+            celery_app.send_task,
+            get_task_for_source_type(source.source_type),
+            args=[source_id],
+            queue=get_queue_for_source_type(source.source_type)
+        )
         
         return CollectionTriggerResponse(
             source_id=source_id,
@@ -103,16 +123,20 @@ async def get_collection_status(source_id: str):
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
         
-        db = connect_mongodb_sync()
-        source_doc = db.sources.find_one({"_id": source._id})
+        db = await get_mongodb()
+        source_doc = await db.sources.find_one({"_id": source._id})
         
         last_collected_at = source_doc.get("last_collected_at") if source_doc else None
+        schedule = (source_doc.get("schedule") if source_doc else None) or {}
         
         return CollectionStatusResponse(
             source_id=source_id,
             is_active=source.is_active,
             last_collected_at=last_collected_at,
-            last_collection_status="unknown"  # Could be improved with task status tracking
+            last_collection_status="unknown",  # Could be improved with task status tracking
+            next_collection_at=schedule.get("next_collection_at"),
+            collection_interval_seconds=schedule.get("interval_seconds"),
+            new_items_rate=schedule.get("new_items_rate")
         )
         
     except HTTPException:
@@ -124,52 +148,59 @@ async def get_collection_status(source_id: str):
         )
 
 
-@router.get("/posts", response_model=List[PostResponse])
+@router.get("/posts", response_model=PostListResponse)
 async def get_posts(
     source_id: Optional[str] = None,
-    limit: int = 50,
-    skip: int = 0
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    page: int = Query(1, ge=1, description="Page number shown to the client (informational)")
 ):
     """
-    Get posts with optional filtering
+    Get posts with optional filtering, newest first
     
     Args:
         source_id: Optional source ID filter
         limit: Maximum number of posts to return
-        skip: Number of posts to skip
+        cursor: Cursor token of the previous page
+        page: Page number echoed back to the client
         
     Returns:
-        List of posts
+        Page of posts with total and the cursor of the next page
     """
     try:
-        db = connect_mongodb_sync()
+        db = await get_mongodb()
         
         query = {}
         if source_id:
             query["source_id"] = source_id
         
-        # Get posts sorted by posted_at descending
-        cursor = (
-            db.posts
-            .find(query)
-            .sort("posted_at", -1)
-            .skip(skip)
-            .limit(limit)
+        # Keyset page on (posted_at, _id) descending
+        post_docs, next_cursor = await fetch_page(
+            db.posts, query, "posted_at", limit, cursor
         )
         
-        posts = []
-        for post_doc in cursor:
-            posts.append(PostResponse(
+        posts = [
+            PostResponse(
                 id=str(post_doc["_id"]),
                 source_id=post_doc["source_id"],
                 content=post_doc["content"],
                 posted_at=post_doc["posted_at"],
                 collected_at=post_doc["collected_at"],
                 metadata=post_doc.get("metadata", {})
-            ))
+            )
+            for post_doc in post_docs
+        ]
         
-        return posts
+        return PostListResponse(
+            items=posts,
+            total=await count_total(db, "posts", query),
+            page=page,
+            size=limit,
+            next_cursor=next_cursor
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -191,8 +222,8 @@ async def get_post(post_id: str):
     try:
         from bson import ObjectId
         
-        db = connect_mongodb_sync()
-        post_doc = db.posts.find_one({"_id": ObjectId(post_id)})
+        db = await get_mongodb()
+        post_doc = await db.posts.find_one({"_id": ObjectId(post_id)})
         
         if not post_doc:
             raise HTTPException(status_code=404, detail="Post not found")
@@ -228,7 +259,8 @@ async def collect_mti_news(
     try:
         if background:
             # Run as Celery task
-            task = collect_mti_feed_task.delay(
+            task = await run_blocking(
+                collect_mti_feed_task.delay,
                 feed_type=feed_type,
                 feed_url=feed_url,
                 max_items=max_items
@@ -241,7 +273,8 @@ async def collect_mti_news(
         else:
             # Run synchronously
             mti_service = MTIService()
-            result = mti_service.collect_articles(
+            result = await run_blocking(
+                mti_service.collect_articles,
                 feed_type=feed_type,
                 feed_url=feed_url,
                 max_items=max_items,
@@ -251,6 +284,7 @@ async def collect_mti_news(
             return {
                 "success": True,
                 "feed_type": feed_type,
+                "not_modified": result.get("not_modified", False),
                 "articles_fetched": result.get("articles_fetched", 0),
                 "articles_stored": result.get("articles_stored", 0)
             }
@@ -280,7 +314,8 @@ async def search_mti_articles(
     """Search for MTI articles"""
     try:
         mti_service = MTIService()
-        articles = mti_service.search_articles(
+        articles = await run_blocking(
+            mti_service.search_articles,
             query=query,
             category=category,
             limit=limit
@@ -307,7 +342,8 @@ async def collect_magyar_kozlony(
     try:
         if background:
             # Run as Celery task
-            task = collect_magyar_kozlony_task.delay(
+            task = await run_blocking(
+                collect_magyar_kozlony_task.delay,
                 max_items=max_items,
                 year=year,
                 fetch_details=fetch_details
@@ -320,7 +356,8 @@ async def collect_magyar_kozlony(
         else:
             # Run synchronously
             kozlony_service = MagyarKozlonyService()
-            result = kozlony_service.collect_publications(
+            result = await run_blocking(
+                kozlony_service.collect_publications,
                 max_items=max_items,
                 year=year,
                 store=True,
@@ -346,7 +383,8 @@ async def search_magyar_kozlony(
     """Search for Magyar Közlöny publications"""
     try:
         kozlony_service = MagyarKozlonyService()
-        publications = kozlony_service.search_publications(
+        publications = await run_blocking(
+            kozlony_service.search_publications,
             query=query,
             year=year,
             limit=limit
@@ -374,7 +412,8 @@ async def collect_rss_feed(
     try:
         if background:
             # Run as Celery task
-            task = collect_rss_feed_task.delay(
+            task = await run_blocking(
+                collect_rss_feed_task.delay,
                 feed_url=feed_url,
                 max_items=max_items,
                 feed_name=feed_name
@@ -387,7 +426,8 @@ async def collect_rss_feed(
         else:
             # Run synchronously
             rss_service = RSSReaderService()
-            result = rss_service.collect_feed(
+            result = await run_blocking(
+                rss_service.collect_feed,
                 feed_url=feed_url,
                 max_items=max_items,
                 store=True,
@@ -398,6 +438,7 @@ async def collect_rss_feed(
                 "success": True,
                 "feed_url": feed_url,
                 "feed_info": result.get("feed_info", {}),
+                "not_modified": result.get("not_modified", False),
                 "entries_fetched": result.get("entries_fetched", 0),
                 "entries_stored": result.get("entries_stored", 0)
             }
@@ -412,7 +453,7 @@ async def validate_rss_feed(
     """Validate RSS feed URL"""
     try:
         rss_service = RSSReaderService()
-        is_valid = rss_service.validate_feed_url(feed_url)
+        is_valid = await run_blocking(rss_service.validate_feed_url, feed_url)
         return {
             "feed_url": feed_url,
             "valid": is_valid
@@ -430,7 +471,8 @@ async def search_rss_entries(
     """Search for RSS feed entries"""
     try:
         rss_service = RSSReaderService()
-        entries = rss_service.search_entries(
+        entries = await run_blocking(
+            rss_service.search_entries,
             query=query,
             feed_url=feed_url,
             limit=limit
@@ -452,7 +494,7 @@ async def list_rss_feeds(
     """List all RSS feeds from stored entries"""
     try:
         rss_service = RSSReaderService()
-        feeds = rss_service.list_feeds(source_id=source_id)
+        feeds = await run_blocking(rss_service.list_feeds, source_id=source_id)
         return {
             "count": len(feeds),
             "feeds": feeds
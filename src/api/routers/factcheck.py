@@ -1,14 +1,16 @@
 """
 Fact-check API Routes
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
 from src.services.factcheck.tasks import factcheck_post_task
-from src.services.factcheck.factcheck_service import FactCheckService
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_mongodb
+from src.models.mongodb_models import FactCheckResult
+from src.api.concurrency import run_blocking
+from src.api.pagination import fetch_page, count_total
 from bson import ObjectId
 
 router = APIRouter(prefix="/api/factcheck", tags=["factcheck"])
@@ -56,6 +58,51 @@ class FactCheckResultResponse(BaseModel):
         from_attributes = True
 
 
+class FactCheckResultListResponse(BaseModel):
+    items: List[FactCheckResultResponse]
+    total: int
+    page: int
+    size: int
+    next_cursor: Optional[str] = None
+
+
+def _to_result_response(result: FactCheckResult) -> FactCheckResultResponse:
+    """Convert a FactCheckResult to its response model"""
+    claims = [
+        ClaimResponse(
+            text=claim.get('text', ''),
+            type=claim.get('type', 'statement'),
+            confidence=claim.get('confidence', 0.5),
+            entities=claim.get('entities'),
+            numbers=claim.get('numbers')
+        )
+        for claim in result.claims
+    ]
+    
+    references = [
+        ReferenceResponse(
+            type=ref.get('type', 'unknown'),
+            source=ref.get('source', 'unknown'),
+            url=ref.get('url'),
+            content=ref.get('content'),
+            relevance_score=ref.get('relevance_score', 0.5)
+        )
+        for ref in result.references
+    ]
+    
+    return FactCheckResultResponse(
+        id=str(result._id),
+        post_id=result.post_id,
+        claims=claims,
+        verdict=result.verdict,
+        confidence=result.confidence,
+        references=references,
+        checked_at=result.checked_at,
+        checked_by=result.checked_by,
+        metadata=result.metadata
+    )
+
+
 @router.post("/{post_id}", response_model=FactCheckTriggerResponse)
 async def trigger_factcheck(
     post_id: str,
@@ -74,14 +121,14 @@ async def trigger_factcheck(
     """
     try:
         # Verify post exists
-        db = connect_mongodb_sync()
-        post_doc = db.posts.find_one({"_id": ObjectId(post_id)})
+        db = await get_mongodb()
+        post_doc = await db.posts.find_one({"_id": ObjectId(post_id)}, {"_id": 1})
         if not post_doc:
             raise HTTPException(status_code=404, detail="Post not found")
         
         # Trigger fact-check task
         manual_sources = request.manual_sources if request else None
-        task = factcheck_post_task.delay(post_id, manual_sources)
+        task = await run_blocking(factcheck_post_task.delay, post_id, manual_sources)
         
         return FactCheckTriggerResponse(
             post_id=post_id,
@@ -104,6 +151,8 @@ async def get_factcheck_result(post_id: str):
     """
     Get fact-check result for a post
     
+    Near-duplicates of a story get the result of the cluster's representative post.
+    
     Args:
         post_id: Post ID
         
@@ -112,55 +161,29 @@ async def get_factcheck_result(post_id: str):
     """
     try:
         # Verify post exists
-        db = connect_mongodb_sync()
-        post_doc = db.posts.find_one({"_id": ObjectId(post_id)})
+        db = await get_mongodb()
+        post_doc = await db.posts.find_one({"_id": ObjectId(post_id)}, {"_id": 1, "duplicate_of": 1})
         if not post_doc:
             raise HTTPException(status_code=404, detail="Post not found")
         
-        # Get fact-check result
-        factcheck_service = FactCheckService()
-        result = factcheck_service.get_factcheck_result(post_id)
+        # Get the most recent fact-check result
+        result_doc = await db.factcheck_results.find_one(
+            {"post_id": post_id},
+            sort=[("checked_at", -1)]
+        )
+        if not result_doc and post_doc.get("duplicate_of"):
+            result_doc = await db.factcheck_results.find_one(
+                {"post_id": post_doc["duplicate_of"]},
+                sort=[("checked_at", -1)]
+            )
         
-        if not result:
+        if not result_doc:
             raise HTTPException(
                 status_code=404,
                 detail="Fact-check result not found for this post"
             )
         
-        # Convert to response model
-        claims = [
-            ClaimResponse(
-                text=claim.get('text', ''),
-                type=claim.get('type', 'statement'),
-                confidence=claim.get('confidence', 0.5),
-                entities=claim.get('entities'),
-                numbers=claim.get('numbers')
-            )
-            for claim in result.claims
-        ]
-        
-        references = [
-            ReferenceResponse(
-                type=ref.get('type', 'unknown'),
-                source=ref.get('source', 'unknown'),
-                url=ref.get('url'),
-                content=ref.get('content'),
-                relevance_score=ref.get('relevance_score', 0.5)
-            )
-            for ref in result.references
-        ]
-        
-        return FactCheckResultResponse(
-            id=str(result._id),
-            post_id=result.post_id,
-            claims=claims,
-            verdict=result.verdict,
-            confidence=result.confidence,
-            references=references,
-            checked_at=result.checked_at,
-            checked_by=result.checked_by,
-            metadata=result.metadata
-        )
+        return _to_result_response(FactCheckResult.from_dict(result_doc))
         
     except HTTPException:
         raise
@@ -171,30 +194,29 @@ async def get_factcheck_result(post_id: str):
         )
 
 
-@router.get("/results/list", response_model=List[FactCheckResultResponse])
+@router.get("/results/list", response_model=FactCheckResultListResponse)
 async def list_factcheck_results(
     post_id: Optional[str] = None,
     verdict: Optional[str] = None,
-    limit: int = 50,
-    skip: int = 0
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    page: int = Query(1, ge=1, description="Page number shown to the client (informational)")
 ):
     """
-    List fact-check results with optional filtering
+    List fact-check results with optional filtering, newest first
     
     Args:
         post_id: Optional post ID filter
         verdict: Optional verdict filter (verified, disputed, false, true, partially_true)
         limit: Maximum number of results to return
-        skip: Number of results to skip
+        cursor: Cursor token of the previous page
+        page: Page number echoed back to the client
         
     Returns:
-        List of fact-check results
+        Page of fact-check results with total and the cursor of the next page
     """
     try:
-        db = connect_mongodb_sync()
-        factcheck_service = FactCheckService()
-        
-        from src.models.mongodb_models import FactCheckResult
+        db = await get_mongodb()
         
         query = {}
         if post_id:
@@ -207,55 +229,21 @@ async def list_factcheck_results(
                 )
             query["verdict"] = verdict
         
-        # Get results sorted by checked_at descending
-        cursor = (
-            db.factcheck_results
-            .find(query)
-            .sort("checked_at", -1)
-            .skip(skip)
-            .limit(limit)
+        # Keyset page on (checked_at, _id) descending
+        result_docs, next_cursor = await fetch_page(
+            db.factcheck_results, query, "checked_at", limit, cursor
         )
         
-        results = []
-        for result_doc in cursor:
-            result = factcheck_service.get_factcheck_result(result_doc["post_id"])
-            if result:
-                # Convert to response (same as get_factcheck_result)
-                claims = [
-                    ClaimResponse(
-                        text=claim.get('text', ''),
-                        type=claim.get('type', 'statement'),
-                        confidence=claim.get('confidence', 0.5),
-                        entities=claim.get('entities'),
-                        numbers=claim.get('numbers')
-                    )
-                    for claim in result.claims
-                ]
-                
-                references = [
-                    ReferenceResponse(
-                        type=ref.get('type', 'unknown'),
-                        source=ref.get('source', 'unknown'),
-                        url=ref.get('url'),
-                        content=ref.get('content'),
-                        relevance_score=ref.get('relevance_score', 0.5)
-                    )
-                    for ref in result.references
-                ]
-                
-                results.append(FactCheckResultResponse(
-                    id=str(result._id),
-                    post_id=result.post_id,
-                    claims=claims,
-                    verdict=result.verdict,
-                    confidence=result.confidence,
-                    references=references,
-                    checked_at=result.checked_at,
-                    checked_by=result.checked_by,
-                    metadata=result.metadata
-                ))
-        
-        return results
+        return FactCheckResultListResponse(
+            items=[
+                _to_result_response(FactCheckResult.from_dict(result_doc))
+                for result_doc in result_docs
+            ],
+            total=await count_total(db, "factcheck_results", query),
+            page=page,
+            size=limit,
+            next_cursor=next_cursor
+        )
         
     except HTTPException:
         raise
@@ -5,13 +5,14 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
-from src.services.collection.statistics import EurostatService, KSHService
+from src.services.collection.statistics import DatasetRefresher, EurostatService, KSHService
 from src.services.collection.tasks import (
     collect_eurostat_dataset_task,
     update_eurostat_datasets_task,
     collect_ksh_dataset_task
 )
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_mongodb
+from src.api.concurrency import run_blocking
 
 router = APIRouter(prefix="/api/statistics", tags=["statistics"])
 
@@ -43,7 +44,7 @@ async def search_eurostat_datasets(
     """Search for EUROSTAT datasets"""
     try:
         eurostat_service = EurostatService()
-        results = eurostat_service.search_datasets(query, language)
+        results = await run_blocking(eurostat_service.search_datasets, query, language)
         return {
             "query": query,
             "results": results
@@ -60,7 +61,7 @@ async def get_eurostat_dataset_info(
     """Get EUROSTAT dataset information"""
     try:
         eurostat_service = EurostatService()
-        info = eurostat_service.get_dataset_info(dataset_code, language)
+        info = await run_blocking(eurostat_service.get_dataset_info, dataset_code, language)
         
         if not info:
             raise HTTPException(status_code=404, detail=f"Dataset {dataset_code} not found")
@@ -88,7 +89,8 @@ async def collect_eurostat_dataset(
     try:
         if background:
             # Run as Celery task
-            task = collect_eurostat_dataset_task.delay(
+            task = await run_blocking(
+                collect_eurostat_dataset_task.delay,
                 dataset_code=dataset_code,
                 last_n_periods=last_n_periods,
                 store=store
@@ -102,7 +104,8 @@ async def collect_eurostat_dataset(
         else:
             # Run synchronously
             eurostat_service = EurostatService()
-            dataset_data = eurostat_service.collect_dataset(
+            dataset_data = await run_blocking(
+                eurostat_service.collect_dataset,
                 dataset_code=dataset_code,
                 last_n_periods=last_n_periods,
                 store=store
@@ -130,7 +133,7 @@ async def get_stored_eurostat_dataset(dataset_code: str):
     """Get stored EUROSTAT dataset from MongoDB"""
     try:
         eurostat_service = EurostatService()
-        stored_data = eurostat_service.get_stored_dataset(dataset_code)
+        stored_data = await run_blocking(eurostat_service.get_stored_dataset, dataset_code, include_data=True)
         
         if not stored_data:
             raise HTTPException(
@@ -149,11 +152,11 @@ async def get_stored_eurostat_dataset(dataset_code: str):
 async def list_stored_eurostat_datasets():
     """List all stored EUROSTAT datasets"""
     try:
-        db = connect_mongodb_sync()
-        datasets = list(db.statistics.find(
+        db = await get_mongodb()
+        datasets = await db.statistics.find(
             {"source": "eurostat"},
             {"dataset_code": 1, "metadata": 1, "updated_at": 1, "collected_at": 1}
-        ))
+        ).to_list(length=None)
         
         return {
             "count": len(datasets),
@@ -167,21 +170,37 @@ async def list_stored_eurostat_datasets():
 async def update_eurostat_datasets(
     dataset_codes: Optional[List[str]] = None,
     last_n_periods: int = Query(10, description="Number of latest time periods"),
-    background: bool = Query(True, description="Run in background")
+    background: bool = Query(True, description="Run in background"),
+    incremental: bool = Query(True, description="Only download changed datasets and their new periods")
 ):
     """Update multiple EUROSTAT datasets"""
     try:
         if background:
             # Run as Celery task
-            task = update_eurostat_datasets_task.delay(
+            task = await run_blocking(
+                update_eurostat_datasets_task.delay,
                 dataset_codes=dataset_codes,
-                last_n_periods=last_n_periods
+                last_n_periods=last_n_periods,
+                incremental=incremental
             )
             return {
                 "success": True,
                 "task_id": task.id,
                 "message": "Update task started"
             }
+        elif incremental:
+            # Run synchronously, refreshing only changed datasets
+            # (all tracked ones when no codes are given, like the task)
+            refresher = DatasetRefresher()
+            if dataset_codes is None:
+                datasets = await run_blocking(refresher.tracked_datasets, ("eurostat",))
+            else:
+                datasets = [(dataset_code, "eurostat") for dataset_code in dataset_codes]
+            return await run_blocking(
+                refresher.refresh_many,
+                datasets,
+                last_n_periods=last_n_periods
+            )
         else:
             # Run synchronously
             eurostat_service = EurostatService()
@@ -194,7 +213,8 @@ async def update_eurostat_datasets(
             
             if dataset_codes:
                 for dataset_code in dataset_codes:
-                    dataset_data = eurostat_service.collect_dataset(
+                    dataset_data = await run_blocking(
+                        eurostat_service.collect_dataset,
                         dataset_code=dataset_code,
                         last_n_periods=last_n_periods,
                         store=True
@@ -219,7 +239,7 @@ async def search_ksh_datasets(
     """Search for KSH (Hungarian statistics) datasets"""
     try:
         ksh_service = KSHService()
-        results = ksh_service.search_datasets(query, language)
+        results = await run_blocking(ksh_service.search_datasets, query, language)
         return {
             "query": query,
             "results": results
@@ -236,7 +256,7 @@ async def get_ksh_dataset_info(
     """Get KSH dataset information"""
     try:
         ksh_service = KSHService()
-        info = ksh_service.get_dataset_info(dataset_code, source)
+        info = await run_blocking(ksh_service.get_dataset_info, dataset_code, source)
         
         if not info:
             raise HTTPException(status_code=404, detail=f"KSH dataset {dataset_code} not found")
@@ -265,7 +285,8 @@ async def collect_ksh_dataset(
     try:
         if background:
             # Run as Celery task
-            task = collect_ksh_dataset_task.delay(
+            task = await run_blocking(
+                collect_ksh_dataset_task.delay,
                 dataset_code=dataset_code,
                 last_n_periods=last_n_periods,
                 store=store,
@@ -280,7 +301,8 @@ async def collect_ksh_dataset(
         else:
             # Run synchronously
             ksh_service = KSHService()
-            dataset_data = ksh_service.collect_dataset(
+            dataset_data = await run_blocking(
+                ksh_service.collect_dataset,
                 dataset_code=dataset_code,
                 last_n_periods=last_n_periods,
                 store=store,
@@ -309,7 +331,7 @@ async def get_stored_ksh_dataset(dataset_code: str):
     """Get stored KSH dataset from MongoDB"""
     try:
         ksh_service = KSHService()
-        stored_data = ksh_service.get_stored_dataset(dataset_code)
+        stored_data = await run_blocking(ksh_service.get_stored_dataset, dataset_code, include_data=True)
         
         if not stored_data:
             raise HTTPException(
@@ -328,11 +350,11 @@ async def get_stored_ksh_dataset(dataset_code: str):
 async def list_stored_ksh_datasets():
     """List all stored KSH datasets"""
     try:
-        db = connect_mongodb_sync()
-        datasets = list(db.statistics.find(
+        db = await get_mongodb()
+        datasets = await db.statistics.find(
             {"source": "ksh"},
             {"dataset_code": 1, "metadata": 1, "updated_at": 1, "collected_at": 1}
-        ))
+        ).to_list(length=None)
         
         return {
             "count": len(datasets),
@@ -2,7 +2,10 @@
 Celery Application Configuration
 """
 import os
+import logging
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from src.config.settings import get_settings
 
 settings = get_settings()
@@ -35,6 +38,69 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Europe/Budapest",
     enable_utc=True,
+    # Collectors run on per-type queues so each can be scaled separately:
+    # selenium (Chrome), http (feeds, scraping), statistics (EUROSTAT/KSH)
+    task_routes={
+        "collection.collect_facebook_posts": {"queue": "selenium"},
+        "news.*": {"queue": "http"},
+        "statistics.*": {"queue": "statistics"},
+    },
+    # Sources are collected when due according to their adaptive schedule
+    beat_schedule={
+        "dispatch-due-sources": {
+            "task": "collection.dispatch_due_sources",
+            "schedule": settings.SCHEDULER_TICK_SECONDS,
+        },
+        "refresh-eurostat-catalogue": {
+            "task": "statistics.refresh_eurostat_catalogue",
+            "schedule": settings.EUROSTAT_CATALOGUE_REFRESH_SECONDS,
+        },
+        # Nightly, after EUROSTAT's 23:00 CET release
+        "refresh-tracked-statistics": {
+            "task": "statistics.refresh_tracked_datasets",
+            "schedule": crontab(hour=1, minute=30),
+        },
+        "reconcile-counters": {
+            "task": "collection.reconcile_counters",
+            "schedule": crontab(hour=3, minute=0),
+        },
+    },
 )
 
 
+@worker_init.connect
+def ensure_mongodb_indexes(**kwargs):
+    """Create the MongoDB indexes once when a worker starts"""
+    from src.models.database import get_sync_db, close_sync_client
+    from src.models.indexes import ensure_indexes
+    
+    try:
+        ensure_indexes(get_sync_db())
+        # Do not hand a pre-fork client to the pool processes
+        close_sync_client()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error ensuring MongoDB indexes: {e}")
+
+
+@worker_process_init.connect
+def preload_factcheck_resources(**kwargs):
+    """Load the spaCy model and fact-check services once per worker process"""
+    if not settings.FACTCHECK_PRELOAD:
+        return
+    from src.services.factcheck.registry import warm_up
+    
+    try:
+        warm_up()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error preloading fact-check resources: {e}")
+
+
+@worker_process_shutdown.connect
+def close_browser_pool(**kwargs):
+    """Quit the pooled Chrome browsers of a worker process"""
+    from src.utils.browser_pool import get_browser_pool
+    
+    try:
+        get_browser_pool().close()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error closing browser pool: {e}")
@@ -1,15 +1,22 @@
 """
 Nincsenek Fények! - Main Application Entry Point
 """
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from src.config.settings import get_settings
-from src.models.database import connect_mongodb, disconnect_mongodb
+from src.models.database import connect_mongodb, disconnect_mongodb, get_sync_db, get_pool_metrics
+from src.models.indexes import ensure_indexes
+from src.api.concurrency import loop_lag_monitor, run_blocking, shutdown_blocking_executor
 from src.api.routers import sources, collection, factcheck, statistics
+from src.services.search.rate_limiter import get_rate_limiter
+from src.services.search.search_cache import get_search_cache_stats
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -17,8 +24,15 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     await connect_mongodb()
+    try:
+        await asyncio.to_thread(ensure_indexes, get_sync_db())
+    except Exception as e:
+        logger.error(f"Error ensuring MongoDB indexes: {e}")
+    loop_lag_monitor.start()
     yield
     # Shutdown
+    await loop_lag_monitor.stop()
+    shutdown_blocking_executor()
     await disconnect_mongodb()
 
 
@@ -63,6 +77,32 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db-pool")
+async def db_pool_metrics():
+    """Connection pool metrics of the synchronous MongoDB client"""
+    return get_pool_metrics()
+
+
+@app.get("/health/loop-lag")
+async def loop_lag_metrics():
+    """Event loop lag of this API worker (blocking handlers show up here)"""
+    return loop_lag_monitor.snapshot()
+
+
+@app.get("/health/search-cache")
+async def search_cache_metrics():
+    """Hit/miss counters of the Google/Bing search result cache (all workers)"""
+    return await run_blocking(get_search_cache_stats)
+
+
+@app.get("/health/search-quota")
+async def search_quota_metrics():
+    """Rate limits and today's usage of the external search APIs (all workers)"""
+    return await run_blocking(
+        lambda: {api: get_rate_limiter(api).status() for api in ("google", "bing")}
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8095)
@@ -0,0 +1,144 @@
+"""
+Maintained Document Counters
+Per-filter document counts kept up to date by the writers, so list endpoints
+do not have to count matching documents on every request
+
+Counters are estimates: inserts racing the first count and deletes made
+outside the writers are only corrected by reconcile_counters (nightly).
+"""
+import logging
+from typing import Dict, Any, Optional, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Equality filters that have a maintained counter, per collection
+COUNTED_FIELDS = {
+    "posts": ("source_id",),
+    "factcheck_results": ("verdict",),
+}
+
+
+def counter_key(collection_name: str, query: Dict[str, Any]) -> Optional[str]:
+    """
+    Counter ID for a list query
+
+    Args:
+        collection_name: Collection name
+        query: Find filter
+
+    Returns:
+        Counter ID, or None if the query has no maintained counter
+    """
+    if len(query) != 1:
+        return None
+    field, value = next(iter(query.items()))
+    if field not in COUNTED_FIELDS.get(collection_name, ()) or isinstance(value, dict):
+        return None
+    return f"{collection_name}:{field}:{value}"
+
+
+def increment_counters(
+    db,
+    collection_name: str,
+    field: str,
+    amounts: Mapping[Any, int]
+) -> None:
+    """
+    Add inserted documents to the counters of a field
+
+    Only counters that already exist are incremented; a counter is created
+    with a full count the first time it is read (see placeholder_update).
+
+    Args:
+        db: MongoDB database (synchronous)
+        collection_name: Collection the documents were inserted into
+        field: Counted field
+        amounts: Number of inserted documents per field value
+    """
+    for value, amount in amounts.items():
+        if value is None or not amount:
+            continue
+        try:
+            db.counters.update_one(
+                {"_id": counter_key(collection_name, {field: value})},
+                {"$inc": {"count": amount}}
+            )
+        except Exception as e:
+            logger.warning(f"Error updating counter {collection_name}:{field}:{value}: {e}")
+
+
+def placeholder_update(collection_name: str, query: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Upsert that creates an empty counter, marked as seeding, unless it exists
+
+    The counter is created before the full count so increments of inserts
+    made while counting are not lost (see seeded_count_update).
+    """
+    field, value = next(iter(query.items()))
+    return {"$setOnInsert": {
+        "count": 0,
+        "seeding": True,
+        "collection": collection_name,
+        "field": field,
+        "value": value,
+    }}
+
+
+def seeded_count_update(count: int) -> Dict[str, Any]:
+    """Add the full count to a placeholder counter and finish seeding it"""
+    return {"$inc": {"count": count}, "$unset": {"seeding": ""}}
+
+
+def _counter_query(counter: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """(collection name, find filter) counted by a counter document"""
+    if "collection" in counter:
+        return counter["collection"], {counter["field"]: counter["value"]}
+    # Counters created before the filter was stored: values are strings
+    parts = counter["_id"].split(":", 2)
+    if len(parts) != 3:
+        return None
+    return parts[0], {parts[1]: parts[2]}
+
+
+def reconcile_counters(db) -> Dict[str, int]:
+    """
+    Recount every counter and correct its drift
+
+    The correction is applied with $inc, so increments of inserts made
+    during the recount are kept. Placeholders left by a first count that
+    never finished are seeded.
+
+    Args:
+        db: MongoDB database (synchronous)
+
+    Returns:
+        Dictionary with checked and corrected counts
+    """
+    result = {"checked": 0, "corrected": 0}
+    for counter_id in db.counters.distinct("_id"):
+        # Read right before counting, so the drift covers as few inserts as possible
+        counter = db.counters.find_one({"_id": counter_id})
+        if counter is None:
+            continue
+        target = _counter_query(counter)
+        if target is None:
+            continue
+        collection_name, query = target
+        result["checked"] += 1
+        try:
+            count = db[collection_name].count_documents(query)
+            if counter.get("seeding"):
+                db.counters.update_one(
+                    {"_id": counter["_id"], "seeding": True},
+                    {"$set": {"count": count}, "$unset": {"seeding": ""}}
+                )
+                result["corrected"] += 1
+                continue
+            drift = count - counter["count"]
+            if drift:
+                db.counters.update_one({"_id": counter["_id"]}, {"$inc": {"count": drift}})
+                result["corrected"] += 1
+                logger.info(f"Counter {counter['_id']} corrected by {drift:+d}")
+        except Exception as e:
+            logger.warning(f"Error reconciling counter {counter['_id']}: {e}")
+    return result
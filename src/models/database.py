@@ -1,12 +1,16 @@
 """
 Database Connection and Configuration
 """
+import os
+import threading
+import time
+import redis
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from typing import Optional
+from typing import Optional, Dict, Any
 
 from src.config.settings import get_settings
 
@@ -15,7 +19,14 @@ settings = get_settings()
 # MongoDB Connections
 mongodb_client: Optional[AsyncIOMotorClient] = None
 mongodb_sync_client: Optional[MongoClient] = None
+mongodb_sync_client_pid: Optional[int] = None
 mongodb_database = None
+_sync_client_lock = threading.Lock()
+
+# Redis Connection (shared cache and counters)
+redis_client: Optional[redis.Redis] = None
+redis_client_pid: Optional[int] = None
+_redis_client_lock = threading.Lock()
 
 # PostgreSQL Connections (előkészítés)
 postgres_engine = None
@@ -31,11 +42,165 @@ async def connect_mongodb():
     return mongodb_database
 
 
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters of the synchronous client of this process"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+    
+    def reset(self):
+        """Zero all counters"""
+        with self._lock:
+            self.checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.connections_open = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters (wait times in milliseconds)"""
+        with self._lock:
+            return {
+                "checked_out": self.checked_out,
+                "connections_open": self.connections_open,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "wait_time_avg_ms": round(
+                    self.wait_time_total * 1000 / self.checkouts, 3
+                ) if self.checkouts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+    
+    def connection_check_out_started(self, event):
+        # Check-out runs on the calling thread, so the start time is thread-local
+        self._local.started = time.monotonic()
+    
+    def connection_checked_out(self, event):
+        waited = time.monotonic() - getattr(self._local, "started", time.monotonic())
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+    
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open -= 1
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+
+
+sync_pool_metrics = PoolMetrics()
+
+
+def get_sync_client() -> MongoClient:
+    """
+    Get the synchronous MongoDB client of this process
+    
+    One client (and connection pool) is shared by all services of a process.
+    A process forked from one that already had a client (Celery prefork
+    children) gets a new client, since pymongo clients are not fork-safe.
+    """
+    global mongodb_sync_client, mongodb_sync_client_pid
+    pid = os.getpid()
+    if mongodb_sync_client is not None and mongodb_sync_client_pid == pid:
+        return mongodb_sync_client
+    
+    with _sync_client_lock:
+        if mongodb_sync_client is None or mongodb_sync_client_pid != pid:
+            sync_pool_metrics.reset()
+            mongodb_sync_client = MongoClient(
+                settings.MONGODB_URL,
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                event_listeners=[sync_pool_metrics]
+            )
+            mongodb_sync_client_pid = pid
+    return mongodb_sync_client
+
+
+def get_sync_db():
+    """Get the MongoDB database through the shared synchronous client"""
+    return get_sync_client()[settings.MONGODB_DB_NAME]
+
+
+def close_sync_client():
+    """Close the synchronous client of this process (a new one is created on next use)"""
+    global mongodb_sync_client, mongodb_sync_client_pid
+    with _sync_client_lock:
+        if mongodb_sync_client is not None and mongodb_sync_client_pid == os.getpid():
+            mongodb_sync_client.close()
+        mongodb_sync_client = None
+        mongodb_sync_client_pid = None
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Connection pool metrics of the synchronous client of this process"""
+    return {
+        "pid": os.getpid(),
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "client_open": mongodb_sync_client is not None and mongodb_sync_client_pid == os.getpid(),
+        **sync_pool_metrics.snapshot(),
+    }
+
+
 def connect_mongodb_sync():
-    """Connect to MongoDB synchronously (for Celery workers)"""
-    global mongodb_sync_client
-    mongodb_sync_client = MongoClient(settings.MONGODB_URL)
-    return mongodb_sync_client[settings.MONGODB_DB_NAME]
+    """Connect to MongoDB synchronously (kept for compatibility, use get_sync_db)"""
+    return get_sync_db()
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Get the Redis client of this process
+    
+    Like the MongoDB client, one client is shared by all services of a
+    process and created again after a fork.
+    """
+    global redis_client, redis_client_pid
+    pid = os.getpid()
+    if redis_client is not None and redis_client_pid == pid:
+        return redis_client
+    
+    with _redis_client_lock:
+        if redis_client is None or redis_client_pid != pid:
+            redis_client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+                decode_responses=True
+            )
+            redis_client_pid = pid
+    return redis_client
 
 
 async def disconnect_mongodb():
@@ -74,7 +239,7 @@ def get_postgres_session():
 
 async def get_mongodb():
     """Get MongoDB database instance"""
-    if not mongodb_database:
+    if mongodb_database is None:
         await connect_mongodb()
     return mongodb_database
 
@@ -0,0 +1,300 @@
+"""
+MongoDB Index Management
+Declares the indexes every query path needs and verifies query plans
+"""
+import logging
+import sys
+from typing import List, Dict, Any, Optional, Iterable
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Natural keys that identify a post for each collector.
+# The first field is the collector-specific ID, it is also used as the
+# partial filter so posts of other collectors are not indexed.
+NATURAL_KEYS = {
+    "rss": ("metadata.entry_id", "metadata.feed_url"),
+    "mti": ("metadata.article_id", "source"),
+    "magyar_kozlony": ("metadata.publication_id", "source"),
+    "facebook": ("metadata.post_id", "source_id"),
+}
+
+
+def _natural_key_indexes() -> List[IndexModel]:
+    """Unique indexes on the natural keys of collected posts"""
+    return [
+        IndexModel(
+            [(field, ASCENDING) for field in key_fields],
+            name=f"uniq_{kind}_natural_key",
+            unique=True,
+            partialFilterExpression={key_fields[0]: {"$exists": True}}
+        )
+        for kind, key_fields in NATURAL_KEYS.items()
+    ]
+
+
+# Indexes per collection, each one backs a query in src/api/routers or a task
+INDEXES: Dict[str, List[IndexModel]] = {
+    "posts": [
+        # /collection/posts list pages (keyset on posted_at, _id)
+        IndexModel(
+            [("posted_at", DESCENDING), ("_id", DESCENDING)],
+            name="posted_at_id_desc"
+        ),
+        # /collection/posts?source_id=...
+        IndexModel(
+            [("source_id", ASCENDING), ("posted_at", DESCENDING), ("_id", DESCENDING)],
+            name="source_id_posted_at_id"
+        ),
+        # MTI / Magyar Közlöny / RSS search and feed listing
+        IndexModel(
+            [("source", ASCENDING), ("posted_at", DESCENDING)],
+            name="source_posted_at"
+        ),
+        IndexModel(
+            [("metadata.feed_url", ASCENDING), ("posted_at", DESCENDING)],
+            name="feed_url_posted_at",
+            partialFilterExpression={"metadata.feed_url": {"$exists": True}}
+        ),
+        # Pending fact-check queue, walked in _id order
+        IndexModel(
+            [("factcheck_status", ASCENDING), ("_id", ASCENDING)],
+            name="factcheck_status_id"
+        ),
+        IndexModel(
+            [("source_id", ASCENDING), ("factcheck_status", ASCENDING), ("_id", ASCENDING)],
+            name="source_id_factcheck_status_id"
+        ),
+        *_natural_key_indexes(),
+        # PostSearchService ($text): Hungarian stemming, text index v3 folds
+        # case and diacritics ("kozlony" finds "közlöny")
+        IndexModel(
+            [
+                ("title", TEXT),
+                ("content", TEXT),
+                ("metadata.description", TEXT),
+                ("metadata.publication_number", TEXT),
+            ],
+            name="posts_text",
+            default_language="hungarian",
+            # Keep a future "language" field ("hu", "en") from being read
+            # as the $text language of a post
+            language_override="search_language",
+            weights={
+                "title": 5,
+                "metadata.publication_number": 5,
+                "metadata.description": 2,
+                "content": 1,
+            }
+        ),
+    ],
+    "factcheck_results": [
+        # Latest result for a post
+        IndexModel(
+            [("post_id", ASCENDING), ("checked_at", DESCENDING)],
+            name="post_id_checked_at"
+        ),
+        # /factcheck/results/list pages (keyset on checked_at, _id)
+        IndexModel(
+            [("checked_at", DESCENDING), ("_id", DESCENDING)],
+            name="checked_at_id_desc"
+        ),
+        IndexModel(
+            [("verdict", ASCENDING), ("checked_at", DESCENDING), ("_id", DESCENDING)],
+            name="verdict_checked_at_id"
+        ),
+    ],
+    "statistics": [
+        IndexModel(
+            [("dataset_code", ASCENDING), ("source", ASCENDING)],
+            name="uniq_dataset_code_source",
+            unique=True
+        ),
+        # /statistics/*/stored listings
+        IndexModel(
+            [("source", ASCENDING), ("dataset_code", ASCENDING)],
+            name="source_dataset_code"
+        ),
+    ],
+    # Revised values found by incremental refreshes, newest first per dataset
+    "statistics_revisions": [
+        IndexModel(
+            [("dataset_code", ASCENDING), ("source", ASCENDING), ("revised_at", DESCENDING)],
+            name="dataset_code_source_revised_at"
+        ),
+    ],
+    "sources": [
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+        # Due sources of the adaptive scheduler
+        IndexModel(
+            [("is_active", ASCENDING), ("schedule.next_collection_at", ASCENDING)],
+            name="is_active_next_collection_at"
+        ),
+        IndexModel([("source_group_id", ASCENDING)], name="source_group_id"),
+    ],
+    # BM25Index documents, newest first per term (see src/services/search/bm25_index.py)
+    "search_documents": [
+        IndexModel([("terms", ASCENDING), ("_id", DESCENDING)], name="terms_id"),
+    ],
+    # NearDuplicateIndex signatures, looked up by LSH band (see src/services/search/near_duplicates.py)
+    "post_signatures": [
+        IndexModel([("bands", ASCENDING), ("created_at", DESCENDING)], name="bands_created_at"),
+        IndexModel([("cluster_id", ASCENDING)], name="cluster_id"),
+    ],
+    "source_groups": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+}
+
+# Hot queries issued by the API routers: (collection, filter, sort)
+HOT_QUERIES: List[Dict[str, Any]] = [
+    {"collection": "posts", "filter": {}, "sort": [("posted_at", DESCENDING), ("_id", DESCENDING)]},
+    {
+        "collection": "posts",
+        "filter": {"source_id": "x"},
+        "sort": [("posted_at", DESCENDING), ("_id", DESCENDING)]
+    },
+    {"collection": "posts", "filter": {"source": "mti"}, "sort": [("posted_at", DESCENDING)]},
+    {
+        "collection": "posts",
+        "filter": {"source": "rss", "metadata.feed_url": "x"},
+        "sort": [("posted_at", DESCENDING)]
+    },
+    {"collection": "posts", "filter": {"metadata.post_id": "x", "source_id": "x"}, "sort": None},
+    {"collection": "posts", "filter": {"$text": {"$search": "x"}, "source": "mti"}, "sort": None},
+    {
+        "collection": "factcheck_results",
+        "filter": {},
+        "sort": [("checked_at", DESCENDING), ("_id", DESCENDING)]
+    },
+    {"collection": "factcheck_results", "filter": {"post_id": "x"}, "sort": [("checked_at", DESCENDING)]},
+    {
+        "collection": "factcheck_results",
+        "filter": {"verdict": "true"},
+        "sort": [("checked_at", DESCENDING), ("_id", DESCENDING)]
+    },
+    {"collection": "statistics", "filter": {"dataset_code": "x", "source": "eurostat"}, "sort": None},
+    {"collection": "statistics", "filter": {"source": "eurostat"}, "sort": None},
+    {"collection": "sources", "filter": {"is_active": True}, "sort": None},
+    {
+        "collection": "sources",
+        "filter": {"is_active": True, "schedule.next_collection_at": {"$lte": 0}},
+        "sort": [("schedule.next_collection_at", ASCENDING)]
+    },
+    {"collection": "sources", "filter": {"source_group_id": "x"}, "sort": None},
+    {"collection": "search_documents", "filter": {"terms": "x"}, "sort": [("_id", DESCENDING)]},
+    {"collection": "post_signatures", "filter": {"bands": {"$in": ["x"]}, "created_at": {"$gte": 0, "$lte": 0}}, "sort": None},
+    {"collection": "post_signatures", "filter": {"cluster_id": "x"}, "sort": None},
+]
+
+
+def ensure_indexes(db, collections: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """
+    Create the declared indexes (idempotent)
+
+    Args:
+        db: MongoDB database
+        collections: Optional subset of collection names
+
+    Returns:
+        Dictionary of collection name to created index names
+    """
+    created = {}
+    for collection_name in collections or INDEXES.keys():
+        created[collection_name] = []
+        for index in INDEXES.get(collection_name, []):
+            try:
+                created[collection_name].extend(
+                    db[collection_name].create_indexes([index])
+                )
+            except OperationFailure as e:
+                # Conflicting options or duplicates in existing data
+                logger.warning(
+                    f"Could not create index {index.document['name']} "
+                    f"on {collection_name}: {e}"
+                )
+    logger.info(f"MongoDB indexes ensured for {', '.join(created.keys())}")
+    return created
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Collect all stage names from an explain plan tree"""
+    stages = [plan.get("stage")] if plan.get("stage") else []
+    for child_key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(child_key), dict):
+            stages.extend(_plan_stages(plan[child_key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def verify_query_plans(
+    db,
+    queries: Optional[List[Dict[str, Any]]] = None,
+    seed: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Run explain() on the hot queries and report the ones not using an index
+
+    A query on a missing or empty collection has an EOF plan, which does
+    not show whether an index would be used; it is reported as not
+    verified. With seed, empty collections get a placeholder document for
+    the explain, removed afterwards.
+
+    Args:
+        db: MongoDB database
+        queries: Optional list of queries (defaults to HOT_QUERIES)
+        seed: Insert a placeholder document into empty collections
+
+    Returns:
+        List of failed queries with their plan stages and reason
+        ("collscan" or "not_verified")
+    """
+    queries = queries or HOT_QUERIES
+    seeded = []
+    if seed:
+        for collection_name in sorted({query["collection"] for query in queries}):
+            if db[collection_name].estimated_document_count() == 0:
+                result = db[collection_name].insert_one({"_index_verification": True})
+                seeded.append((collection_name, result.inserted_id))
+
+    failures = []
+    try:
+        for query in queries:
+            cursor = db[query["collection"]].find(query["filter"]).limit(50)
+            if query.get("sort"):
+                cursor = cursor.sort(query["sort"])
+            plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+            stages = _plan_stages(plan)
+            if "COLLSCAN" in stages:
+                failures.append({**query, "stages": stages, "reason": "collscan"})
+                logger.error(
+                    f"COLLSCAN on {query['collection']} for filter={query['filter']} "
+                    f"sort={query.get('sort')}"
+                )
+            elif not stages or stages == ["EOF"]:
+                failures.append({**query, "stages": stages, "reason": "not_verified"})
+                logger.error(
+                    f"Plan not verified (no documents in {query['collection']}) for "
+                    f"filter={query['filter']} sort={query.get('sort')}"
+                )
+    finally:
+        for collection_name, document_id in seeded:
+            db[collection_name].delete_one({"_id": document_id})
+    return failures
+
+
+if __name__ == "__main__":
+    # python -m src.models.indexes [--verify [--seed]]
+    from src.models.database import get_sync_db
+
+    logging.basicConfig(level=logging.INFO)
+    database = get_sync_db()
+    ensure_indexes(database)
+    if "--verify" in sys.argv:
+        failed = verify_query_plans(database, seed="--seed" in sys.argv)
+        if failed:
+            sys.exit(1)
+        logger.info("All hot queries use an index")
@@ -3,22 +3,26 @@ Collection Service
 Coordinates data collection from various sources
 """
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set
 from datetime import datetime
 
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_sync_db
 from src.models.mongodb_models import Source, Post
 from src.services.collection.facebook_scraper import FacebookScraper
+from src.services.collection.ingest import bulk_insert_posts, NATURAL_KEYS
 from src.services.collection.news import MTIService, MagyarKozlonyService, RSSReaderService
 
 logger = logging.getLogger(__name__)
 
+# Latest stored posts of a Facebook source the scraper stops at
+KNOWN_FACEBOOK_POSTS = 100
+
 
 class CollectionService:
     """Service for collecting data from sources"""
     
     def __init__(self):
-        self.db = connect_mongodb_sync()
+        self.db = get_sync_db()
     
     def _post_exists(self, post_id: str, source_id: str) -> bool:
         """Check if a post already exists in the database"""
@@ -28,6 +32,18 @@ class CollectionService:
         })
         return existing is not None
     
+    def _known_post_ids(self, source_id: str, limit: int = KNOWN_FACEBOOK_POSTS) -> Set[str]:
+        """Post IDs of the latest stored posts of a Facebook source"""
+        cursor = self.db.posts.find(
+            {"source_id": source_id},
+            {"metadata.post_id": 1}
+        ).sort([("posted_at", -1), ("_id", -1)]).limit(limit)
+        return {
+            doc["metadata"]["post_id"]
+            for doc in cursor
+            if (doc.get("metadata") or {}).get("post_id")
+        }
+    
     def _save_posts(self, posts: List[Dict[str, Any]]) -> int:
         """
         Save posts to database, skipping duplicates
@@ -38,42 +54,37 @@ class CollectionService:
         Returns:
             Number of new posts saved
         """
-        saved_count = 0
+        post_docs = []
         
         for post_data in posts:
-            try:
-                post_id = post_data.get('post_id')
-                source_id = post_data.get('source_id')
-                
-                if not post_id or not source_id:
-                    logger.warning("Post missing post_id or source_id, skipping")
-                    continue
-                
-                # Check if post already exists
-                if self._post_exists(post_id, source_id):
-                    logger.debug(f"Post {post_id} already exists, skipping")
-                    continue
-                
-                # Create Post object
-                post = Post(
-                    source_id=source_id,
-                    content=post_data.get('content', ''),
-                    posted_at=post_data.get('posted_at', datetime.utcnow()),
-                    metadata={
-                        'post_id': post_id,
-                        **post_data.get('metadata', {})
-                    },
-                    collected_at=post_data.get('collected_at', datetime.utcnow())
-                )
-                
-                # Save to database
-                result = self.db.posts.insert_one(post.to_dict())
-                if result.inserted_id:
-                    saved_count += 1
-                    logger.info(f"Saved new post {post_id} from source {source_id}")
-                
-            except Exception as e:
-                logger.error(f"Error saving post: {e}")
+            post_id = post_data.get('post_id')
+            source_id = post_data.get('source_id')
+            
+            if not post_id or not source_id:
+                logger.warning("Post missing post_id or source_id, skipping")
+                continue
+            
+            # Create Post object
+            post = Post(
+                source_id=source_id,
+                content=post_data.get('content', ''),
+                posted_at=post_data.get('posted_at', datetime.utcnow()),
+                metadata={
+                    'post_id': post_id,
+                    **post_data.get('metadata', {})
+                },
+                collected_at=post_data.get('collected_at', datetime.utcnow())
+            )
+            post_docs.append(post.to_dict())
+        
+        # Insert new posts in one round trip, skipping known ones
+        try:
+            saved_count = bulk_insert_posts(
+                self.db, post_docs, NATURAL_KEYS["facebook"], label="facebook"
+            )["inserted"]
+        except Exception as e:
+            logger.error(f"Error saving posts: {e}")
+            saved_count = 0
         
         return saved_count
     
@@ -112,7 +123,8 @@ class CollectionService:
                     identifier=source.identifier,
                     source_id=str(source._id),
                     max_posts=max_posts,
-                    scroll_count=scroll_count
+                    scroll_count=scroll_count,
+                    known_post_ids=self._known_post_ids(str(source._id))
                 )
                 
                 result['posts_found'] = len(posts)
@@ -179,6 +191,7 @@ class CollectionService:
             
             result['posts_found'] = collection_result.get('articles_fetched', 0)
             result['posts_saved'] = collection_result.get('articles_stored', 0)
+            result['not_modified'] = collection_result.get('not_modified', False)
             
             logger.info(
                 f"MTI collection: found {result['posts_found']} articles, "
@@ -285,11 +298,6 @@ class CollectionService:
             max_items = max_posts or source.config.get('max_items', 50)
             feed_name = source.config.get('feed_name') or source.name
             
-            # Validate feed URL
-            if not rss_service.validate_feed_url(feed_url):
-                logger.warning(f"RSS feed URL validation failed: {feed_url}")
-                # Continue anyway, might work
-            
             # Collect entries
             collection_result = rss_service.collect_feed(
                 feed_url=feed_url,
@@ -301,6 +309,7 @@ class CollectionService:
             
             result['posts_found'] = collection_result.get('entries_fetched', 0)
             result['posts_saved'] = collection_result.get('entries_stored', 0)
+            result['not_modified'] = collection_result.get('not_modified', False)
             
             logger.info(
                 f"RSS feed collection: found {result['posts_found']} entries, "
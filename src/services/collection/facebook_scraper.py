@@ -3,23 +3,35 @@ Facebook Scraper Service
 Uses Scrapy + BeautifulSoup4 + Selenium for scraping Facebook posts
 """
 import re
-import time
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set
 from urllib.parse import urlparse, parse_qs
 
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from src.services.collection.text_extraction import element_text, make_soup
+from src.utils.browser_pool import BrowserPool, get_browser_pool, start_chrome
+
 logger = logging.getLogger(__name__)
 
+# Marks the articles already handed to Python and returns the new ones, so
+# each step parses only the posts loaded by the last scroll
+_NEW_ARTICLES_SCRIPT = """
+var articles = document.querySelectorAll('article:not([data-nf-parsed])');
+var html = [];
+for (var i = 0; i < articles.length; i++) {
+    articles[i].setAttribute('data-nf-parsed', '1');
+    html.push(articles[i].outerHTML);
+}
+return html;
+"""
+_COUNT_NEW_ARTICLES_SCRIPT = "return document.querySelectorAll('article:not([data-nf-parsed])').length;"
+
 
 class FacebookScraper:
     """Facebook profile scraper using Selenium and BeautifulSoup"""
@@ -28,7 +40,8 @@ class FacebookScraper:
         self,
         headless: bool = True,
         wait_timeout: int = 10,
-        scroll_pause: float = 2.0
+        scroll_timeout: float = 10.0,
+        pool: Optional[BrowserPool] = None
     ):
         """
         Initialize Facebook scraper
@@ -36,35 +49,20 @@ class FacebookScraper:
         Args:
             headless: Run browser in headless mode
             wait_timeout: Timeout for page loads (seconds)
-            scroll_pause: Pause between scrolls (seconds)
+            scroll_timeout: Maximum wait for new posts after a scroll (seconds)
+            pool: Browser pool to borrow from (default: the pool of this
+                process; only used with headless browsers)
         """
         self.headless = headless
         self.wait_timeout = wait_timeout
-        self.scroll_pause = scroll_pause
+        self.scroll_timeout = scroll_timeout
+        self.pool = pool
+        # Set by _setup_driver for a browser owned by this scraper
         self.driver = None
     
     def _setup_driver(self) -> webdriver.Chrome:
-        """Setup Chrome WebDriver with options"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # User agent to avoid detection
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.execute_script(
-            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        )
+        """Start a browser owned by this scraper instead of a pooled one"""
+        self.driver = start_chrome(self.headless)
         return self.driver
     
     def _normalize_profile_url(self, identifier: str) -> str:
@@ -155,7 +153,7 @@ class FacebookScraper:
         try:
             comment_elements = post_element.find_all('div', {'data-testid': re.compile(r'comment')})
             for comment_elem in comment_elements[:10]:  # Limit to 10 comments
-                comment_text = comment_elem.get_text(strip=True)
+                comment_text = element_text(comment_elem)
                 if comment_text:
                     comments.append({
                         'text': comment_text,
@@ -195,10 +193,10 @@ class FacebookScraper:
             for selector in content_selectors:
                 content_elem = post_element.find('div', selector)
                 if content_elem:
-                    return content_elem.get_text(strip=True)
+                    return element_text(content_elem)
             
             # Fallback: get all text
-            return post_element.get_text(strip=True)
+            return element_text(post_element)
         except Exception as e:
             logger.debug(f"Error extracting content: {e}")
             return ""
@@ -241,7 +239,8 @@ class FacebookScraper:
         identifier: str,
         source_id: str,
         max_posts: int = 20,
-        scroll_count: int = 3
+        scroll_count: int = 3,
+        known_post_ids: Optional[Set[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Scrape posts from a Facebook profile
@@ -250,60 +249,116 @@ class FacebookScraper:
             identifier: Facebook profile identifier (username, URL, or ID)
             source_id: Source ID for tracking
             max_posts: Maximum number of posts to collect
-            scroll_count: Number of times to scroll down
+            scroll_count: Maximum number of times to scroll down
+            known_post_ids: Post IDs already stored for the source; scraping
+                stops at the first one of them (older posts are stored too)
             
         Returns:
             List of post dictionaries
         """
-        if not self.driver:
-            self._setup_driver()
-        
         profile_url = self._normalize_profile_url(identifier)
         logger.info(f"Scraping Facebook profile: {profile_url}")
+        known_post_ids = known_post_ids or set()
+        
+        if self.driver or not self.headless:
+            if not self.driver:
+                self._setup_driver()
+            return self._scrape_page(
+                self.driver, profile_url, source_id, max_posts, scroll_count, known_post_ids
+            )
         
+        try:
+            with (self.pool or get_browser_pool()).borrow() as browser:
+                browser.pages += 1
+                return self._scrape_page(
+                    browser.driver, profile_url, source_id, max_posts, scroll_count, known_post_ids
+                )
+        except Exception as e:
+            logger.error(f"Error scraping Facebook profile {profile_url}: {e}")
+            return []
+    
+    def _wait_for_new_articles(self, driver: webdriver.Chrome) -> bool:
+        """Wait until articles that were not parsed yet appear"""
+        try:
+            WebDriverWait(driver, self.scroll_timeout, poll_frequency=0.25).until(
+                lambda d: d.execute_script(_COUNT_NEW_ARTICLES_SCRIPT) > 0
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _scrape_page(
+        self,
+        driver: webdriver.Chrome,
+        profile_url: str,
+        source_id: str,
+        max_posts: int,
+        scroll_count: int,
+        known_post_ids: Set[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Load a profile page and parse its posts while scrolling
+        
+        Each step parses only the articles loaded since the previous one and
+        scrolls on only while more posts are needed.
+        """
         posts = []
+        seen_post_ids = set()
+        position = 0
+        scrolls = 0
+        stop_reason = None
         
         try:
             # Navigate to profile
-            self.driver.get(profile_url)
-            time.sleep(3)  # Wait for initial page load
+            driver.get(profile_url)
             
             # Wait for posts to load
             try:
-                WebDriverWait(self.driver, self.wait_timeout).until(
+                WebDriverWait(driver, self.wait_timeout, poll_frequency=0.25).until(
                     EC.presence_of_element_located((By.TAG_NAME, "article"))
                 )
             except TimeoutException:
                 logger.warning(f"Timeout waiting for posts on {profile_url}")
                 return posts
             
-            # Scroll to load more posts
-            for i in range(scroll_count):
-                self.driver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);"
-                )
-                time.sleep(self.scroll_pause)
-            
-            # Parse HTML
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Find post elements (articles)
-            post_elements = soup.find_all('article', limit=max_posts)
-            logger.info(f"Found {len(post_elements)} post elements")
-            
-            # Parse each post
-            seen_post_ids = set()
-            for post_elem in post_elements:
-                post_data = self._parse_post_element(post_elem, source_id)
-                if post_data and post_data['post_id'] not in seen_post_ids:
+            while stop_reason is None:
+                for html in driver.execute_script(_NEW_ARTICLES_SCRIPT):
+                    post_elem = make_soup(html).find('article')
+                    post_data = self._parse_post_element(post_elem, source_id) if post_elem else None
+                    if not post_data or post_data['post_id'] in seen_post_ids:
+                        continue
                     seen_post_ids.add(post_data['post_id'])
-                    posts.append(post_data)
+                    position += 1
+                    
+                    if post_data['post_id'] in known_post_ids:
+                        # The first post may be pinned; any later known post
+                        # means the rest of the timeline is stored already
+                        if position > 1:
+                            stop_reason = "known_post"
+                            break
+                        continue
                     
+                    posts.append(post_data)
                     if len(posts) >= max_posts:
+                        stop_reason = "max_posts"
                         break
+                
+                if stop_reason:
+                    break
+                if scrolls >= scroll_count:
+                    stop_reason = "scroll_count"
+                    break
+                driver.execute_script(
+                    "window.scrollTo(0, document.body.scrollHeight);"
+                )
+                scrolls += 1
+                if not self._wait_for_new_articles(driver):
+                    stop_reason = "no_new_posts"
             
-            logger.info(f"Successfully scraped {len(posts)} posts")
+            logger.info(
+                f"Successfully scraped {len(posts)} posts from {profile_url} "
+                f"after {scrolls} scrolls (stopped: {stop_reason})"
+            )
             
         except Exception as e:
             logger.error(f"Error scraping Facebook profile {profile_url}: {e}")
@@ -317,8 +372,8 @@ class FacebookScraper:
             self.driver = None
     
     def __enter__(self):
-        """Context manager entry"""
-        if not self.driver:
+        """Context manager entry (headless scrapers borrow pooled browsers per profile)"""
+        if not self.driver and not self.headless:
             self._setup_driver()
         return self
     
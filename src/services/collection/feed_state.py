@@ -0,0 +1,152 @@
+"""
+Feed State Store
+Per-URL validators (ETag, Last-Modified, content hash) and last-seen entry IDs
+used for conditional feed polling
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of remembered entry IDs per feed (feeds list at most a few hundred)
+MAX_SEEN_ENTRY_IDS = 500
+
+
+class FeedStateStore:
+    """Persisted fetch state of polled feeds (feed_states collection)"""
+
+    def __init__(self, db):
+        self.collection = db.feed_states
+
+    def get(self, feed_url: str) -> Dict[str, Any]:
+        """
+        Get the stored state of a feed
+
+        Args:
+            feed_url: Feed URL
+
+        Returns:
+            State document, empty dictionary if the feed was never fetched
+        """
+        return self.collection.find_one({"_id": feed_url}) or {}
+
+    @staticmethod
+    def request_headers(state: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Conditional request headers for a stored state"""
+        headers = {}
+        if state:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """SHA-256 of a response body"""
+        return hashlib.sha256(content).hexdigest()
+
+    def check_response(
+        self,
+        feed_url: str,
+        response: httpx.Response,
+        state: Dict[str, Any],
+        content_hash: Optional[str] = None,
+        content_length: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a conditional fetch returned new content
+
+        A 304 response or a body identical to the last one is recorded as not
+        modified. Other error statuses raise httpx.HTTPStatusError.
+
+        Args:
+            feed_url: Feed URL
+            response: Response of the conditional request
+            state: Stored state the request was built from
+            content_hash: Hash of a streamed body (default: hash of response.content)
+            content_length: Bytes of a streamed body
+
+        Returns:
+            New validators to save once the content is stored, or None if
+            the feed did not change
+        """
+        if response.status_code == 304:
+            self.record_not_modified(feed_url, state)
+            return None
+
+        response.raise_for_status()
+
+        if content_hash is None:
+            content_hash = self.content_hash(response.content)
+            content_length = len(response.content)
+        if content_hash == state.get("content_hash"):
+            self.record_not_modified(feed_url, state)
+            return None
+
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+            "content_length": content_length
+        }
+
+    @staticmethod
+    def new_entries(
+        state: Dict[str, Any],
+        entries: List[Dict[str, Any]],
+        id_field: str
+    ) -> List[Dict[str, Any]]:
+        """Drop entries that were already seen in a previous fetch"""
+        seen_ids = set(state.get("entry_ids", []))
+        return [entry for entry in entries if entry.get(id_field) not in seen_ids]
+
+    def record_not_modified(self, feed_url: str, state: Dict[str, Any]) -> None:
+        """Count a poll that was answered without new content"""
+        self.collection.update_one(
+            {"_id": feed_url},
+            {
+                "$set": {"last_checked_at": datetime.utcnow()},
+                "$inc": {
+                    "stats.fetches": 1,
+                    "stats.not_modified": 1,
+                    # Body that did not have to be downloaded or parsed
+                    "stats.bytes_saved": state.get("content_length", 0)
+                }
+            },
+            upsert=True
+        )
+        logger.debug(f"Feed not modified: {feed_url}")
+
+    def record_fetch(
+        self,
+        feed_url: str,
+        validators: Dict[str, Any],
+        entry_ids: List[str]
+    ) -> None:
+        """
+        Save the validators and entry IDs of a fetch whose entries were stored
+
+        Args:
+            feed_url: Feed URL
+            validators: Validators returned by check_response
+            entry_ids: IDs of the entries listed in the feed
+        """
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"_id": feed_url},
+            {
+                "$set": {
+                    **validators,
+                    "entry_ids": [entry_id for entry_id in entry_ids if entry_id][:MAX_SEEN_ENTRY_IDS],
+                    "last_checked_at": now,
+                    "last_changed_at": now
+                },
+                "$inc": {"stats.fetches": 1}
+            },
+            upsert=True
+        )
@@ -0,0 +1,248 @@
+"""
+Streaming Feed Parser
+Incremental RSS/Atom parsing of a feed body while it is downloaded
+"""
+import hashlib
+import logging
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+from feedparser import FeedParserDict
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS10_NS = "http://purl.org/rss/1.0/"
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+
+ENTRY_TAGS = {"item", f"{{{RSS10_NS}}}item", f"{{{ATOM_NS}}}entry"}
+FEED_TAGS = {"channel", f"{{{RSS10_NS}}}channel", f"{{{ATOM_NS}}}feed"}
+# Feed metadata elements -> feed_info key (as in RSSReaderService._parse_feed)
+FEED_INFO_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "subtitle": "description",
+    "link": "link",
+    "language": "language",
+    "lastBuildDate": "updated",
+    "updated": "updated",
+}
+
+
+def _parse_date(text: str):
+    """UTC struct_time of an RFC 822 or ISO 8601 date, like feedparser's *_parsed"""
+    if not text:
+        return None
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            from dateutil import parser
+            parsed = parser.parse(text)
+        except (ValueError, OverflowError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.timetuple()
+
+
+def _markup(element) -> str:
+    """Content of an element as markup (escaped HTML, CDATA or inline XHTML)"""
+    return (element.text or "") + "".join(
+        etree.tostring(child, encoding="unicode", with_tail=True) for child in element
+    )
+
+
+class FeedStream:
+    """
+    Incremental parser of an RSS 2.0, RSS 1.0 or Atom body
+
+    Chunks are fed to an lxml pull parser as they arrive and every entry is
+    yielded as soon as its closing tag is parsed, as a feedparser-style
+    dictionary (so RSSReaderService._parse_entry handles both paths).
+    Yielded entries are removed from the tree, and the body is cut off
+    after max_bytes. The consumer stops reading by not asking for more.
+
+    content_hash covers the first hash_bytes bytes of the body (all of it
+    when hash_bytes is 0); finish_hash reads the rest of that span after an
+    early stop, so hashes of two reads always cover the same bytes.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], max_bytes: int = 0, hash_bytes: int = 0):
+        self.chunks = iter(chunks)
+        self.max_bytes = max_bytes
+        self.hash_bytes = hash_bytes
+        self.version: Optional[str] = None
+        self.feed_info: Dict[str, Any] = {}
+        self.bytes_read = 0
+        self.truncated = False
+        self.entries_parsed = 0
+        self._hash = hashlib.sha256()
+        self._hashed = 0
+        # Body kept for a feedparser fallback until the first entry is parsed
+        self._buffer: Optional[List[bytes]] = []
+        self._parser = etree.XMLPullParser(
+            events=("start", "end"),
+            recover=True,
+            resolve_entities=False,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True
+        )
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the hashed span read so far"""
+        return self._hash.hexdigest()
+
+    @property
+    def hash_complete(self) -> bool:
+        """Whether the whole hashed span was read"""
+        return bool(self.hash_bytes) and self._hashed >= self.hash_bytes
+
+    @property
+    def buffered_content(self) -> Optional[bytes]:
+        """Body read so far, None once an entry was parsed"""
+        return b"".join(self._buffer) if self._buffer is not None else None
+
+    def _read(self, chunk: bytes) -> bytes:
+        if self.max_bytes and self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.bytes_read]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        hashed = chunk[:self.hash_bytes - self._hashed] if self.hash_bytes else chunk
+        self._hash.update(hashed)
+        self._hashed += len(hashed)
+        return chunk
+
+    def finish_hash(self) -> None:
+        """Read (without parsing) the part of the hashed span not read yet"""
+        if self.truncated or self.hash_complete:
+            return
+        for chunk in self.chunks:
+            self._read(chunk)
+            if self.truncated or self.hash_complete:
+                return
+
+    def __iter__(self) -> Iterator[FeedParserDict]:
+        for chunk in self.chunks:
+            chunk = self._read(chunk)
+            if self._buffer is not None:
+                self._buffer.append(chunk)
+            self._parser.feed(chunk)
+            yield from self._read_events()
+            if self.truncated:
+                logger.warning(f"Feed body cut off after {self.bytes_read} bytes")
+                return
+
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError as e:
+            logger.debug(f"Feed body ended unexpectedly: {e}")
+        yield from self._read_events()
+
+    def _read_events(self) -> Iterator[FeedParserDict]:
+        for event, element in self._parser.read_events():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if event == "start":
+                if self.version is None:
+                    self.version = self._detect_version(element)
+                continue
+
+            if tag in ENTRY_TAGS:
+                entry = self._entry(element)
+                self.entries_parsed += 1
+                self._buffer = None
+                # Drop the entry and everything before it from the tree
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+                yield entry
+                continue
+
+            parent = element.getparent()
+            if parent is not None and parent.tag in FEED_TAGS:
+                self._feed_field(element)
+
+    @staticmethod
+    def _detect_version(root) -> str:
+        qname = etree.QName(root)
+        if qname.namespace == ATOM_NS and qname.localname == "feed":
+            return "atom10"
+        if qname.namespace == RDF_NS:
+            return "rss10"
+        if qname.localname == "rss":
+            return "rss" + (root.get("version") or "2.0").replace(".", "")
+        return "unknown"
+
+    def _feed_field(self, element) -> None:
+        name = etree.QName(element).localname
+        key = FEED_INFO_FIELDS.get(name)
+        if not key or key in self.feed_info:
+            return
+        if name == "link" and element.get("href") is not None:
+            if element.get("rel", "alternate") == "alternate":
+                self.feed_info[key] = element.get("href")
+            return
+        self.feed_info[key] = "".join(element.itertext()).strip()
+
+    @staticmethod
+    def _entry(element) -> FeedParserDict:
+        """feedparser-style dictionary of an item/entry element"""
+        entry = FeedParserDict()
+        tags = []
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            qname = etree.QName(child)
+            name, namespace = qname.localname, qname.namespace
+            text = (child.text or "").strip()
+
+            if name == "title":
+                entry["title"] = "".join(child.itertext()).strip()
+            elif name == "link":
+                href = child.get("href")
+                if href is None:
+                    entry.setdefault("link", text)
+                elif child.get("rel", "alternate") == "alternate":
+                    entry.setdefault("link", href)
+            elif name in ("guid", "id"):
+                entry["id"] = text
+            elif name in ("description", "summary"):
+                entry["summary"] = _markup(child)
+            elif (name == "encoded" and namespace == CONTENT_NS) or (name == "content" and namespace == ATOM_NS):
+                entry["content"] = [FeedParserDict(value=_markup(child))]
+            elif name in ("pubDate", "published", "issued", "date"):
+                entry.setdefault("published", text)
+            elif name in ("updated", "modified"):
+                entry["updated"] = text
+            elif name in ("category", "subject"):
+                term = child.get("term") or text
+                if term:
+                    tags.append(FeedParserDict(term=term))
+            elif name in ("author", "creator"):
+                author = child.findtext(f"{{{ATOM_NS}}}name") or text
+                if author:
+                    entry.setdefault("author", author.strip())
+
+        if "id" not in entry and element.get(f"{{{RDF_NS}}}about"):
+            entry["id"] = element.get(f"{{{RDF_NS}}}about")
+        if tags:
+            entry["tags"] = tags
+        for field in ("published", "updated"):
+            parsed = _parse_date(entry.get(field))
+            if parsed:
+                entry[f"{field}_parsed"] = parsed
+        return entry
@@ -0,0 +1,165 @@
+"""
+Bulk Ingest Service
+Shared dedup-and-insert path used by every collector to store posts
+"""
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Optional, Sequence
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config.settings import get_settings
+from src.models.counters import increment_counters
+from src.models.indexes import NATURAL_KEYS, ensure_indexes
+from src.services.search.bm25_index import BM25Index
+from src.services.search.near_duplicates import NearDuplicateIndex
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+_indexes_ensured = False
+
+
+def ensure_natural_key_indexes(db, force: bool = False) -> None:
+    """
+    Make sure the posts indexes, including the natural key ones, exist
+
+    Args:
+        db: MongoDB database
+        force: Re-run index creation even if it already ran in this process
+    """
+    global _indexes_ensured
+    if _indexes_ensured and not force:
+        return
+
+    ensure_indexes(db, ["posts"])
+    _indexes_ensured = True
+
+
+def _get_path(document: Dict[str, Any], path: str) -> Any:
+    """Get a value from a document by dotted path"""
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _insert_fields(document: Dict[str, Any], key_fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Build the $setOnInsert payload for a document
+
+    Sub-documents that contain a natural key field are flattened to dotted
+    paths so they do not conflict with the equality fields of the upsert filter.
+    """
+    prefixes = {field.split(".", 1)[0] for field in key_fields if "." in field}
+    fields = {}
+    for key, value in document.items():
+        if key in key_fields:
+            continue
+        if key in prefixes and isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                path = f"{key}.{sub_key}"
+                if path not in key_fields:
+                    fields[path] = sub_value
+        else:
+            fields[key] = value
+    return fields
+
+
+def bulk_insert_posts(
+    db,
+    documents: List[Dict[str, Any]],
+    key_fields: Sequence[str],
+    label: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Insert posts that do not exist yet with one unordered bulk write
+
+    Args:
+        db: MongoDB database
+        documents: Post documents to store
+        key_fields: Dotted paths of the natural key identifying a post
+        label: Optional label for log messages (e.g. feed URL)
+
+    Returns:
+        Dictionary with inserted, skipped, failed (write errors other than
+        an existing post) and near_duplicates counts
+    """
+    result = {"inserted": 0, "skipped": 0, "failed": 0, "near_duplicates": 0}
+    if not documents:
+        return result
+
+    ensure_natural_key_indexes(db)
+
+    operations = []
+    operation_documents = []
+    seen_keys = set()
+    for document in documents:
+        key = tuple(_get_path(document, field) for field in key_fields)
+        if any(value is None for value in key) or key in seen_keys:
+            result["skipped"] += 1
+            continue
+        seen_keys.add(key)
+        fields = _insert_fields(document, key_fields)
+        # New posts wait for fact-checking
+        fields.setdefault("factcheck_status", "pending")
+        operations.append(UpdateOne(
+            dict(zip(key_fields, key)),
+            {"$setOnInsert": fields},
+            upsert=True
+        ))
+        operation_documents.append(document)
+
+    if not operations:
+        return result
+
+    try:
+        write_result = db.posts.bulk_write(operations, ordered=False)
+        inserted = write_result.upserted_count
+        upserted_ids = dict(write_result.upserted_ids)
+    except BulkWriteError as e:
+        details = e.details or {}
+        inserted = details.get("nUpserted", 0)
+        upserted_ids = {upserted["index"]: upserted["_id"] for upserted in details.get("upserted", [])}
+        for error in details.get("writeErrors", []):
+            # Concurrent collectors may insert the same post; that is a skip
+            if error.get("code") != DUPLICATE_KEY_ERROR:
+                result["failed"] += 1
+                logger.error(f"Error storing post: {error.get('errmsg')}")
+
+    # Keep the per-source post counters of the list endpoint up to date
+    increment_counters(db, "posts", "source_id", Counter(
+        operation_documents[index].get("source_id") for index in upserted_ids
+    ))
+
+    # New posts become retrievable as fact-check references
+    try:
+        BM25Index(db).index_posts(
+            {**operation_documents[index], "_id": post_id}
+            for index, post_id in upserted_ids.items()
+        )
+    except Exception as e:
+        logger.error(f"Error indexing posts for search: {e}")
+
+    # Copies of a stored story are fact-checked through its first copy
+    if get_settings().NEAR_DUPLICATE_ENABLED:
+        try:
+            result["near_duplicates"] = len(NearDuplicateIndex(db).assign_clusters(
+                {**operation_documents[index], "_id": post_id}
+                for index, post_id in sorted(upserted_ids.items())
+            ))
+        except Exception as e:
+            logger.error(f"Error clustering near-duplicate posts: {e}")
+
+    result["inserted"] += inserted
+    result["skipped"] += len(operations) - inserted - result["failed"]
+
+    logger.debug(
+        f"Bulk ingest{f' ({label})' if label else ''}: "
+        f"{result['inserted']} inserted, {result['skipped']} skipped, {result['failed']} failed"
+    )
+    return result
@@ -5,11 +5,14 @@ Integrates with Magyar Közlöny official publications website
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
+import httpx
 import re
 
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_sync_db
+from src.utils.http_client import get_http_engine
+from src.services.search.post_search import PostSearchService
+from src.services.collection.ingest import bulk_insert_posts, NATURAL_KEYS
+from src.services.collection.text_extraction import element_text, make_soup
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,7 @@ class MagyarKozlonyService:
     MAIN_PAGE = f"{BASE_URL}/"
     
     def __init__(self):
-        self.db = connect_mongodb_sync()
+        self.db = get_sync_db()
     
     def fetch_latest_publications(
         self,
@@ -44,12 +47,10 @@ class MagyarKozlonyService:
             # Fetch main page or year-specific page
             url = f"{self.BASE_URL}/" if not year else f"{self.BASE_URL}/?ev={year}"
             
-            response = requests.get(url, timeout=30, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; NincsenekFenyek/1.0; +https://github.com/nincsenekfenyek)"
-            })
+            response = get_http_engine().get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Parse publication list (adjust selectors based on actual structure)
             # Common patterns: table rows, list items, divs with publication info
@@ -74,7 +75,7 @@ class MagyarKozlonyService:
             
             logger.info(f"Magyar Közlöny: Fetched {len(publications)} publications")
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching Magyar Közlöny: {e}")
         except Exception as e:
             logger.error(f"Error parsing Magyar Közlöny: {e}")
@@ -105,12 +106,12 @@ class MagyarKozlonyService:
                 link = f"{self.BASE_URL}{link}" if link.startswith('/') else f"{self.BASE_URL}/{link}"
             
             # Extract text content
-            text = item.get_text(strip=True)
+            text = element_text(item)
             
             # Try to extract publication number, date, title
             publication_number = self._extract_publication_number(text, link)
             publication_date = self._extract_date(text)
-            title = link_elem.get_text(strip=True) or text[:200]
+            title = element_text(link_elem) or text[:200]
             
             # Generate publication ID
             publication_id = self._generate_publication_id(link, publication_number)
@@ -213,17 +214,17 @@ class MagyarKozlonyService:
                     "downloadable": True
                 }
             
-            response = requests.get(publication_url, timeout=30)
+            response = get_http_engine().get(publication_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Extract full content (adjust selectors based on actual structure)
             content_elem = soup.find(['div', 'article', 'main'], class_=re.compile(r'content|article|publication', re.I))
             if not content_elem:
                 content_elem = soup.find('body')
             
-            content = content_elem.get_text(strip=True) if content_elem else ""
+            content = element_text(content_elem)
             
             # Extract metadata
             metadata = {
@@ -248,48 +249,39 @@ class MagyarKozlonyService:
         Returns:
             Number of publications stored
         """
-        stored_count = 0
+        post_docs = []
         
         for publication in publications:
-            try:
-                publication_id = publication.get("publication_id")
-                if not publication_id:
-                    continue
-                
-                # Check if publication already exists
-                existing = self.db.posts.find_one({
-                    "metadata.publication_id": publication_id,
-                    "source": "magyar_kozlony"
-                })
-                
-                if existing:
-                    continue
-                
-                # Prepare post document
-                post_doc = {
-                    "source_id": source_id or "magyar_kozlony_default",
-                    "source": "magyar_kozlony",
-                    "source_type": "official_publication",
-                    "content": publication.get("title", ""),
-                    "title": publication.get("title", ""),
-                    "posted_at": publication.get("publication_date", datetime.utcnow()),
-                    "collected_at": datetime.utcnow(),
-                    "metadata": {
-                        "publication_id": publication_id,
-                        "publication_number": publication.get("publication_number"),
-                        "link": publication.get("link"),
-                        "is_pdf": publication.get("metadata", {}).get("is_pdf", False),
-                        "description": publication.get("title", "")
-                    }
-                }
-                
-                # Insert into database
-                self.db.posts.insert_one(post_doc)
-                stored_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error storing Magyar Közlöny publication: {e}")
+            publication_id = publication.get("publication_id")
+            if not publication_id:
                 continue
+            
+            # Prepare post document
+            post_docs.append({
+                "source_id": source_id or "magyar_kozlony_default",
+                "source": "magyar_kozlony",
+                "source_type": "official_publication",
+                "content": publication.get("title", ""),
+                "title": publication.get("title", ""),
+                "posted_at": publication.get("publication_date", datetime.utcnow()),
+                "collected_at": datetime.utcnow(),
+                "metadata": {
+                    "publication_id": publication_id,
+                    "publication_number": publication.get("publication_number"),
+                    "link": publication.get("link"),
+                    "is_pdf": publication.get("metadata", {}).get("is_pdf", False),
+                    "description": publication.get("title", "")
+                }
+            })
+        
+        # Insert new publications in one round trip, skipping known ones
+        try:
+            stored_count = bulk_insert_posts(
+                self.db, post_docs, NATURAL_KEYS["magyar_kozlony"], label="magyar_kozlony"
+            )["inserted"]
+        except Exception as e:
+            logger.error(f"Error storing Magyar Közlöny publications: {e}")
+            stored_count = 0
         
         logger.info(f"Magyar Közlöny: Stored {stored_count} new publications")
         return stored_count
@@ -355,18 +347,10 @@ class MagyarKozlonyService:
             limit: Maximum results
             
         Returns:
-            List of matching publications
+            List of matching publications, most relevant first
         """
         try:
-            search_filter = {
-                "source": "magyar_kozlony",
-                "$or": [
-                    {"content": {"$regex": query, "$options": "i"}},
-                    {"title": {"$regex": query, "$options": "i"}},
-                    {"metadata.description": {"$regex": query, "$options": "i"}},
-                    {"metadata.publication_number": {"$regex": query, "$options": "i"}}
-                ]
-            }
+            search_filter = {"source": "magyar_kozlony"}
             
             if year:
                 search_filter["posted_at"] = {
@@ -374,13 +358,7 @@ class MagyarKozlonyService:
                     "$lt": datetime(year + 1, 1, 1)
                 }
             
-            publications = list(
-                self.db.posts.find(search_filter)
-                .sort("posted_at", -1)
-                .limit(limit)
-            )
-            
-            return publications
+            return PostSearchService(self.db).search(query, search_filter, limit)
             
         except Exception as e:
             logger.error(f"Error searching Magyar Közlöny publications: {e}")
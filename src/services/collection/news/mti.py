@@ -5,12 +5,16 @@ Integrates with MTI RSS feeds to collect news articles
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import requests
+import httpx
 import feedparser
-from bs4 import BeautifulSoup
 import re
 
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_sync_db
+from src.utils.http_client import get_http_engine
+from src.services.collection.ingest import bulk_insert_posts, NATURAL_KEYS
+from src.services.collection.feed_state import FeedStateStore
+from src.services.collection.text_extraction import html_to_text
+from src.services.search.post_search import PostSearchService
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +35,8 @@ class MTIService:
     }
     
     def __init__(self):
-        self.db = connect_mongodb_sync()
+        self.db = get_sync_db()
+        self.feed_states = FeedStateStore(self.db)
     
     def get_available_feeds(self) -> Dict[str, str]:
         """Get list of available RSS feeds"""
@@ -54,7 +59,31 @@ class MTIService:
         Returns:
             List of article dictionaries
         """
+        return self._fetch_feed_data(feed_type, feed_url, max_items)["articles"]
+    
+    def _fetch_feed_data(
+        self,
+        feed_type: str = "all",
+        feed_url: Optional[str] = None,
+        max_items: int = 50,
+        conditional: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fetch articles from MTI RSS feed, optionally as a conditional request
+        
+        Args:
+            feed_type: Feed type
+            feed_url: Custom RSS feed URL (overrides feed_type)
+            max_items: Maximum number of items to fetch
+            conditional: Send the stored validators and skip parsing when
+                the feed did not change
+            
+        Returns:
+            Dictionary with articles, the not_modified flag and, for a changed
+            conditional fetch, the feed state to save after storing
+        """
         articles = []
+        feed_data = {"articles": articles, "not_modified": False}
         
         # Determine feed URL
         if feed_url:
@@ -64,13 +93,27 @@ class MTIService:
         else:
             logger.warning(f"Unknown feed type: {feed_type}, using 'all'")
             url = self.RSS_FEEDS["all"]
+        feed_data["feed_url"] = url
         
         try:
             # Fetch RSS feed
-            response = requests.get(url, timeout=30, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; NincsenekFenyek/1.0; +https://github.com/nincsenekfenyek)"
-            })
-            response.raise_for_status()
+            state = self.feed_states.get(url) if conditional else None
+            response = get_http_engine().get(
+                url,
+                timeout=30,
+                headers=FeedStateStore.request_headers(state)
+            )
+            
+            if state is None:
+                response.raise_for_status()
+            else:
+                validators = self.feed_states.check_response(url, response, state)
+                if validators is None:
+                    logger.info(f"MTI: {feed_type} feed not modified")
+                    feed_data["not_modified"] = True
+                    return feed_data
+                feed_data["feed_state"] = validators
+                feed_data["seen_state"] = state
             
             # Parse RSS feed
             feed = feedparser.parse(response.content)
@@ -90,12 +133,12 @@ class MTIService:
             
             logger.info(f"MTI: Fetched {len(articles)} articles from {feed_type} feed")
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching MTI RSS feed {url}: {e}")
         except Exception as e:
             logger.error(f"Error parsing MTI RSS feed: {e}")
         
-        return articles
+        return feed_data
     
     def _parse_entry(self, entry: Any, category: str) -> Optional[Dict[str, Any]]:
         """
@@ -143,9 +186,7 @@ class MTIService:
                 content = entry.summary
             
             # Clean HTML from content
-            if content:
-                soup = BeautifulSoup(content, "html.parser")
-                content = soup.get_text(strip=True)
+            content = html_to_text(content)
             
             # Extract description
             description = content[:500] if content else title
@@ -189,61 +230,68 @@ class MTIService:
         url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
         return f"mti_{url_hash}"
     
-    def store_articles(self, articles: List[Dict[str, Any]], source_id: Optional[str] = None) -> int:
+    def store_articles(
+        self,
+        articles: List[Dict[str, Any]],
+        source_id: Optional[str] = None,
+        raise_errors: bool = False
+    ) -> int:
         """
         Store articles in MongoDB
         
         Args:
             articles: List of article dictionaries
             source_id: Optional source ID for tracking
+            raise_errors: Raise instead of logging when articles could not be stored
             
         Returns:
             Number of articles stored
+            
+        Raises:
+            RuntimeError: With raise_errors, when some articles could not be stored
         """
-        stored_count = 0
+        post_docs = []
         
         for article in articles:
-            try:
-                article_id = article.get("article_id")
-                if not article_id:
-                    continue
-                
-                # Check if article already exists
-                existing = self.db.posts.find_one({
-                    "metadata.article_id": article_id,
-                    "source": "mti"
-                })
-                
-                if existing:
-                    continue
-                
-                # Prepare post document
-                post_doc = {
-                    "source_id": source_id or "mti_default",
-                    "source": "mti",
-                    "source_type": "news",
-                    "content": article.get("content", article.get("description", "")),
-                    "title": article.get("title", ""),
-                    "posted_at": article.get("published_at", datetime.utcnow()),
-                    "collected_at": datetime.utcnow(),
-                    "metadata": {
-                        "article_id": article_id,
-                        "link": article.get("link"),
-                        "category": article.get("category", "all"),
-                        "tags": article.get("tags", []),
-                        "description": article.get("description", "")
-                    }
-                }
-                
-                # Insert into database
-                self.db.posts.insert_one(post_doc)
-                stored_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error storing MTI article: {e}")
+            article_id = article.get("article_id")
+            if not article_id:
                 continue
+            
+            # Prepare post document
+            post_docs.append({
+                "source_id": source_id or "mti_default",
+                "source": "mti",
+                "source_type": "news",
+                "content": article.get("content", article.get("description", "")),
+                "title": article.get("title", ""),
+                "posted_at": article.get("published_at", datetime.utcnow()),
+                "collected_at": datetime.utcnow(),
+                "metadata": {
+                    "article_id": article_id,
+                    "link": article.get("link"),
+                    "category": article.get("category", "all"),
+                    "tags": article.get("tags", []),
+                    "description": article.get("description", "")
+                }
+            })
+        
+        # Insert new articles in one round trip, skipping known ones
+        try:
+            ingest_result = bulk_insert_posts(
+                self.db, post_docs, NATURAL_KEYS["mti"], label="mti"
+            )
+        except Exception as e:
+            logger.error(f"Error storing MTI articles: {e}")
+            if raise_errors:
+                raise
+            return 0
         
+        stored_count = ingest_result["inserted"]
         logger.info(f"MTI: Stored {stored_count} new articles")
+        if ingest_result["failed"] and raise_errors:
+            raise RuntimeError(
+                f"{ingest_result['failed']} of {len(post_docs)} MTI articles could not be stored"
+            )
         return stored_count
     
     def collect_articles(
@@ -267,21 +315,46 @@ class MTIService:
         Returns:
             Dictionary with collection results
         """
-        # Fetch articles
-        articles = self.fetch_feed(feed_type, feed_url, max_items)
+        # Fetch articles; when storing, an unchanged feed is skipped
+        feed_data = self._fetch_feed_data(feed_type, feed_url, max_items, conditional=store)
+        articles = feed_data["articles"]
         
         # Store articles if requested
         stored_count = 0
+        store_error = None
         if store and articles:
-            stored_count = self.store_articles(articles, source_id)
+            new_articles = articles
+            if "seen_state" in feed_data:
+                # Articles listed in the previous fetch are already stored
+                new_articles = FeedStateStore.new_entries(
+                    feed_data["seen_state"], articles, "article_id"
+                )
+            if new_articles:
+                try:
+                    stored_count = self.store_articles(new_articles, source_id, raise_errors=True)
+                except Exception as e:
+                    store_error = f"Error storing articles: {e}"
+        
+        # The state is saved only once every article is stored (or existed), so
+        # the articles of a failed store are fetched and stored again next poll
+        if store and "feed_state" in feed_data and store_error is None:
+            self.feed_states.record_fetch(
+                feed_data["feed_url"],
+                feed_data["feed_state"],
+                [article.get("article_id") for article in articles]
+            )
         
-        return {
-            "success": True,
+        result = {
+            "success": store_error is None,
             "feed_type": feed_type,
+            "not_modified": feed_data["not_modified"],
             "articles_fetched": len(articles),
             "articles_stored": stored_count,
             "articles": articles[:10] if not store else []  # Return samples if not storing
         }
+        if store_error:
+            result["error"] = store_error
+        return result
     
     def search_articles(
         self,
@@ -298,28 +371,15 @@ class MTIService:
             limit: Maximum results
             
         Returns:
-            List of matching articles
+            List of matching articles, most relevant first
         """
         try:
-            search_filter = {
-                "source": "mti",
-                "$or": [
-                    {"content": {"$regex": query, "$options": "i"}},
-                    {"title": {"$regex": query, "$options": "i"}},
-                    {"metadata.description": {"$regex": query, "$options": "i"}}
-                ]
-            }
+            search_filter = {"source": "mti"}
             
             if category:
                 search_filter["metadata.category"] = category
             
-            articles = list(
-                self.db.posts.find(search_filter)
-                .sort("posted_at", -1)
-                .limit(limit)
-            )
-            
-            return articles
+            return PostSearchService(self.db).search(query, search_filter, limit)
             
         except Exception as e:
             logger.error(f"Error searching MTI articles: {e}")
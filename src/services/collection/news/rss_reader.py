@@ -3,15 +3,22 @@ RSS Feed Reader Service
 General-purpose RSS/Atom feed reader for collecting articles from any RSS feed
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import requests
+import httpx
 import feedparser
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse
 
-from src.models.database import connect_mongodb_sync
+from src.config.settings import get_settings
+from src.models.database import get_sync_db
+from src.utils.http_client import get_http_engine
+from src.services.collection.ingest import bulk_insert_posts, NATURAL_KEYS
+from src.services.collection.feed_state import FeedStateStore
+from src.services.collection.feed_stream import FeedStream, LXML_AVAILABLE
+from src.services.collection.text_extraction import html_to_text
+from src.services.search.post_search import PostSearchService
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +27,9 @@ class RSSReaderService:
     """Service for reading RSS and Atom feeds"""
     
     def __init__(self):
-        self.db = connect_mongodb_sync()
+        self.settings = get_settings()
+        self.db = get_sync_db()
+        self.feed_states = FeedStateStore(self.db)
     
     def validate_feed_url(self, feed_url: str) -> bool:
         """
@@ -37,14 +46,9 @@ class RSSReaderService:
             if not parsed.scheme or not parsed.netloc:
                 return False
             
-            # Try to fetch and parse feed
-            response = requests.get(feed_url, timeout=10, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; NincsenekFenyek/1.0; +https://github.com/nincsenekfenyek)"
-            })
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
-            return feed.entries is not None and len(feed.entries) > 0
+            # Try to fetch the feed and parse its first entry
+            feed_data = self._fetch_feed_stream(feed_url, max_items=1, timeout=10, state=None)
+            return len(feed_data["entries"]) > 0
         
         except Exception as e:
             logger.warning(f"Feed URL validation failed: {e}")
@@ -54,67 +58,304 @@ class RSSReaderService:
         self,
         feed_url: str,
         max_items: int = 50,
-        timeout: int = 30
+        timeout: int = 30,
+        conditional: bool = False
     ) -> Dict[str, Any]:
         """
         Fetch and parse RSS/Atom feed
         
+        The body is parsed while it streams in and reading stops after
+        max_items entries or, for conditional fetches of feeds listing the
+        newest entries first, at the first entry after the top one that was
+        listed in the previous fetch (the entries after it are stored).
+        
         Args:
             feed_url: RSS feed URL
             max_items: Maximum number of items to fetch
             timeout: Request timeout in seconds
+            conditional: Send the stored validators and skip parsing when
+                the feed did not change
             
         Returns:
-            Dictionary with feed metadata and entries
+            Dictionary with feed metadata and entries; "not_modified" is True
+            when a conditional fetch found no change, "bytes_read",
+            "truncated" (FEED_MAX_BYTES reached) and "stopped" report how
+            much of the body was read
         """
         try:
-            response = requests.get(feed_url, timeout=timeout, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; NincsenekFenyek/1.0; +https://github.com/nincsenekfenyek)"
-            })
-            response.raise_for_status()
-            
-            # Parse feed
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo and feed.bozo_exception:
-                logger.warning(f"RSS feed parsing warning for {feed_url}: {feed.bozo_exception}")
-            
-            # Extract feed metadata
-            feed_info = {
-                "title": feed.feed.get("title", ""),
-                "description": feed.feed.get("description", ""),
-                "link": feed.feed.get("link", feed_url),
-                "language": feed.feed.get("language", ""),
-                "updated": feed.feed.get("updated", ""),
-                "feed_type": feed.version if hasattr(feed, "version") else "unknown"
-            }
+            state = self.feed_states.get(feed_url) if conditional else None
+            return self._fetch_feed_stream(feed_url, max_items, timeout, state)
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching RSS feed {feed_url}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error parsing RSS feed {feed_url}: {e}")
+            raise
+    
+    def fetch_feeds(
+        self,
+        feed_urls: List[str],
+        max_items: int = 50,
+        timeout: int = 30,
+        conditional: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and parse several RSS/Atom feeds concurrently
+        
+        Args:
+            feed_urls: RSS feed URLs
+            max_items: Maximum number of items to fetch per feed
+            timeout: Request timeout in seconds
+            conditional: Send the stored validators of every feed
             
-            # Parse entries
-            entries = []
-            for entry in feed.entries[:max_items]:
-                try:
-                    parsed_entry = self._parse_entry(entry, feed_url)
-                    if parsed_entry:
-                        entries.append(parsed_entry)
-                except Exception as e:
-                    logger.error(f"Error parsing feed entry: {e}")
-                    continue
+        Returns:
+            List of feed dictionaries in input order; failed feeds
+            have an "error" key instead of entries
+        """
+        def fetch(feed_url: str) -> Dict[str, Any]:
+            try:
+                state = self.feed_states.get(feed_url) if conditional else None
+                return self._fetch_feed_stream(feed_url, max_items, timeout, state)
+            except Exception as e:
+                logger.error(f"Error fetching RSS feed {feed_url}: {e}")
+                return {
+                    "feed_url": feed_url,
+                    "entries": [],
+                    "error": str(e)
+                }
+        
+        if not feed_urls:
+            return []
+        # Each stream is parsed on its own thread while the engine loop downloads
+        workers = max(1, min(self.settings.FEED_FETCH_CONCURRENCY, len(feed_urls)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-feeds") as executor:
+            return list(executor.map(fetch, feed_urls))
+    
+    def _fetch_feed_stream(
+        self,
+        feed_url: str,
+        max_items: int,
+        timeout: int,
+        state: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Stream a feed and turn it into a feed dictionary
+        
+        With a stored state (conditional fetch) an unchanged feed is not
+        parsed, and the new validators are returned under "feed_state" to be
+        saved after the entries are stored.
+        
+        Stopping at a known entry assumes the newest entries come first, so
+        it is done only for feeds whose previous read was in that order
+        (recorded as "newest_first"); others are read in full. The content
+        hash covers the first FEED_HASH_BYTES of a newest-first feed and the
+        whole body of other feeds, read past an early stop if necessary, so
+        two fetches are always compared over the same bytes.
+        """
+        with get_http_engine().stream(
+            feed_url,
+            timeout=timeout,
+            headers=FeedStateStore.request_headers(state)
+        ) as response:
+            if state is not None and response.status_code == 304:
+                self.feed_states.check_response(feed_url, response, state)
+                return self._not_modified(feed_url, state)
+            response.raise_for_status()
             
-            logger.info(f"RSS Feed: Fetched {len(entries)} items from {feed_url}")
+            newest_first = bool(state and state.get("newest_first"))
+            hash_bytes = self.settings.FEED_HASH_BYTES if newest_first else 0
+            if not LXML_AVAILABLE:
+                content = b"".join(response.iter_bytes())
+                feed_data = self._parse_feed(content, feed_url, max_items)
+                content_hash = FeedStateStore.content_hash(content[:hash_bytes] if hash_bytes else content)
+                bytes_read = len(content)
+            else:
+                known_ids = set(state.get("entry_ids", [])) if state else set()
+                stream = FeedStream(
+                    response.iter_bytes(),
+                    max_bytes=self.settings.FEED_MAX_BYTES,
+                    hash_bytes=hash_bytes
+                )
+                feed_data = self._parse_feed_stream(
+                    stream, feed_url, max_items, known_ids, stop_at_known=newest_first
+                )
+                if state is not None:
+                    stream.finish_hash()
+                content_hash, bytes_read = stream.content_hash, stream.bytes_read
+        
+        if state is None:
+            return feed_data
+        
+        # A body whose read part matches the last one is unchanged
+        validators = self.feed_states.check_response(
+            feed_url, response, state, content_hash=content_hash, content_length=bytes_read
+        )
+        if validators is None:
+            return self._not_modified(feed_url, state)
+        
+        feed_data["feed_state"] = {
+            **validators,
+            "feed_info": feed_data["feed_info"],
+            "newest_first": feed_data.get("newest_first", False)
+        }
+        feed_data["seen_state"] = state
+        return feed_data
+    
+    def _not_modified(self, feed_url: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        logger.info(f"RSS Feed: {feed_url} not modified")
+        return {
+            "feed_info": state.get("feed_info", {}),
+            "entries": [],
+            "feed_url": feed_url,
+            "fetched_at": datetime.utcnow(),
+            "not_modified": True
+        }
+    
+    def _parse_feed_stream(
+        self,
+        stream: FeedStream,
+        feed_url: str,
+        max_items: int,
+        known_ids: set,
+        stop_at_known: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse entries from a feed stream until max_items or a known entry
+        
+        Known entries are skipped. The first entry may be pinned, so only a
+        later known entry ends the read, and only while the entries read
+        after the first one are newest first.
+        
+        Args:
+            stream: Feed stream over the response body
+            feed_url: RSS feed URL
+            max_items: Maximum number of items to parse
+            known_ids: Entry IDs already stored
+            stop_at_known: End the read at a known entry (newest-first feeds)
             
-            return {
-                "feed_info": feed_info,
+        Returns:
+            Dictionary with feed metadata, entries, read statistics and
+            newest_first (the dates of the entries read after the first one
+            never increase)
+        """
+        entries = []
+        stopped = "end"
+        position = 0
+        newest_first = True
+        previous_published = None
+        for entry in stream:
+            try:
+                parsed_entry = self._parse_entry(entry, feed_url)
+            except Exception as e:
+                logger.error(f"Error parsing feed entry: {e}")
+                continue
+            if not parsed_entry:
+                continue
+            position += 1
+            
+            published = parsed_entry.get("published_at")
+            if position > 1 and published is not None:
+                if previous_published is not None and published > previous_published:
+                    newest_first = False
+                previous_published = published
+            
+            if parsed_entry["entry_id"] in known_ids:
+                # The first entry may be pinned; any later known entry of a
+                # newest-first feed means the rest of the feed is stored
+                if stop_at_known and position > 1 and newest_first:
+                    stopped = "known_entry"
+                    break
+                continue
+            entries.append(parsed_entry)
+            if len(entries) >= max_items:
+                stopped = "max_items"
+                break
+        if stream.truncated:
+            stopped = "max_bytes"
+        
+        if stream.entries_parsed == 0 and stream.buffered_content:
+            # Not a feed lxml can read incrementally: let feedparser try the body
+            feed_data = self._parse_feed(stream.buffered_content, feed_url, max_items)
+            newest_first = False
+        else:
+            feed_data = {
+                "feed_info": {
+                    "title": stream.feed_info.get("title", ""),
+                    "description": stream.feed_info.get("description", ""),
+                    "link": stream.feed_info.get("link", feed_url),
+                    "language": stream.feed_info.get("language", ""),
+                    "updated": stream.feed_info.get("updated", ""),
+                    "feed_type": stream.version or "unknown"
+                },
                 "entries": entries,
                 "feed_url": feed_url,
                 "fetched_at": datetime.utcnow()
             }
+            logger.info(
+                f"RSS Feed: Fetched {len(entries)} items from {feed_url} "
+                f"({stream.bytes_read} bytes, stopped: {stopped})"
+            )
         
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching RSS feed {feed_url}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Error parsing RSS feed {feed_url}: {e}")
-            raise
+        feed_data.update({
+            "bytes_read": stream.bytes_read,
+            "truncated": stream.truncated,
+            "stopped": stopped,
+            "newest_first": newest_first
+        })
+        return feed_data
+    
+    def _parse_feed(
+        self,
+        content: bytes,
+        feed_url: str,
+        max_items: int
+    ) -> Dict[str, Any]:
+        """
+        Parse a downloaded RSS/Atom feed body
+        
+        Args:
+            content: Raw feed body
+            feed_url: RSS feed URL
+            max_items: Maximum number of items to parse
+            
+        Returns:
+            Dictionary with feed metadata and entries
+        """
+        feed = feedparser.parse(content)
+        
+        if feed.bozo and feed.bozo_exception:
+            logger.warning(f"RSS feed parsing warning for {feed_url}: {feed.bozo_exception}")
+        
+        # Extract feed metadata
+        feed_info = {
+            "title": feed.feed.get("title", ""),
+            "description": feed.feed.get("description", ""),
+            "link": feed.feed.get("link", feed_url),
+            "language": feed.feed.get("language", ""),
+            "updated": feed.feed.get("updated", ""),
+            "feed_type": feed.version if hasattr(feed, "version") else "unknown"
+        }
+        
+        # Parse entries
+        entries = []
+        for entry in feed.entries[:max_items]:
+            try:
+                parsed_entry = self._parse_entry(entry, feed_url)
+                if parsed_entry:
+                    entries.append(parsed_entry)
+            except Exception as e:
+                logger.error(f"Error parsing feed entry: {e}")
+                continue
+        
+        logger.info(f"RSS Feed: Fetched {len(entries)} items from {feed_url}")
+        
+        return {
+            "feed_info": feed_info,
+            "entries": entries,
+            "feed_url": feed_url,
+            "fetched_at": datetime.utcnow()
+        }
     
     def _parse_entry(self, entry: Any, feed_url: str) -> Optional[Dict[str, Any]]:
         """
@@ -169,9 +410,7 @@ class RSSReaderService:
                 content = entry.description
             
             # Clean HTML from content
-            if content:
-                soup = BeautifulSoup(content, "html.parser")
-                content = soup.get_text(strip=True)
+            content = html_to_text(content)
             
             # Extract description (first 500 chars of content or summary)
             description = content[:500] if content else title
@@ -259,7 +498,8 @@ class RSSReaderService:
         entries: List[Dict[str, Any]],
         feed_url: str,
         source_id: Optional[str] = None,
-        feed_name: Optional[str] = None
+        feed_name: Optional[str] = None,
+        raise_errors: bool = False
     ) -> int:
         """
         Store feed entries in MongoDB
@@ -269,57 +509,59 @@ class RSSReaderService:
             feed_url: RSS feed URL
             source_id: Optional source ID for tracking
             feed_name: Optional feed name
+            raise_errors: Raise instead of logging when entries could not be stored
             
         Returns:
             Number of entries stored
+            
+        Raises:
+            RuntimeError: With raise_errors, when some entries could not be stored
         """
-        stored_count = 0
+        post_docs = []
         
         for entry in entries:
-            try:
-                entry_id = entry.get("entry_id")
-                if not entry_id:
-                    continue
-                
-                # Check if entry already exists
-                existing = self.db.posts.find_one({
-                    "metadata.entry_id": entry_id,
-                    "metadata.feed_url": feed_url
-                })
-                
-                if existing:
-                    continue
-                
-                # Prepare post document
-                post_doc = {
-                    "source_id": source_id or f"rss_{feed_url}",
-                    "source": "rss",
-                    "source_type": "news",
-                    "content": entry.get("content", entry.get("description", "")),
-                    "title": entry.get("title", ""),
-                    "posted_at": entry.get("published_at", datetime.utcnow()),
-                    "collected_at": datetime.utcnow(),
-                    "metadata": {
-                        "entry_id": entry_id,
-                        "feed_url": feed_url,
-                        "feed_name": feed_name or entry.get("feed_url", ""),
-                        "link": entry.get("link"),
-                        "author": entry.get("author"),
-                        "tags": entry.get("tags", []),
-                        "description": entry.get("description", ""),
-                        "guid": entry.get("metadata", {}).get("guid")
-                    }
-                }
-                
-                # Insert into database
-                self.db.posts.insert_one(post_doc)
-                stored_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error storing RSS entry: {e}")
+            entry_id = entry.get("entry_id")
+            if not entry_id:
                 continue
+            
+            # Prepare post document
+            post_docs.append({
+                "source_id": source_id or f"rss_{feed_url}",
+                "source": "rss",
+                "source_type": "news",
+                "content": entry.get("content", entry.get("description", "")),
+                "title": entry.get("title", ""),
+                "posted_at": entry.get("published_at", datetime.utcnow()),
+                "collected_at": datetime.utcnow(),
+                "metadata": {
+                    "entry_id": entry_id,
+                    "feed_url": feed_url,
+                    "feed_name": feed_name or entry.get("feed_url", ""),
+                    "link": entry.get("link"),
+                    "author": entry.get("author"),
+                    "tags": entry.get("tags", []),
+                    "description": entry.get("description", ""),
+                    "guid": entry.get("metadata", {}).get("guid")
+                }
+            })
         
+        # Insert new entries in one round trip, skipping known ones
+        try:
+            ingest_result = bulk_insert_posts(
+                self.db, post_docs, NATURAL_KEYS["rss"], label=feed_url
+            )
+        except Exception as e:
+            logger.error(f"Error storing RSS entries: {e}")
+            if raise_errors:
+                raise
+            return 0
+        
+        stored_count = ingest_result["inserted"]
         logger.info(f"RSS Feed: Stored {stored_count} new entries from {feed_url}")
+        if ingest_result["failed"] and raise_errors:
+            raise RuntimeError(
+                f"{ingest_result['failed']} of {len(post_docs)} entries from {feed_url} could not be stored"
+            )
         return stored_count
     
     def collect_feed(
@@ -333,6 +575,9 @@ class RSSReaderService:
         """
         Collect entries from RSS feed
         
+        When storing, the feed is fetched conditionally: an unchanged feed is
+        reported as not_modified and neither parsed nor stored.
+        
         Args:
             feed_url: RSS feed URL
             max_items: Maximum items to fetch
@@ -344,28 +589,96 @@ class RSSReaderService:
             Dictionary with collection results
         """
         # Fetch feed
-        feed_data = self.fetch_feed(feed_url, max_items)
+        feed_data = self.fetch_feed(feed_url, max_items, conditional=store)
+        
+        return self._collect_feed_data(feed_data, store, source_id, feed_name)
+    
+    def collect_feeds(
+        self,
+        feed_urls: List[str],
+        max_items: int = 50,
+        store: bool = True,
+        source_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect entries from several RSS feeds, fetched concurrently
         
+        Args:
+            feed_urls: RSS feed URLs
+            max_items: Maximum items to fetch per feed
+            store: Whether to store in database
+            source_id: Optional source ID
+            
+        Returns:
+            List of collection result dictionaries, one per feed
+        """
+        return [
+            self._collect_feed_data(feed_data, store, source_id)
+            for feed_data in self.fetch_feeds(feed_urls, max_items, conditional=store)
+        ]
+    
+    def _collect_feed_data(
+        self,
+        feed_data: Dict[str, Any],
+        store: bool,
+        source_id: Optional[str] = None,
+        feed_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Store the entries of a fetched feed and build the collection result"""
+        feed_url = feed_data["feed_url"]
         entries = feed_data.get("entries", [])
         
         # Store entries if requested
         stored_count = 0
+        store_error = None
         if store and entries:
-            stored_count = self.store_entries(
-                entries,
-                feed_url,
-                source_id,
-                feed_name or feed_data.get("feed_info", {}).get("title", "")
-            )
+            new_entries = entries
+            if "seen_state" in feed_data:
+                # Entries listed in the previous fetch are already stored
+                new_entries = FeedStateStore.new_entries(
+                    feed_data["seen_state"], entries, "entry_id"
+                )
+            if new_entries:
+                try:
+                    stored_count = self.store_entries(
+                        new_entries,
+                        feed_url,
+                        source_id,
+                        feed_name or feed_data.get("feed_info", {}).get("title", ""),
+                        raise_errors=True
+                    )
+                except Exception as e:
+                    store_error = f"Error storing entries: {e}"
         
-        return {
-            "success": True,
+        # The state is saved only once every entry is stored (or existed), so
+        # the entries of a failed store are fetched and stored again next poll
+        if store and "feed_state" in feed_data and store_error is None:
+            entry_ids = [entry.get("entry_id") for entry in entries]
+            # Entries after the first known one were not read, keep their IDs
+            read_ids = set(entry_ids)
+            entry_ids += [
+                entry_id for entry_id in feed_data["seen_state"].get("entry_ids", [])
+                if entry_id not in read_ids
+            ]
+            self.feed_states.record_fetch(feed_url, feed_data["feed_state"], entry_ids)
+        
+        result = {
+            "success": "error" not in feed_data,
             "feed_url": feed_url,
             "feed_info": feed_data.get("feed_info", {}),
+            "not_modified": feed_data.get("not_modified", False),
             "entries_fetched": len(entries),
             "entries_stored": stored_count,
+            "bytes_read": feed_data.get("bytes_read", 0),
+            "truncated": feed_data.get("truncated", False),
             "entries": entries[:10] if not store else []  # Return samples if not storing
         }
+        if "error" in feed_data:
+            result["error"] = feed_data["error"]
+        elif store_error:
+            result["success"] = False
+            result["error"] = store_error
+        return result
     
     def search_entries(
         self,
@@ -382,28 +695,15 @@ class RSSReaderService:
             limit: Maximum results
             
         Returns:
-            List of matching entries
+            List of matching entries, most relevant first
         """
         try:
-            search_filter = {
-                "source": "rss",
-                "$or": [
-                    {"content": {"$regex": query, "$options": "i"}},
-                    {"title": {"$regex": query, "$options": "i"}},
-                    {"metadata.description": {"$regex": query, "$options": "i"}}
-                ]
-            }
+            search_filter = {"source": "rss"}
             
             if feed_url:
                 search_filter["metadata.feed_url"] = feed_url
             
-            entries = list(
-                self.db.posts.find(search_filter)
-                .sort("posted_at", -1)
-                .limit(limit)
-            )
-            
-            return entries
+            return PostSearchService(self.db).search(query, search_filter, limit)
             
         except Exception as e:
             logger.error(f"Error searching RSS entries: {e}")
@@ -0,0 +1,199 @@
+"""
+Adaptive Collection Scheduler
+Polls each source at an interval derived from its observed new-item rate
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from pymongo import ReturnDocument
+
+from src.config.settings import get_settings
+from src.models.database import get_sync_db
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionScheduler:
+    """
+    Per-source polling schedule stored in the source document
+
+    After every collection the new-item rate (items per hour) is folded into
+    an exponentially weighted moving average, and the next interval is the
+    time in which SCHEDULER_TARGET_NEW_ITEMS new items are expected. A poll
+    without new items at most doubles the interval, so quiet sources back off
+    gradually while a burst of items tightens the interval at once. Intervals
+    stay within the configured bounds.
+
+    Sources with a fixed collection_schedule in their config (interval or
+    cron) keep that schedule.
+    """
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_sync_db()
+        self.settings = get_settings()
+
+    def _bounds(self, source_doc: Dict[str, Any]) -> tuple:
+        """Minimum and maximum interval in seconds for a source"""
+        schedule_config = (source_doc.get("config") or {}).get("collection_schedule") or {}
+        return (
+            schedule_config.get("min_interval", self.settings.SCHEDULER_MIN_INTERVAL),
+            schedule_config.get("max_interval", self.settings.SCHEDULER_MAX_INTERVAL),
+        )
+
+    def _fixed_delay(self, source_doc: Dict[str, Any], now: datetime) -> Optional[float]:
+        """Seconds until the next run of a fixed schedule, None if the source is adaptive"""
+        # Imported here: tasks imports this module
+        from src.models.mongodb_models import Source
+        from src.services.collection.tasks import get_collection_schedule_for_source
+
+        schedule_entry = get_collection_schedule_for_source(Source.from_dict(source_doc))
+        if not schedule_entry:
+            return None
+
+        schedule = schedule_entry["schedule"]
+        if isinstance(schedule, (int, float)):
+            return float(schedule)
+        # crontab
+        return schedule.remaining_estimate(now).total_seconds()
+
+    def next_interval(
+        self,
+        state: Dict[str, Any],
+        new_items: int,
+        elapsed_seconds: float,
+        min_interval: float,
+        max_interval: float
+    ) -> Dict[str, Any]:
+        """
+        Compute the new schedule state after a collection
+
+        Args:
+            state: Previous schedule state of the source
+            new_items: Number of new items stored by the collection
+            elapsed_seconds: Time since the previous collection
+            min_interval: Lower interval bound in seconds
+            max_interval: Upper interval bound in seconds
+
+        Returns:
+            Updated schedule state (interval_seconds, new_items_rate, last_new_items)
+        """
+        previous_interval = state.get("interval_seconds", self.settings.SCHEDULER_DEFAULT_INTERVAL)
+        observed_rate = new_items * 3600 / max(elapsed_seconds, 1.0)
+
+        alpha = self.settings.SCHEDULER_RATE_SMOOTHING
+        previous_rate = state.get("new_items_rate")
+        rate = observed_rate if previous_rate is None else (
+            alpha * observed_rate + (1 - alpha) * previous_rate
+        )
+
+        if rate > 0:
+            interval = self.settings.SCHEDULER_TARGET_NEW_ITEMS * 3600 / rate
+        else:
+            interval = max_interval
+        if new_items == 0:
+            # Back off step by step instead of jumping to the upper bound
+            interval = min(interval, previous_interval * 2)
+
+        return {
+            "interval_seconds": min(max(interval, min_interval), max_interval),
+            "new_items_rate": rate,
+            "last_new_items": new_items,
+        }
+
+    def record_collection(
+        self,
+        source_doc: Dict[str, Any],
+        new_items: int,
+        collected_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Update the schedule of a source after a collection
+
+        Also sets last_collected_at.
+
+        Args:
+            source_doc: Source document (as loaded before the collection)
+            new_items: Number of new items stored
+            collected_at: Collection time (default: now)
+
+        Returns:
+            The new schedule state
+        """
+        collected_at = collected_at or datetime.utcnow()
+        state = source_doc.get("schedule") or {}
+        last_collected_at = source_doc.get("last_collected_at")
+        elapsed = (
+            (collected_at - last_collected_at).total_seconds()
+            if last_collected_at
+            else state.get("interval_seconds", self.settings.SCHEDULER_DEFAULT_INTERVAL)
+        )
+
+        fixed_delay = self._fixed_delay(source_doc, collected_at)
+        if fixed_delay is not None:
+            schedule = {
+                **state,
+                "interval_seconds": fixed_delay,
+                "last_new_items": new_items,
+                "adaptive": False,
+            }
+        else:
+            min_interval, max_interval = self._bounds(source_doc)
+            schedule = {
+                **state,
+                **self.next_interval(state, new_items, elapsed, min_interval, max_interval),
+                "adaptive": True,
+            }
+        schedule["next_collection_at"] = collected_at + timedelta(
+            seconds=schedule["interval_seconds"]
+        )
+
+        self.db.sources.update_one(
+            {"_id": source_doc["_id"]},
+            {"$set": {"schedule": schedule, "last_collected_at": collected_at}}
+        )
+
+        logger.info(
+            f"Source {source_doc['_id']}: {new_items} new items, "
+            f"next collection in {schedule['interval_seconds'] / 60:.1f} min"
+        )
+        return schedule
+
+    def claim_due_sources(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get the active sources due for collection and lease them
+
+        The next_collection_at of each returned source is moved forward by
+        SCHEDULER_LEASE_SECONDS so overlapping scheduler runs do not dispatch
+        it twice; record_collection replaces the lease with the real schedule.
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            List of claimed source documents
+        """
+        now = now or datetime.utcnow()
+        lease_until = now + timedelta(seconds=self.settings.SCHEDULER_LEASE_SECONDS)
+        due_filter = {
+            "is_active": True,
+            "$or": [
+                {"schedule.next_collection_at": {"$lte": now}},
+                {"schedule.next_collection_at": {"$exists": False}},
+            ]
+        }
+
+        claimed = []
+        while True:
+            source_doc = self.db.sources.find_one_and_update(
+                due_filter,
+                {"$set": {"schedule.next_collection_at": lease_until}},
+                projection={"_id": 1, "source_type": 1},
+                sort=[("schedule.next_collection_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if not source_doc:
+                break
+            claimed.append(source_doc)
+
+        return claimed
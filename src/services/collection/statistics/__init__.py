@@ -4,7 +4,9 @@ Provides integration with statistical data sources (EUROSTAT, KSH, etc.)
 """
 
 from .eurostat import EurostatService
+from .eurostat_catalogue import EurostatCatalogue
 from .ksh import KSHService
+from .refresh import DatasetRefresher
 
-__all__ = ["EurostatService", "KSHService"]
+__all__ = ["EurostatService", "EurostatCatalogue", "KSHService", "DatasetRefresher"]
 
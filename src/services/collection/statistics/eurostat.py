@@ -3,12 +3,20 @@ EUROSTAT API Service
 Integrates with EUROSTAT REST API to fetch and store statistical data
 """
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import requests
+import httpx
 from urllib.parse import urlencode
 
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_sync_db
+from src.services.collection.statistics.eurostat_catalogue import EurostatCatalogue
+from src.services.collection.statistics.jsonstat import (
+    JsonStatDataset,
+    decode_dataset_document,
+    encode_dataset_fields,
+)
+from src.utils.http_client import get_http_engine
 
 logger = logging.getLogger(__name__)
 
@@ -18,24 +26,38 @@ class EurostatService:
     
     BASE_URL = "https://ec.europa.eu/eurostat/api/dissemination/statistics/1.0"
     
-    def __init__(self):
-        self.db = connect_mongodb_sync()
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_sync_db()
+        self.catalogue = EurostatCatalogue(db=self.db)
     
     def search_datasets(
         self,
         query: str,
-        language: str = "en"
+        language: str = "en",
+        timeout: float = 30.0
     ) -> List[Dict[str, Any]]:
         """
         Search for datasets in EUROSTAT
         
+        Answered from the local catalogue mirror; the remote API is only
+        queried while the mirror is empty or unavailable.
+        
         Args:
             query: Search query
             language: Language code (en, de, fr, etc.)
+            timeout: HTTP timeout of the remote search in seconds
             
         Returns:
             List of dataset metadata dictionaries
         """
+        try:
+            results = self.catalogue.search(query, language=language)
+            if results is not None:
+                logger.debug(f"EUROSTAT catalogue: Found {len(results)} datasets for query: {query}")
+                return results
+        except Exception as e:
+            logger.warning(f"EUROSTAT catalogue mirror unavailable, searching remotely: {e}")
+        
         results = []
         
         try:
@@ -46,7 +68,7 @@ class EurostatService:
                 "format": "JSON"
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_engine().get(url, params=params, timeout=timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -66,7 +88,7 @@ class EurostatService:
             
             logger.info(f"EUROSTAT: Found {len(results)} datasets for query: {query}")
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"EUROSTAT API error during search: {e}")
         except Exception as e:
             logger.error(f"Error searching EUROSTAT datasets: {e}")
@@ -96,7 +118,7 @@ class EurostatService:
                 "lastTimePeriod": 1  # Only get metadata, not all data
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_engine().get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -113,7 +135,7 @@ class EurostatService:
                     "source": "eurostat"
                 }
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"EUROSTAT API error getting dataset info: {e}")
         except Exception as e:
             logger.error(f"Error getting EUROSTAT dataset info: {e}")
@@ -125,7 +147,8 @@ class EurostatService:
         dataset_code: str,
         filters: Optional[Dict[str, List[str]]] = None,
         language: str = "en",
-        last_n_periods: Optional[int] = None
+        last_n_periods: Optional[int] = None,
+        since_period: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Get data for a specific dataset
@@ -135,6 +158,7 @@ class EurostatService:
             filters: Dictionary of dimension filters (e.g., {"geo": ["HU", "DE"]})
             language: Language code
             last_n_periods: Limit to last N time periods
+            since_period: Only periods from this one on (e.g., '2023' or '2023-Q4')
             
         Returns:
             Dataset data dictionary or None
@@ -155,8 +179,10 @@ class EurostatService:
             # Limit time periods if specified
             if last_n_periods:
                 params["lastTimePeriod"] = last_n_periods
+            if since_period:
+                params["sinceTimePeriod"] = since_period
             
-            response = requests.get(url, params=params, timeout=60)
+            response = get_http_engine().get(url, params=params, timeout=60)
             response.raise_for_status()
             
             data = response.json()
@@ -165,9 +191,9 @@ class EurostatService:
             
             return data
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"EUROSTAT API error getting dataset data: {e}")
-            if hasattr(e.response, "text"):
+            if isinstance(e, httpx.HTTPStatusError):
                 logger.error(f"Response: {e.response.text}")
         except Exception as e:
             logger.error(f"Error getting EUROSTAT dataset data: {e}")
@@ -196,16 +222,21 @@ class EurostatService:
             document = {
                 "dataset_code": dataset_code,
                 "source": "eurostat",
-                "data": dataset_data,
+                # JSON-stat is stored columnar (see jsonstat.py)
+                **encode_dataset_fields(dataset_data),
                 "metadata": metadata or {},
                 "collected_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow()
             }
+            unset = {
+                field: "" for field in ("data", "data_blob", "data_info")
+                if field not in document
+            }
             
             # Upsert document
             self.db.statistics.update_one(
                 {"dataset_code": dataset_code, "source": "eurostat"},
-                {"$set": document},
+                {"$set": document, **({"$unset": unset} if unset else {})},
                 upsert=True
             )
             
@@ -254,31 +285,58 @@ class EurostatService:
     
     def get_stored_dataset(
         self,
-        dataset_code: str
+        dataset_code: str,
+        include_data: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get stored dataset from MongoDB
         
         Args:
             dataset_code: Dataset code
+            include_data: Also decode the observations into data (JSON-stat)
             
         Returns:
             Stored dataset document or None
         """
         try:
-            document = self.db.statistics.find_one({
-                "dataset_code": dataset_code,
-                "source": "eurostat"
-            })
+            document = self.db.statistics.find_one(
+                {"dataset_code": dataset_code, "source": "eurostat"},
+                None if include_data else {"data": 0, "data_blob": 0}
+            )
+            if document and include_data:
+                dataset = decode_dataset_document(document)
+                document.pop("data_blob", None)
+                if dataset is not None:
+                    document["data"] = dataset.to_jsonstat()
             return document
         except Exception as e:
             logger.error(f"Error retrieving stored dataset: {e}")
             return None
     
+    def load_dataset(self, dataset_code: str) -> Optional[JsonStatDataset]:
+        """
+        Load the observations of a stored dataset for slicing
+        
+        Args:
+            dataset_code: Dataset code
+            
+        Returns:
+            Columnar dataset or None if not stored
+        """
+        try:
+            return decode_dataset_document(self.db.statistics.find_one(
+                {"dataset_code": dataset_code, "source": "eurostat"},
+                {"data_format": 1, "data_blob": 1, "data": 1}
+            ))
+        except Exception as e:
+            logger.error(f"Error loading stored dataset {dataset_code}: {e}")
+            return None
+    
     def search_for_statistics(
         self,
         keywords: List[str],
-        max_results: int = 10
+        max_results: int = 10,
+        timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for statistics relevant to fact-checking
@@ -286,6 +344,7 @@ class EurostatService:
         Args:
             keywords: Keywords to search for
             max_results: Maximum number of results
+            timeout: Time budget of all searches in seconds (default: 30 per search)
             
         Returns:
             List of relevant dataset metadata
@@ -300,8 +359,12 @@ class EurostatService:
         
         # Search for each query
         seen_codes = set()
+        deadline = time.monotonic() + timeout if timeout else None
         for query in queries[:3]:  # Limit to 3 queries
-            datasets = self.search_datasets(query)
+            remaining = deadline - time.monotonic() if deadline else 30.0
+            if remaining <= 0:
+                break
+            datasets = self.search_datasets(query, timeout=remaining)
             for dataset in datasets:
                 if dataset["code"] not in seen_codes and len(results) < max_results:
                     results.append(dataset)
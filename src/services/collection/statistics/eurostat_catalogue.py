@@ -0,0 +1,300 @@
+"""
+EUROSTAT Catalogue Mirror
+Local copy of the EUROSTAT table of contents with an in-memory dataset search
+"""
+import bisect
+import csv
+import io
+import logging
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+from src.config.settings import get_settings
+from src.models.database import get_sync_db
+from src.services.collection.feed_state import FeedStateStore
+from src.services.search.bm25_index import tokenize
+from src.utils.http_client import get_http_engine
+
+logger = logging.getLogger(__name__)
+
+TOC_URL = "https://ec.europa.eu/eurostat/api/dissemination/catalogue/toc/txt"
+# The table of contents is published in these languages only
+TOC_LANGUAGES = ("en", "de", "fr")
+# Folders only group the tree; datasets and tables have data
+DATA_TYPES = ("dataset", "table")
+
+
+def toc_url(language: str) -> str:
+    """Table of contents URL of a language"""
+    return f"{TOC_URL}?lang={language}"
+
+
+def parse_toc(content: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse the tab separated table of contents
+
+    Args:
+        content: TOC text (title, code, type, last update of data, last table
+            structure change, data start, data end)
+
+    Returns:
+        Dictionary of code -> entry for datasets and tables
+    """
+    entries = {}
+    reader = csv.reader(io.StringIO(content), delimiter="\t")
+    next(reader, None)  # Header
+    for row in reader:
+        if len(row) < 3:
+            continue
+        entry_type = row[2].strip().strip('"')
+        if entry_type not in DATA_TYPES:
+            continue
+        code = row[1].strip().strip('"')
+        entries[code] = {
+            # Titles are indented by their depth in the tree; the indent is dropped
+            "label": row[0].strip().strip('"'),
+            "type": entry_type,
+            "last_update": row[3].strip() if len(row) > 3 else "",
+            "last_structure_change": row[4].strip() if len(row) > 4 else "",
+            "data_start": row[5].strip() if len(row) > 5 else "",
+            "data_end": row[6].strip() if len(row) > 6 else "",
+        }
+    return entries
+
+
+class CatalogueIndex:
+    """
+    Immutable in-memory search structure over catalogue entries
+
+    Terms of labels and codes point to dataset codes. Query terms match
+    terms by prefix (a bisect in the sorted vocabulary), and all query terms
+    have to match.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = {entry["_id"]: entry for entry in entries}
+        postings: Dict[str, set] = {}
+        for code, entry in self.entries.items():
+            terms = set(tokenize(code.replace("_", " "))) | {code.lower()}
+            for label in (entry.get("labels") or {}).values():
+                terms.update(tokenize(label))
+            for term in terms:
+                postings.setdefault(term, set()).add(code)
+        self.vocabulary = sorted(postings)
+        self.postings = postings
+        # Catalogue order, used to return results in a stable order
+        self.order = {code: position for position, code in enumerate(self.entries)}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _codes_for_prefix(self, prefix: str) -> set:
+        codes = set()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            codes |= self.postings[term]
+        return codes
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Entries matching all terms of a query, in catalogue order"""
+        terms = tokenize(query.replace("_", " ")) or [query.strip().lower()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+
+        codes = None
+        # Rare (long) terms first keeps the intersection small
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches = self._codes_for_prefix(term)
+            codes = matches if codes is None else codes & matches
+            if not codes:
+                return []
+
+        ranked = sorted(codes, key=self.order.__getitem__)
+        return [self.entries[code] for code in ranked[:limit]]
+
+
+class EurostatCatalogue:
+    """
+    Mirror of the EUROSTAT table of contents (eurostat_catalogue collection)
+
+    refresh() polls the TOC with conditional GETs and writes only the
+    entries that were added, changed or removed. search() answers from an
+    in-memory index that is reloaded when the mirror changed.
+    """
+
+    def __init__(self, db=None):
+        self.settings = get_settings()
+        self.db = db if db is not None else get_sync_db()
+        self.collection = self.db.eurostat_catalogue
+        self.feed_states = FeedStateStore(self.db)
+
+    def refresh(self, languages: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Bring the mirror up to date
+
+        Args:
+            languages: TOC languages to mirror (default: EUROSTAT_CATALOGUE_LANGUAGES)
+
+        Returns:
+            Dictionary with counts of added, updated and removed entries per language
+        """
+        languages = [
+            language for language in (languages or self.settings.EUROSTAT_CATALOGUE_LANGUAGES)
+            if language in TOC_LANGUAGES
+        ]
+        result = {"languages": {}, "added": 0, "updated": 0, "removed": 0}
+
+        for language in languages:
+            url = toc_url(language)
+            state = self.feed_states.get(url)
+            response = get_http_engine().get(
+                url,
+                headers=FeedStateStore.request_headers(state),
+                timeout=120
+            )
+            validators = self.feed_states.check_response(url, response, state)
+            if validators is None:
+                result["languages"][language] = "not_modified"
+                continue
+
+            counts = self._apply(language, parse_toc(response.text), primary=language == languages[0])
+            self.feed_states.record_fetch(url, validators, [])
+            result["languages"][language] = counts
+            for key in ("added", "updated", "removed"):
+                result[key] += counts[key]
+
+        logger.info(
+            f"EUROSTAT catalogue refreshed: {result['added']} added, "
+            f"{result['updated']} updated, {result['removed']} removed"
+        )
+        return result
+
+    def _apply(
+        self,
+        language: str,
+        entries: Dict[str, Dict[str, Any]],
+        primary: bool
+    ) -> Dict[str, int]:
+        """
+        Write the difference between a parsed TOC and the mirror
+
+        The primary language decides which datasets exist; other languages
+        only add labels to them.
+        """
+        stored = {doc["_id"]: doc for doc in self.collection.find({})}
+
+        operations = []
+        added = updated = removed = 0
+        for code, entry in entries.items():
+            known = stored.get(code)
+            labels = dict((known or {}).get("labels") or {})
+
+            if not primary:
+                if known is not None and labels.get(language) != entry["label"]:
+                    operations.append(UpdateOne(
+                        {"_id": code},
+                        {"$set": {f"labels.{language}": entry["label"]}}
+                    ))
+                    updated += 1
+                continue
+
+            fields = {key: value for key, value in entry.items() if key != "label"}
+            if known is None:
+                added += 1
+            elif labels.get(language) == entry["label"] and all(
+                known.get(field) == value for field, value in fields.items()
+            ):
+                continue
+            else:
+                updated += 1
+
+            labels[language] = entry["label"]
+            operations.append(ReplaceOne(
+                {"_id": code},
+                {"_id": code, **fields, "labels": labels},
+                upsert=True
+            ))
+
+        if primary:
+            for code in stored.keys() - entries.keys():
+                operations.append(DeleteOne({"_id": code}))
+                removed += 1
+
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+        return {"added": added, "updated": updated, "removed": removed}
+
+    def search(
+        self,
+        query: str,
+        language: str = "en",
+        limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Search datasets in the mirror
+
+        Args:
+            query: Search terms (matched by prefix against labels and codes)
+            language: Preferred label language (English if not mirrored)
+            limit: Maximum number of results
+
+        Returns:
+            List of dataset metadata dictionaries, None if the mirror is empty
+        """
+        index = get_catalogue_index(self)
+        if not len(index):
+            return None
+        results = []
+        for entry in index.search(query, limit):
+            labels = entry.get("labels") or {}
+            results.append({
+                "code": entry["_id"],
+                "label": labels.get(language) or labels.get("en") or next(iter(labels.values()), ""),
+                "last_updated": entry.get("last_update", ""),
+                "source": "eurostat"
+            })
+        return results
+
+
+_index_lock = threading.Lock()
+_index: Optional[CatalogueIndex] = None
+_index_version: Any = None
+_index_checked_at = 0.0
+
+
+def _catalogue_version(catalogue: EurostatCatalogue) -> Tuple:
+    """Last change times of the mirrored TOCs"""
+    return tuple(
+        catalogue.feed_states.get(toc_url(language)).get("last_changed_at")
+        for language in catalogue.settings.EUROSTAT_CATALOGUE_LANGUAGES
+    )
+
+
+def get_catalogue_index(catalogue: EurostatCatalogue) -> CatalogueIndex:
+    """
+    Get the in-memory catalogue index of this process
+
+    The mirror version is checked at most every EUROSTAT_CATALOGUE_RELOAD_SECONDS;
+    the index is rebuilt from MongoDB when it changed.
+    """
+    global _index, _index_version, _index_checked_at
+    now = time.monotonic()
+    if _index is not None and now - _index_checked_at < catalogue.settings.EUROSTAT_CATALOGUE_RELOAD_SECONDS:
+        return _index
+
+    with _index_lock:
+        if _index is not None and now - _index_checked_at < catalogue.settings.EUROSTAT_CATALOGUE_RELOAD_SECONDS:
+            return _index
+        version = _catalogue_version(catalogue)
+        if _index is None or version != _index_version:
+            _index = CatalogueIndex(list(catalogue.collection.find({})))
+            _index_version = version
+            logger.info(f"Loaded EUROSTAT catalogue index with {len(_index)} datasets")
+        _index_checked_at = now
+    return _index
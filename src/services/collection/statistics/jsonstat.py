@@ -0,0 +1,392 @@
+"""
+Columnar JSON-stat Datasets
+Decodes EUROSTAT JSON-stat 2.0 payloads into NumPy arrays with a compact binary encoding
+"""
+import io
+import json
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable
+
+import numpy as np
+
+FORMAT = "jsonstat-columnar-v1"
+
+
+def _category_codes(category: Dict[str, Any]) -> List[str]:
+    """Category codes of a dimension in index order"""
+    index = category.get("index")
+    if isinstance(index, list):
+        return [str(code) for code in index]
+    if isinstance(index, dict):
+        return [str(code) for code, _ in sorted(index.items(), key=lambda item: item[1])]
+    # A dimension with a single category may only have labels
+    return [str(code) for code in (category.get("label") or {})]
+
+
+def _sparse_items(field: Union[Dict[str, Any], List[Any], None]) -> Iterable:
+    """(flat index, value) pairs of a JSON-stat value or status field"""
+    if isinstance(field, dict):
+        return ((int(position), value) for position, value in field.items())
+    if isinstance(field, list):
+        return enumerate(field)
+    return ()
+
+
+class JsonStatDataset:
+    """
+    JSON-stat dataset held as columns
+
+    Observations are stored sparsely: the flat (row-major) cell position and
+    the value of every non-missing cell, plus an optional status flag code.
+    Per-dimension category indices are derived from the positions with
+    np.unravel_index, so slicing by any dimension is a vectorized mask.
+    """
+
+    def __init__(
+        self,
+        dimension_ids: List[str],
+        sizes: List[int],
+        dimensions: Dict[str, Dict[str, Any]],
+        positions: np.ndarray,
+        values: np.ndarray,
+        status: Optional[np.ndarray] = None,
+        status_codes: Optional[List[str]] = None,
+        info: Optional[Dict[str, Any]] = None
+    ):
+        self.dimension_ids = list(dimension_ids)
+        self.sizes = [int(size) for size in sizes]
+        self.dimensions = dimensions
+        self.positions = positions
+        self.values = values
+        self.status = status
+        self.status_codes = list(status_codes or [])
+        self.info = info or {}
+        self._indices: Optional[tuple] = None
+        self._lookup = {
+            dimension: {code: position for position, code in enumerate(self.dimensions[dimension]["categories"])}
+            for dimension in self.dimension_ids
+        }
+
+    @classmethod
+    def from_jsonstat(cls, payload: Dict[str, Any]) -> "JsonStatDataset":
+        """
+        Decode a JSON-stat 2.0 dataset
+
+        Args:
+            payload: Response of the EUROSTAT statistics API
+
+        Returns:
+            Columnar dataset
+        """
+        dimension_ids = list(payload.get("id") or [])
+        sizes = list(payload.get("size") or [])
+        dimensions = {}
+        for dimension in dimension_ids:
+            definition = (payload.get("dimension") or {}).get(dimension) or {}
+            category = definition.get("category") or {}
+            codes = _category_codes(category)
+            category_labels = category.get("label") or {}
+            dimensions[dimension] = {
+                "label": definition.get("label", dimension),
+                "categories": codes,
+                "labels": [category_labels.get(code, code) for code in codes],
+            }
+
+        observations = [
+            (position, value) for position, value in _sparse_items(payload.get("value"))
+            if value is not None
+        ]
+        observations.sort()
+        positions = np.fromiter((position for position, _ in observations), dtype=np.int64, count=len(observations))
+        values = np.fromiter((value for _, value in observations), dtype=np.float64, count=len(observations))
+
+        status = None
+        status_codes: List[str] = []
+        flags = dict(_sparse_items(payload.get("status")))
+        if flags:
+            status_codes = sorted({str(flag) for flag in flags.values() if flag})
+            code_index = {code: index for index, code in enumerate(status_codes)}
+            status = np.fromiter(
+                (code_index.get(str(flags.get(position) or ""), -1) for position, _ in observations),
+                dtype=np.int8,
+                count=len(observations)
+            )
+
+        info = {
+            key: payload[key]
+            for key in ("label", "source", "updated", "extension")
+            if key in payload
+        }
+        return cls(dimension_ids, sizes, dimensions, positions, values, status, status_codes, info)
+
+    def to_bytes(self) -> bytes:
+        """Encode as a compressed .npz archive (metadata as embedded JSON)"""
+        cells = int(np.prod(self.sizes, dtype=np.int64)) if self.sizes else 0
+        arrays = {
+            # The narrowest type that holds every cell position
+            "positions": self.positions.astype(np.uint32 if cells <= np.iinfo(np.uint32).max else np.int64),
+            "values": self.values,
+        }
+        if self.status is not None:
+            arrays["status"] = self.status
+        meta = {
+            "format": FORMAT,
+            "id": self.dimension_ids,
+            "size": self.sizes,
+            "dimension": self.dimensions,
+            "status_codes": self.status_codes,
+            "info": self.info,
+        }
+        arrays["meta"] = np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "JsonStatDataset":
+        """Decode the output of to_bytes()"""
+        with np.load(io.BytesIO(blob), allow_pickle=False) as archive:
+            meta = json.loads(archive["meta"].tobytes().decode("utf-8"))
+            if meta.get("format") != FORMAT:
+                raise ValueError(f"Unsupported dataset encoding: {meta.get('format')}")
+            return cls(
+                meta["id"],
+                meta["size"],
+                meta["dimension"],
+                archive["positions"].astype(np.int64),
+                archive["values"],
+                archive["status"] if "status" in archive.files else None,
+                meta.get("status_codes"),
+                meta.get("info")
+            )
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the observation arrays"""
+        return int(self.positions.nbytes + self.values.nbytes + (self.status.nbytes if self.status is not None else 0))
+
+    def indices(self, dimension: str) -> np.ndarray:
+        """Category position of every observation along a dimension"""
+        if self._indices is None:
+            self._indices = np.unravel_index(self.positions, self.sizes) if self.sizes else ()
+        return self._indices[self.dimension_ids.index(dimension)]
+
+    def categories(self, dimension: str) -> List[str]:
+        """Category codes of a dimension"""
+        return self.dimensions[dimension]["categories"]
+
+    def select(self, **filters: Union[str, Iterable[str]]) -> "JsonStatDataset":
+        """
+        Keep the observations of some categories
+
+        Args:
+            **filters: Dimension -> category code or codes (e.g. geo="HU",
+                time=["2022", "2023"]); unknown codes match nothing
+
+        Returns:
+            Dataset with the same dimensions and the matching observations
+        """
+        mask = np.ones(self.values.size, dtype=bool)
+        for dimension, codes in filters.items():
+            if dimension not in self._lookup:
+                raise KeyError(f"Unknown dimension: {dimension}")
+            if isinstance(codes, str):
+                codes = [codes]
+            wanted = [self._lookup[dimension][code] for code in codes if code in self._lookup[dimension]]
+            mask &= np.isin(self.indices(dimension), wanted)
+        return JsonStatDataset(
+            self.dimension_ids,
+            self.sizes,
+            self.dimensions,
+            self.positions[mask],
+            self.values[mask],
+            self.status[mask] if self.status is not None else None,
+            self.status_codes,
+            self.info
+        )
+
+    def present_categories(self, dimension: str) -> List[str]:
+        """Category codes of a dimension that have at least one observation"""
+        codes = self.categories(dimension)
+        return [codes[index] for index in np.unique(self.indices(dimension))]
+
+    def _status_array(self) -> np.ndarray:
+        if self.status is None:
+            return np.full(self.values.size, -1, dtype=np.int8)
+        return self.status
+
+    def merge(self, newer: "JsonStatDataset") -> Tuple["JsonStatDataset", List[Dict[str, Any]]]:
+        """
+        Merge a newer download of the same dataset into this one
+
+        Categories are united per dimension (time periods stay sorted) and
+        the newer value wins for cells present in both.
+
+        Args:
+            newer: Dataset with the same dimensions (e.g. only recent periods)
+
+        Returns:
+            Tuple of (merged dataset, revisions) where revisions lists the
+            cells whose value changed as {"cell": {dimension: code}, "old", "new"}
+        """
+        if newer.dimension_ids != self.dimension_ids:
+            raise ValueError(
+                f"Cannot merge datasets with dimensions {self.dimension_ids} and {newer.dimension_ids}"
+            )
+
+        dimensions = {}
+        for dimension in self.dimension_ids:
+            own, other = self.dimensions[dimension], newer.dimensions[dimension]
+            labels = dict(zip(own["categories"], own["labels"]))
+            labels.update(zip(other["categories"], other["labels"]))
+            codes = own["categories"] + [code for code in other["categories"] if code not in self._lookup[dimension]]
+            if dimension == "time":
+                codes = sorted(codes)
+            dimensions[dimension] = {
+                "label": other.get("label") or own.get("label"),
+                "categories": codes,
+                "labels": [labels[code] for code in codes],
+            }
+        sizes = [len(dimensions[dimension]["categories"]) for dimension in self.dimension_ids]
+
+        def remap(dataset: "JsonStatDataset") -> np.ndarray:
+            if not dataset.dimension_ids:
+                return dataset.positions
+            indices = []
+            for dimension in dataset.dimension_ids:
+                position_of = {code: position for position, code in enumerate(dimensions[dimension]["categories"])}
+                mapping = np.array([position_of[code] for code in dataset.categories(dimension)], dtype=np.int64)
+                indices.append(mapping[dataset.indices(dimension)])
+            return np.ravel_multi_index(tuple(indices), sizes).astype(np.int64)
+
+        own_positions, new_positions = remap(self), remap(newer)
+
+        # Cells in both downloads whose value was revised
+        common, own_rows, new_rows = np.intersect1d(own_positions, new_positions, return_indices=True)
+        changed = ~np.isclose(self.values[own_rows], newer.values[new_rows], rtol=1e-9, atol=0.0)
+        revisions = []
+        for own_row, new_row in zip(own_rows[changed], new_rows[changed]):
+            revisions.append({
+                "cell": {
+                    dimension: self.categories(dimension)[self.indices(dimension)[own_row]]
+                    for dimension in self.dimension_ids
+                },
+                "old": float(self.values[own_row]),
+                "new": float(newer.values[new_row]),
+            })
+
+        status_codes = sorted(set(self.status_codes) | set(newer.status_codes))
+        code_index = {code: index for index, code in enumerate(status_codes)}
+
+        def recode(dataset: "JsonStatDataset") -> np.ndarray:
+            mapping = np.array([code_index[code] for code in dataset.status_codes] + [-1], dtype=np.int8)
+            # -1 (no flag) maps to the last mapping entry
+            return mapping[dataset._status_array()]
+
+        positions = np.concatenate([own_positions, new_positions])
+        values = np.concatenate([self.values, newer.values])
+        status = np.concatenate([recode(self), recode(newer)])
+        # Newer rows come last; keep the last row of every cell
+        order = np.argsort(positions, kind="stable")
+        positions, values, status = positions[order], values[order], status[order]
+        keep = np.append(positions[1:] != positions[:-1], True) if positions.size else np.zeros(0, dtype=bool)
+
+        merged = JsonStatDataset(
+            self.dimension_ids,
+            sizes,
+            dimensions,
+            positions[keep],
+            values[keep],
+            status[keep] if status_codes else None,
+            status_codes,
+            {**self.info, **newer.info}
+        )
+        return merged, revisions
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Observations as {dimension: code, ..., "value", "status"} dictionaries"""
+        columns = {
+            dimension: np.asarray(self.categories(dimension), dtype=object)[self.indices(dimension)]
+            for dimension in self.dimension_ids
+        }
+        records = []
+        for row in range(self.values.size):
+            record = {dimension: columns[dimension][row] for dimension in self.dimension_ids}
+            record["value"] = float(self.values[row])
+            if self.status is not None and self.status[row] >= 0:
+                record["status"] = self.status_codes[self.status[row]]
+            records.append(record)
+        return records
+
+    def to_jsonstat(self) -> Dict[str, Any]:
+        """Encode back to a (sparse) JSON-stat 2.0 dataset"""
+        payload = {
+            "version": "2.0",
+            "class": "dataset",
+            **self.info,
+            "id": self.dimension_ids,
+            "size": self.sizes,
+            "dimension": {
+                dimension: {
+                    "label": definition["label"],
+                    "category": {
+                        "index": {code: index for index, code in enumerate(definition["categories"])},
+                        "label": dict(zip(definition["categories"], definition["labels"])),
+                    },
+                }
+                for dimension, definition in self.dimensions.items()
+            },
+            "value": {str(int(position)): float(value) for position, value in zip(self.positions, self.values)},
+        }
+        if self.status is not None:
+            payload["status"] = {
+                str(int(position)): self.status_codes[flag]
+                for position, flag in zip(self.positions, self.status) if flag >= 0
+            }
+        return payload
+
+
+def encode_dataset_fields(dataset_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields of a statistics document holding a dataset
+
+    JSON-stat payloads are stored columnar (data_blob); anything else is
+    stored as is under data.
+
+    Args:
+        dataset_data: Dataset returned by a statistics service
+
+    Returns:
+        Fields to $set on the statistics document
+    """
+    if not (isinstance(dataset_data, dict) and "id" in dataset_data and "size" in dataset_data):
+        return {"data": dataset_data, "data_format": "raw"}
+
+    return columnar_dataset_fields(JsonStatDataset.from_jsonstat(dataset_data))
+
+
+def columnar_dataset_fields(dataset: JsonStatDataset) -> Dict[str, Any]:
+    """Fields of a statistics document holding a columnar dataset"""
+    return {
+        "data_format": FORMAT,
+        "data_blob": dataset.to_bytes(),
+        "data_info": {
+            **{key: value for key, value in dataset.info.items() if key != "extension"},
+            "observations": len(dataset),
+            "dimensions": dict(zip(dataset.dimension_ids, dataset.sizes)),
+        },
+    }
+
+
+def decode_dataset_document(document: Optional[Dict[str, Any]]) -> Optional[JsonStatDataset]:
+    """Columnar dataset of a statistics document (also for documents stored before data_blob)"""
+    if not document:
+        return None
+    if document.get("data_format") == FORMAT and document.get("data_blob") is not None:
+        return JsonStatDataset.from_bytes(bytes(document["data_blob"]))
+    data = document.get("data")
+    if isinstance(data, dict) and "id" in data and "size" in data:
+        return JsonStatDataset.from_jsonstat(data)
+    return None
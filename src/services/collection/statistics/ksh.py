@@ -8,14 +8,21 @@ Note: KSH does not provide a public REST API, so this service uses:
 - EUROSTAT API with Hungarian data filters (as alternative)
 """
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import requests
+import httpx
 from bs4 import BeautifulSoup
 import re
 
-from src.models.database import connect_mongodb_sync
+from src.models.database import get_sync_db
+from src.utils.http_client import get_http_engine
 from src.services.collection.statistics.eurostat import EurostatService
+from src.services.collection.statistics.jsonstat import (
+    JsonStatDataset,
+    decode_dataset_document,
+    encode_dataset_fields,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +33,16 @@ class KSHService:
     BASE_URL = "https://www.ksh.hu"
     STADAT_URL = "https://www.ksh.hu/stadat_files/hun/hun/xls/hun/stadat_nyito.html"
     
-    def __init__(self):
-        self.db = connect_mongodb_sync()
+    def __init__(self, db=None, eurostat_service: Optional[EurostatService] = None):
+        self.db = db if db is not None else get_sync_db()
         # Use EUROSTAT as alternative source for Hungarian statistics
-        self.eurostat_service = EurostatService()
+        self.eurostat_service = eurostat_service or EurostatService(db=self.db)
     
     def search_datasets(
         self,
         query: str,
-        language: str = "hu"
+        language: str = "hu",
+        timeout: float = 30.0
     ) -> List[Dict[str, Any]]:
         """
         Search for datasets in KSH STADAT database
@@ -46,15 +54,17 @@ class KSHService:
         Args:
             query: Search query in Hungarian
             language: Language code (default: "hu")
+            timeout: Time budget of both searches in seconds
             
         Returns:
             List of dataset metadata dictionaries
         """
         results = []
+        deadline = time.monotonic() + timeout
         
         # Search EUROSTAT for Hungarian statistics
         try:
-            eurostat_results = self.eurostat_service.search_datasets(query)
+            eurostat_results = self.eurostat_service.search_datasets(query, timeout=timeout)
             for result in eurostat_results:
                 # Filter for Hungarian data or datasets with HU in code/description
                 if "hu" in result.get("code", "").lower() or "hungary" in result.get("label", "").lower():
@@ -69,20 +79,22 @@ class KSHService:
         
         # Try to search KSH STADAT portal (web scraping)
         try:
-            stadat_results = self._search_stadat_portal(query)
-            results.extend(stadat_results)
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                results.extend(self._search_stadat_portal(query, timeout=remaining))
         except Exception as e:
             logger.warning(f"Error searching KSH STADAT portal: {e}")
         
         logger.info(f"KSH: Found {len(results)} datasets for query: {query}")
         return results
     
-    def _search_stadat_portal(self, query: str) -> List[Dict[str, Any]]:
+    def _search_stadat_portal(self, query: str, timeout: float = 30.0) -> List[Dict[str, Any]]:
         """
         Search KSH STADAT portal (web scraping)
         
         Args:
             query: Search query
+            timeout: HTTP timeout in seconds
             
         Returns:
             List of dataset metadata dictionaries
@@ -98,7 +110,7 @@ class KSHService:
                 "query": query
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_engine().get(url, params=params, timeout=timeout)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -121,7 +133,7 @@ class KSHService:
                         "last_updated": ""
                     })
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error accessing KSH STADAT portal: {e}")
         except Exception as e:
             logger.error(f"Error parsing KSH STADAT portal: {e}")
@@ -180,7 +192,8 @@ class KSHService:
         dataset_code: str,
         filters: Optional[Dict[str, List[str]]] = None,
         source: str = "eurostat_hu",
-        last_n_periods: Optional[int] = None
+        last_n_periods: Optional[int] = None,
+        since_period: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Get data for a specific dataset
@@ -190,6 +203,7 @@ class KSHService:
             filters: Dictionary of dimension filters (add "geo": ["HU"] for Hungary)
             source: Source type
             last_n_periods: Limit to last N time periods
+            since_period: Only periods from this one on (EUROSTAT data only)
             
         Returns:
             Dataset data dictionary or None
@@ -209,7 +223,8 @@ class KSHService:
                     dataset_code=dataset_code,
                     filters=filters,
                     language="hu",
-                    last_n_periods=last_n_periods
+                    last_n_periods=last_n_periods,
+                    since_period=since_period
                 )
                 
                 if data:
@@ -273,16 +288,21 @@ class KSHService:
             document = {
                 "dataset_code": dataset_code,
                 "source": "ksh",
-                "data": dataset_data,
+                # JSON-stat is stored columnar (see jsonstat.py)
+                **encode_dataset_fields(dataset_data),
                 "metadata": metadata or {},
                 "collected_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow()
             }
+            unset = {
+                field: "" for field in ("data", "data_blob", "data_info")
+                if field not in document
+            }
             
             # Upsert document
             self.db.statistics.update_one(
                 {"dataset_code": dataset_code, "source": "ksh"},
-                {"$set": document},
+                {"$set": document, **({"$unset": unset} if unset else {})},
                 upsert=True
             )
             
@@ -334,43 +354,86 @@ class KSHService:
     
     def get_stored_dataset(
         self,
-        dataset_code: str
+        dataset_code: str,
+        include_data: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get stored dataset from MongoDB
         
         Args:
             dataset_code: Dataset code
+            include_data: Also decode the observations into data (JSON-stat)
             
         Returns:
             Stored dataset document or None
         """
         try:
-            # Try KSH source first
-            document = self.db.statistics.find_one({
-                "dataset_code": dataset_code,
-                "source": "ksh"
-            })
-            
-            if document:
-                return document
-            
-            # Try EUROSTAT source with HU filter
-            document = self.db.statistics.find_one({
-                "dataset_code": dataset_code,
-                "source": "eurostat",
-                "data.source": "eurostat_hu"
-            })
-            
+            document = self._find_stored_dataset(
+                dataset_code,
+                None if include_data else {"data": 0, "data_blob": 0}
+            )
+            if document and include_data:
+                dataset = decode_dataset_document(document)
+                document.pop("data_blob", None)
+                if dataset is not None:
+                    document["data"] = dataset.to_jsonstat()
             return document
         except Exception as e:
             logger.error(f"Error retrieving stored KSH dataset: {e}")
             return None
     
+    def load_dataset(self, dataset_code: str) -> Optional[JsonStatDataset]:
+        """
+        Load the observations of a stored dataset for slicing
+        
+        Args:
+            dataset_code: Dataset code
+            
+        Returns:
+            Columnar dataset or None if not stored
+        """
+        try:
+            return decode_dataset_document(self._find_stored_dataset(
+                dataset_code,
+                {"data_format": 1, "data_blob": 1, "data": 1}
+            ))
+        except Exception as e:
+            logger.error(f"Error loading stored KSH dataset {dataset_code}: {e}")
+            return None
+    
+    def _find_stored_dataset(
+        self,
+        dataset_code: str,
+        projection: Optional[Dict[str, int]]
+    ) -> Optional[Dict[str, Any]]:
+        """Stored KSH document of a dataset, or the EUROSTAT one of its Hungarian data"""
+        # Try KSH source first
+        document = self.db.statistics.find_one(
+            {"dataset_code": dataset_code, "source": "ksh"},
+            projection
+        )
+        
+        if document:
+            return document
+        
+        # Try EUROSTAT source with HU filter (columnar or legacy raw document)
+        return self.db.statistics.find_one(
+            {
+                "dataset_code": dataset_code,
+                "source": "eurostat",
+                "$or": [
+                    {"data_info.source": "eurostat_hu"},
+                    {"data.source": "eurostat_hu"}
+                ]
+            },
+            projection
+        )
+    
     def search_for_statistics(
         self,
         keywords: List[str],
-        max_results: int = 10
+        max_results: int = 10,
+        timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for Hungarian statistics relevant to fact-checking
@@ -378,6 +441,7 @@ class KSHService:
         Args:
             keywords: Keywords to search for
             max_results: Maximum number of results
+            timeout: Time budget of all searches in seconds (default: 30 per search)
             
         Returns:
             List of relevant dataset metadata
@@ -393,8 +457,12 @@ class KSHService:
         
         # Search for each query
         seen_codes = set()
+        deadline = time.monotonic() + timeout if timeout else None
         for query in queries[:3]:  # Limit to 3 queries
-            datasets = self.search_datasets(query)
+            remaining = deadline - time.monotonic() if deadline else 30.0
+            if remaining <= 0:
+                break
+            datasets = self.search_datasets(query, timeout=remaining)
             for dataset in datasets:
                 if dataset["code"] not in seen_codes and len(results) < max_results:
                     results.append(dataset)
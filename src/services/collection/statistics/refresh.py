@@ -0,0 +1,222 @@
+"""
+Incremental Statistics Refresh
+Refreshes tracked EUROSTAT and KSH datasets only when they changed, downloading
+just the latest periods and merging them into the stored series
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.config.settings import get_settings
+from src.models.database import get_sync_db
+from src.services.collection.statistics.eurostat import EurostatService
+from src.services.collection.statistics.jsonstat import (
+    JsonStatDataset,
+    columnar_dataset_fields,
+    decode_dataset_document,
+)
+from src.services.collection.statistics.ksh import KSHService
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("eurostat", "ksh")
+
+
+class DatasetRefresher:
+    """
+    Incremental refresh of stored statistics datasets
+
+    A dataset is downloaded only when its last data update (from the
+    catalogue mirror, or the dataset metadata) differs from the one recorded
+    at the previous refresh. Then only the periods from the latest stored
+    one on are fetched (the latest period is included since provisional
+    values are often revised), merged into the stored series, and revised
+    values are recorded in statistics_revisions.
+    """
+
+    def __init__(self, db=None):
+        self.settings = get_settings()
+        self.db = db if db is not None else get_sync_db()
+        self.eurostat_service = EurostatService(db=self.db)
+        self.ksh_service = KSHService(db=self.db, eurostat_service=self.eurostat_service)
+
+    def _remote_last_update(self, dataset_code: str) -> Optional[str]:
+        """Last data update of a dataset according to EUROSTAT"""
+        entry = self.db.eurostat_catalogue.find_one({"_id": dataset_code}, {"last_update": 1})
+        if entry and entry.get("last_update"):
+            return entry["last_update"]
+        info = self.eurostat_service.get_dataset_info(dataset_code)
+        return (info or {}).get("updated") or None
+
+    def _download(
+        self,
+        dataset_code: str,
+        source: str,
+        last_n_periods: Optional[int] = None,
+        since_period: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        if source == "ksh":
+            return self.ksh_service.get_dataset_data(
+                dataset_code=dataset_code,
+                source="eurostat_hu",
+                last_n_periods=last_n_periods,
+                since_period=since_period
+            )
+        return self.eurostat_service.get_dataset_data(
+            dataset_code=dataset_code,
+            last_n_periods=last_n_periods,
+            since_period=since_period
+        )
+
+    def refresh_dataset(
+        self,
+        dataset_code: str,
+        source: str = "eurostat",
+        last_n_periods: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Refresh one stored dataset
+
+        Args:
+            dataset_code: Dataset code
+            source: Stored source ("eurostat" or "ksh")
+            last_n_periods: Periods to fetch when the dataset is not stored yet
+
+        Returns:
+            Dictionary with status (unchanged, updated, created or failed),
+            new_observations and revisions
+        """
+        result = {"dataset_code": dataset_code, "source": source, "success": True}
+        key = {"dataset_code": dataset_code, "source": source}
+        now = datetime.utcnow()
+
+        document = self.db.statistics.find_one(key, {"source_last_update": 1, "data_format": 1})
+        remote_update = self._remote_last_update(dataset_code)
+        if document and remote_update and document.get("source_last_update") == remote_update:
+            self.db.statistics.update_one(key, {"$set": {"checked_at": now}})
+            return {**result, "status": "unchanged"}
+
+        stored = None
+        if document:
+            stored = decode_dataset_document(self.db.statistics.find_one(
+                key, {"data_format": 1, "data_blob": 1, "data": 1}
+            ))
+
+        if stored is None or "time" not in stored.dimension_ids or not len(stored):
+            # Not stored yet (or not a time series): full download
+            collect = self.ksh_service if source == "ksh" else self.eurostat_service
+            if not collect.collect_dataset(dataset_code, last_n_periods=last_n_periods, store=True):
+                return {**result, "success": False, "status": "failed", "error": "Failed to retrieve data"}
+            self.db.statistics.update_one(
+                key, {"$set": {"source_last_update": remote_update, "checked_at": now}}
+            )
+            return {**result, "status": "created" if document is None else "updated"}
+
+        latest_period = stored.present_categories("time")[-1]
+        recent_data = self._download(dataset_code, source, since_period=latest_period)
+        if not recent_data:
+            return {**result, "success": False, "status": "failed", "error": "Failed to retrieve data"}
+        recent = JsonStatDataset.from_jsonstat(recent_data)
+
+        merged, revisions = stored.merge(recent)
+        new_observations = len(merged) - len(stored)
+        update = {"source_last_update": remote_update, "checked_at": now}
+        if new_observations or revisions:
+            update.update(columnar_dataset_fields(merged))
+            update["updated_at"] = now
+        self.db.statistics.update_one(key, {"$set": update})
+
+        if revisions:
+            self._record_revisions(dataset_code, source, revisions, now)
+
+        logger.info(
+            f"Refreshed {source} dataset {dataset_code}: "
+            f"{new_observations} new observations, {len(revisions)} revised"
+        )
+        return {
+            **result,
+            "status": "updated" if new_observations or revisions else "unchanged",
+            "latest_period": merged.present_categories("time")[-1] if len(merged) else latest_period,
+            "new_observations": new_observations,
+            "revisions": len(revisions)
+        }
+
+    def _record_revisions(
+        self,
+        dataset_code: str,
+        source: str,
+        revisions: List[Dict[str, Any]],
+        revised_at: datetime
+    ) -> None:
+        """Save revised values as one compact history entry per refresh"""
+        max_revisions = self.settings.STATISTICS_MAX_REVISIONS
+        dimension_ids = list(revisions[0]["cell"])
+        self.db.statistics_revisions.insert_one({
+            "dataset_code": dataset_code,
+            "source": source,
+            "revised_at": revised_at,
+            "count": len(revisions),
+            # Cells as [codes in dimension order, old value, new value]
+            "dimensions": dimension_ids,
+            "cells": [
+                [[revision["cell"][dimension] for dimension in dimension_ids], revision["old"], revision["new"]]
+                for revision in revisions[:max_revisions]
+            ],
+            "truncated": len(revisions) > max_revisions
+        })
+
+    def tracked_datasets(self, sources: Tuple[str, ...] = SOURCES) -> List[Tuple[str, str]]:
+        """(dataset_code, source) of all stored datasets"""
+        return [
+            (doc["dataset_code"], doc["source"])
+            for doc in self.db.statistics.find(
+                {"source": {"$in": list(sources)}},
+                {"dataset_code": 1, "source": 1}
+            )
+        ]
+
+    def refresh_many(
+        self,
+        datasets: List[Tuple[str, str]],
+        last_n_periods: int = 10,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Refresh datasets concurrently
+
+        Args:
+            datasets: (dataset_code, source) pairs
+            last_n_periods: Periods to fetch for datasets not stored yet
+            max_workers: Datasets refreshed at once (default: STATISTICS_REFRESH_CONCURRENCY)
+
+        Returns:
+            Dictionary with totals per status and the per-dataset results
+        """
+        def refresh(dataset: Tuple[str, str]) -> Dict[str, Any]:
+            dataset_code, source = dataset
+            try:
+                return self.refresh_dataset(dataset_code, source, last_n_periods)
+            except Exception as e:
+                logger.error(f"Error refreshing {source} dataset {dataset_code}: {e}")
+                return {
+                    "dataset_code": dataset_code,
+                    "source": source,
+                    "success": False,
+                    "status": "failed",
+                    "error": str(e)
+                }
+
+        workers = max(1, min(max_workers or self.settings.STATISTICS_REFRESH_CONCURRENCY, len(datasets) or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="statistics-refresh") as executor:
+            dataset_results = list(executor.map(refresh, datasets))
+
+        results = {
+            "total_datasets": len(datasets),
+            "successful": sum(1 for result in dataset_results if result["success"]),
+            "failed": sum(1 for result in dataset_results if not result["success"]),
+            "dataset_results": dataset_results
+        }
+        for status in ("unchanged", "updated", "created"):
+            results[status] = sum(1 for result in dataset_results if result.get("status") == status)
+        return results
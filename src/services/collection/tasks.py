@@ -2,21 +2,31 @@
 Celery Tasks for Data Collection
 """
 import logging
-from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
-from celery import shared_task
+from celery import shared_task, chord, current_app
 from celery.schedules import crontab
 from bson import ObjectId
 
-from src.models.database import connect_mongodb_sync
+from src.models.counters import reconcile_counters
+from src.models.database import get_sync_db
 from src.models.mongodb_models import Source
 from src.services.collection.collection_service import CollectionService
-from src.services.collection.statistics import EurostatService, KSHService
+from src.services.collection.scheduler import CollectionScheduler
+from src.services.collection.statistics import DatasetRefresher, EurostatCatalogue, EurostatService, KSHService
 from src.services.collection.news import MTIService, MagyarKozlonyService, RSSReaderService
 
 logger = logging.getLogger(__name__)
 
+# Queues per source type (see task_routes in src/celery_app.py)
+SELENIUM_QUEUE = "selenium"
+HTTP_QUEUE = "http"
+STATISTICS_QUEUE = "statistics"
+SOURCE_TYPE_QUEUES = {
+    "facebook": SELENIUM_QUEUE,
+    "statistics": STATISTICS_QUEUE,
+}
+
 
 @shared_task(name="collection.collect_facebook_posts")
 def collect_facebook_posts_task(source_id: str) -> Dict[str, Any]:
@@ -32,7 +42,7 @@ def collect_facebook_posts_task(source_id: str) -> Dict[str, Any]:
     logger.info(f"Starting Facebook collection task for source {source_id}")
     
     try:
-        db = connect_mongodb_sync()
+        db = get_sync_db()
         
         # Get source
         source_doc = db.sources.find_one({"_id": ObjectId(source_id)})
@@ -69,11 +79,8 @@ def collect_facebook_posts_task(source_id: str) -> Dict[str, Any]:
         collection_service = CollectionService()
         result = collection_service.collect_facebook_posts(source)
         
-        # Update last collection timestamp
-        db.sources.update_one(
-            {"_id": ObjectId(source_id)},
-            {"$set": {"last_collected_at": datetime.utcnow()}}
-        )
+        # Update last collection timestamp and the polling interval
+        CollectionScheduler(db).record_collection(source_doc, result.get('posts_saved', 0))
         
         result['success'] = result['posts_saved'] > 0 or len(result.get('errors', [])) == 0
         return result
@@ -88,66 +95,242 @@ def collect_facebook_posts_task(source_id: str) -> Dict[str, Any]:
         }
 
 
+def get_queue_for_source_type(source_type: str) -> str:
+    """
+    Get the Celery queue a source type is collected on
+    
+    Browser-based collectors run on their own queue so HTTP collectors
+    can be scaled without also scaling Chrome instances.
+    
+    Args:
+        source_type: Source type
+        
+    Returns:
+        Queue name
+    """
+    return SOURCE_TYPE_QUEUES.get(source_type, HTTP_QUEUE)
+
+
+def get_task_for_source_type(source_type: str) -> str:
+    """
+    Get the name of the collection task for a source type
+    
+    Args:
+        source_type: Source type
+        
+    Returns:
+        Celery task name
+    """
+    if source_type == "facebook":
+        return "collection.collect_facebook_posts"
+    return "collection.collect_source"
+
+
+@shared_task(name="collection.collect_source")
+def collect_source_task(source_id: str) -> Dict[str, Any]:
+    """
+    Celery task to collect from a single source of any type
+    
+    Args:
+        source_id: Source ID to collect from
+        
+    Returns:
+        Collection result dictionary
+    """
+    logger.info(f"Starting collection task for source {source_id}")
+    
+    try:
+        db = get_sync_db()
+        
+        source_doc = db.sources.find_one({"_id": ObjectId(source_id)})
+        if not source_doc:
+            error_msg = f"Source {source_id} not found"
+            logger.error(error_msg)
+            return {
+                'source_id': source_id,
+                'success': False,
+                'error': error_msg
+            }
+        
+        source = Source.from_dict(source_doc)
+        if not source.is_active:
+            logger.info(f"Source {source_id} is not active, skipping")
+            return {
+                'source_id': source_id,
+                'success': False,
+                'error': 'Source is not active'
+            }
+        
+        # Collect based on source type
+        collection_service = CollectionService()
+        result = collection_service.collect_from_source(source)
+        
+        # Update last collection timestamp and the polling interval
+        CollectionScheduler(db).record_collection(source_doc, result.get('posts_saved', 0))
+        
+        result['success'] = result.get('posts_saved', 0) > 0 or len(result.get('errors', [])) == 0
+        return result
+        
+    except Exception as e:
+        error_msg = f"Error collecting from source {source_id}: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            'source_id': source_id,
+            'success': False,
+            'error': error_msg
+        }
+
+
+@shared_task(name="collection.aggregate_collection_results")
+def aggregate_collection_results_task(source_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Chord callback that aggregates per-source collection results
+    
+    Args:
+        source_results: Results of collect_source_task, one per source
+        
+    Returns:
+        Dictionary with collection results for all sources
+    """
+    results = {
+        'total_sources': len(source_results),
+        'successful': 0,
+        'failed': 0,
+        'not_modified': 0,
+        'source_results': []
+    }
+    
+    for result in source_results:
+        if not isinstance(result, dict):
+            result = {'success': False, 'error': str(result)}
+        
+        if result.get('success'):
+            results['successful'] += 1
+        else:
+            results['failed'] += 1
+        if result.get('not_modified'):
+            results['not_modified'] += 1
+        
+        results['source_results'].append(result)
+    
+    logger.info(
+        f"Collection task completed: "
+        f"{results['successful']}/{results['total_sources']} successful"
+    )
+    
+    return results
+
+
+@shared_task(name="collection.dispatch_due_sources")
+def dispatch_due_sources_task() -> Dict[str, Any]:
+    """
+    Celery Beat task that starts the collection of every source that is due
+    
+    Each source is dispatched to the task and queue of its source type.
+    When a source is due is decided by CollectionScheduler.
+    
+    Returns:
+        Dictionary with the number of dispatched sources
+    """
+    try:
+        db = get_sync_db()
+        due_sources = CollectionScheduler(db).claim_due_sources()
+        
+        for source_doc in due_sources:
+            source_type = source_doc.get("source_type")
+            current_app.send_task(
+                get_task_for_source_type(source_type),
+                args=[str(source_doc["_id"])],
+                queue=get_queue_for_source_type(source_type)
+            )
+        
+        if due_sources:
+            logger.info(f"Dispatched collection of {len(due_sources)} due sources")
+        
+        return {
+            'success': True,
+            'dispatched': len(due_sources)
+        }
+    
+    except Exception as e:
+        error_msg = f"Error dispatching due sources: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            'success': False,
+            'error': error_msg
+        }
+
+
+@shared_task(name="collection.reconcile_counters")
+def reconcile_counters_task() -> Dict[str, Any]:
+    """
+    Celery Beat task that recounts the maintained list counters
+    
+    Corrects the drift of inserts racing a counter's first count and of
+    documents deleted outside the writers (see src.models.counters).
+    
+    Returns:
+        Dictionary with checked and corrected counter counts
+    """
+    try:
+        return {
+            'success': True,
+            **reconcile_counters(get_sync_db())
+        }
+    except Exception as e:
+        error_msg = f"Error reconciling counters: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            'success': False,
+            'error': error_msg
+        }
+
+
 @shared_task(name="collection.collect_all_active_sources")
 def collect_all_active_sources_task() -> Dict[str, Any]:
     """
     Celery task to collect from all active sources
     
+    Starts one collect_source_task per source, routed to the queue of the
+    source type, with aggregate_collection_results_task as chord callback.
+    
     Returns:
-        Dictionary with collection results for all sources
+        Dictionary with the dispatched chord information
     """
     logger.info("Starting collection task for all active sources")
     
     try:
-        db = connect_mongodb_sync()
-        collection_service = CollectionService()
+        db = get_sync_db()
         
         # Get all active sources
-        sources = db.sources.find({"is_active": True})
+        sources = db.sources.find({"is_active": True}, {"_id": 1, "source_type": 1})
         
-        results = {
-            'total_sources': 0,
-            'successful': 0,
-            'failed': 0,
-            'source_results': []
-        }
+        subtasks = [
+            collect_source_task.s(str(source_doc["_id"])).set(
+                queue=get_queue_for_source_type(source_doc.get("source_type"))
+            )
+            for source_doc in sources
+        ]
         
-        for source_doc in sources:
-            source = Source.from_dict(source_doc)
-            results['total_sources'] += 1
-            
-            try:
-                # Collect based on source type
-                result = collection_service.collect_from_source(source)
-                
-                # Update last collection timestamp
-                db.sources.update_one(
-                    {"_id": source._id},
-                    {"$set": {"last_collected_at": datetime.utcnow()}}
-                )
-                
-                if result.get('posts_saved', 0) > 0 or len(result.get('errors', [])) == 0:
-                    results['successful'] += 1
-                else:
-                    results['failed'] += 1
-                
-                results['source_results'].append(result)
-                
-            except Exception as e:
-                logger.error(f"Error collecting from source {source._id}: {e}")
-                results['failed'] += 1
-                results['source_results'].append({
-                    'source_id': str(source._id),
-                    'success': False,
-                    'error': str(e)
-                })
+        if not subtasks:
+            logger.info("No active sources to collect from")
+            return {
+                'total_sources': 0,
+                'successful': 0,
+                'failed': 0,
+                'source_results': []
+            }
         
-        logger.info(
-            f"Collection task completed: "
-            f"{results['successful']}/{results['total_sources']} successful"
-        )
+        # Callback aggregates the results once every source is done
+        chord_result = chord(subtasks)(aggregate_collection_results_task.s())
         
-        return results
+        logger.info(f"Dispatched collection for {len(subtasks)} active sources")
+        
+        return {
+            'success': True,
+            'total_sources': len(subtasks),
+            'task_id': chord_result.id
+        }
         
     except Exception as e:
         error_msg = f"Error in collect_all_active_sources_task: {str(e)}"
@@ -219,14 +402,18 @@ def collect_eurostat_dataset_task(
 @shared_task(name="statistics.update_eurostat_datasets")
 def update_eurostat_datasets_task(
     dataset_codes: Optional[List[str]] = None,
-    last_n_periods: int = 10
+    last_n_periods: int = 10,
+    incremental: bool = True
 ) -> Dict[str, Any]:
     """
     Celery task to update multiple EUROSTAT datasets
     
     Args:
         dataset_codes: List of dataset codes to update (None = update all tracked)
-        last_n_periods: Number of latest time periods to fetch
+        last_n_periods: Number of latest time periods to fetch (full update,
+            or datasets not stored yet)
+        incremental: Only download changed datasets and their new periods
+            (False: download the last N periods of every dataset again)
         
     Returns:
         Dictionary with update results
@@ -234,8 +421,7 @@ def update_eurostat_datasets_task(
     logger.info("Starting EUROSTAT datasets update task")
     
     try:
-        db = connect_mongodb_sync()
-        eurostat_service = EurostatService()
+        db = get_sync_db()
         
         # Get dataset codes to update
         if dataset_codes is None:
@@ -246,6 +432,20 @@ def update_eurostat_datasets_task(
             )
             dataset_codes = [doc["dataset_code"] for doc in tracked]
         
+        if incremental:
+            results = DatasetRefresher(db=db).refresh_many(
+                [(dataset_code, "eurostat") for dataset_code in dataset_codes],
+                last_n_periods=last_n_periods
+            )
+            logger.info(
+                f"EUROSTAT update task completed: "
+                f"{results['successful']}/{results['total_datasets']} successful, "
+                f"{results['unchanged']} unchanged"
+            )
+            return results
+        
+        eurostat_service = EurostatService()
+        
         results = {
             'total_datasets': len(dataset_codes),
             'successful': 0,
@@ -300,6 +500,63 @@ def update_eurostat_datasets_task(
         }
 
 
+@shared_task(name="statistics.refresh_eurostat_catalogue")
+def refresh_eurostat_catalogue_task() -> Dict[str, Any]:
+    """
+    Celery task to bring the local EUROSTAT catalogue mirror up to date
+    
+    Returns:
+        Dictionary with counts of added, updated and removed datasets
+    """
+    logger.info("Starting EUROSTAT catalogue refresh")
+    
+    try:
+        return {
+            'success': True,
+            **EurostatCatalogue().refresh()
+        }
+    except Exception as e:
+        error_msg = f"Error refreshing EUROSTAT catalogue: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            'success': False,
+            'error': error_msg
+        }
+
+
+@shared_task(name="statistics.refresh_tracked_datasets")
+def refresh_tracked_datasets_task(last_n_periods: int = 10) -> Dict[str, Any]:
+    """
+    Celery task to incrementally refresh all stored EUROSTAT and KSH datasets
+    
+    Unchanged datasets are skipped; changed ones only download their latest
+    periods (see DatasetRefresher).
+    
+    Args:
+        last_n_periods: Number of latest time periods of datasets not stored yet
+        
+    Returns:
+        Dictionary with refresh results
+    """
+    logger.info("Starting statistics refresh task")
+    
+    try:
+        refresher = DatasetRefresher()
+        results = refresher.refresh_many(refresher.tracked_datasets(), last_n_periods=last_n_periods)
+        logger.info(
+            f"Statistics refresh completed: {results['updated']} updated, "
+            f"{results['unchanged']} unchanged, {results['failed']} failed"
+        )
+        return results
+    except Exception as e:
+        error_msg = f"Error in refresh_tracked_datasets_task: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            'success': False,
+            'error': error_msg
+        }
+
+
 @shared_task(name="statistics.collect_ksh_dataset")
 def collect_ksh_dataset_task(
     dataset_code: str,
@@ -515,6 +772,62 @@ def collect_rss_feed_task(
         }
 
 
+@shared_task(name="news.collect_rss_feeds")
+def collect_rss_feeds_task(
+    feed_urls: List[str],
+    max_items: int = 50,
+    source_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Celery task to collect entries from several RSS feeds concurrently
+
+    Args:
+        feed_urls: RSS feed URLs
+        max_items: Maximum number of entries to fetch per feed
+        source_id: Optional source ID for tracking
+
+    Returns:
+        Dictionary with per-feed collection results
+    """
+    logger.info(f"Starting RSS collection of {len(feed_urls)} feeds")
+
+    try:
+        rss_service = RSSReaderService()
+        feed_results = rss_service.collect_feeds(
+            feed_urls=feed_urls,
+            max_items=max_items,
+            store=True,
+            source_id=source_id
+        )
+
+        result = {
+            'success': True,
+            'total_feeds': len(feed_urls),
+            'failed': sum(1 for r in feed_results if not r['success']),
+            'not_modified': sum(1 for r in feed_results if r.get('not_modified')),
+            'entries_fetched': sum(r['entries_fetched'] for r in feed_results),
+            'entries_stored': sum(r['entries_stored'] for r in feed_results),
+            'feed_results': feed_results
+        }
+
+        logger.info(
+            f"RSS collection completed: "
+            f"{result['entries_fetched']} fetched, "
+            f"{result['entries_stored']} stored, "
+            f"{result['failed']} feeds failed"
+        )
+
+        return result
+
+    except Exception as e:
+        error_msg = f"Error collecting RSS feeds: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return {
+            'success': False,
+            'error': error_msg
+        }
+
+
 def get_collection_schedule_for_source(source: Source) -> Optional[Dict[str, Any]]:
     """
     Get Celery Beat schedule configuration for a source
@@ -543,7 +856,7 @@ def get_collection_schedule_for_source(source: Source) -> Optional[Dict[str, Any
         cron_parts = schedule_config['cron'].split()
         if len(cron_parts) == 5:
             return {
-                'task': 'collection.collect_facebook_posts',
+                'task': get_task_for_source_type(source.source_type),
                 'schedule': crontab(
                     minute=cron_parts[0],
                     hour=cron_parts[1],
@@ -581,7 +894,7 @@ def get_collection_schedule_for_source(source: Source) -> Optional[Dict[str, Any
         return None
     
     return {
-        'task': 'collection.collect_facebook_posts',
+        'task': get_task_for_source_type(source.source_type),
         'schedule': total_seconds,
         'args': [str(source._id)]
     }
@@ -3,75 +3,63 @@ Fact-checking Service
 Extracts claims, searches for references, and generates fact-check results
 """
 import logging
+import multiprocessing
 import re
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from bson import ObjectId
 
 try:
-    import spacy
-    SPACY_AVAILABLE = True
-    # Try langdetect, fallback to spacy language detection
-    try:
-        from langdetect import detect as langdetect_detect
-        LANGDETECT_AVAILABLE = True
-    except ImportError:
-        LANGDETECT_AVAILABLE = False
-        logging.info("langdetect not available, will use spacy language detection")
+    from langdetect import detect as langdetect_detect
+    LANGDETECT_AVAILABLE = True
 except ImportError:
-    SPACY_AVAILABLE = False
     LANGDETECT_AVAILABLE = False
-    logging.warning("spaCy not available. Fact-checking will be limited.")
+    logging.info("langdetect not available, will use spacy language detection")
 
-from src.models.database import connect_mongodb_sync
+from src.config.settings import get_settings
+from src.models.counters import increment_counters
 from src.models.mongodb_models import Post, FactCheckResult
-from src.services.search import GoogleSearchService, BingSearchService
-from src.services.collection.statistics import EurostatService, KSHService
+from src.services.factcheck import registry
+from src.services.search.bm25_index import BM25Index
+from src.services.search.near_duplicates import NearDuplicateIndex
+from src.services.search.rate_limiter import RateLimited
 
 logger = logging.getLogger(__name__)
 
+# Pipeline components claim extraction does not read (it uses sentences,
+# named entities and POS tags)
+UNUSED_CLAIM_PIPES = (
+    "lemmatizer",
+    "lookup_lemmatizer",
+    "trainable_lemmatizer",
+    "textcat",
+    "textcat_multilabel",
+    "entity_linker",
+)
+# Dependency parsing is only needed for sentences when there is no senter
+PARSER_PIPES = ("parser", "experimental_arc_predicter", "experimental_arc_labeler")
+
+# Relevance-weighted reference support needed for a "verified" verdict (about
+# three strong references) and for any verdict other than "disputed"
+VERIFIED_REFERENCE_SUPPORT = 2.0
+MIN_REFERENCE_SUPPORT = 0.25
+
 
 class FactCheckService:
     """Service for fact-checking posts"""
     
     def __init__(self):
-        self.db = connect_mongodb_sync()
-        self.nlp = None
-        self._load_nlp_model()
+        # The model, database and services are loaded once per process
+        self.db = registry.get_db()
+        self.nlp = registry.get_nlp()
         # Initialize search services
-        self.google_search = GoogleSearchService()
-        self.bing_search = BingSearchService()
+        self.google_search = registry.get_google_search()
+        self.bing_search = registry.get_bing_search()
         # Initialize statistics services
-        self.eurostat_service = EurostatService()
-        self.ksh_service = KSHService()
-    
-    def _load_nlp_model(self):
-        """Load Hungarian NLP model"""
-        if not SPACY_AVAILABLE:
-            logger.warning("spaCy not available, skipping NLP model loading")
-            return
-        
-        try:
-            # Try to load Hungarian model
-            try:
-                self.nlp = spacy.load("hu_core_news_lg")
-                logger.info("Loaded Hungarian spaCy model: hu_core_news_lg")
-            except OSError:
-                try:
-                    self.nlp = spacy.load("hu_core_news_sm")
-                    logger.info("Loaded Hungarian spaCy model: hu_core_news_sm")
-                except OSError:
-                    logger.warning(
-                        "Hungarian spaCy model not found. "
-                        "Please install: python -m spacy download hu_core_news_lg"
-                    )
-                    # Fallback to English model
-                    try:
-                        self.nlp = spacy.load("en_core_web_sm")
-                        logger.warning("Using English model as fallback")
-                    except OSError:
-                        logger.error("No spaCy models available")
-        except Exception as e:
-            logger.error(f"Error loading NLP model: {e}")
+        self.eurostat_service = registry.get_eurostat_service()
+        self.ksh_service = registry.get_ksh_service()
     
     def _detect_language(self, text: str) -> str:
         """Detect language of text"""
@@ -83,7 +71,7 @@ class FactCheckService:
                 logger.debug(f"langdetect error: {e}, trying spacy fallback")
         
         # Fallback to spacy language detection
-        if self.nlp and SPACY_AVAILABLE:
+        if self.nlp:
             try:
                 doc = self.nlp(text[:100])  # First 100 chars for speed
                 # spacy doesn't have built-in language detection, 
@@ -115,90 +103,163 @@ class FactCheckService:
         Returns:
             List of claim dictionaries
         """
-        claims = []
+        if not self.nlp:
+            return self._extract_claims_from_sentences(text)
+        
+        try:
+            with self.nlp.select_pipes(disable=self._unused_claim_pipes()):
+                return self._claims_from_doc(self.nlp(text))
+        except Exception as e:
+            logger.error(f"Error extracting claims with NLP: {e}")
+            return []
+    
+    def extract_claims_batch(self, posts: List[Post]) -> List[List[Dict[str, Any]]]:
+        """
+        Extract factual claims from several posts with nlp.pipe
+        
+        Texts are processed in batches of FACTCHECK_NLP_BATCH_SIZE by
+        FACTCHECK_NLP_PROCESSES processes, with the pipeline components
+        claim extraction does not use disabled.
+        
+        Args:
+            posts: Posts to analyze
+            
+        Returns:
+            List of claim lists, in the order of posts
+        """
+        texts = [post.content or "" for post in posts]
         
         if not self.nlp:
-            # Fallback: extract sentences
-            sentences = re.split(r'[.!?]+', text)
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if len(sentence) > 20:  # Filter short sentences
-                    claims.append({
-                        'text': sentence,
-                        'type': 'statement',
-                        'confidence': 0.5
-                    })
-            return claims
+            return [self._extract_claims_from_sentences(text) for text in texts]
+        
+        settings = get_settings()
+        n_process = settings.FACTCHECK_NLP_PROCESSES
+        if n_process != 1 and multiprocessing.current_process().daemon:
+            # Daemonic processes (Celery prefork children) cannot start processes
+            logger.debug("Running nlp.pipe in a single process inside a daemon worker")
+            n_process = 1
         
         try:
-            doc = self.nlp(text)
+            with self.nlp.select_pipes(disable=self._unused_claim_pipes()):
+                docs = self.nlp.pipe(
+                    texts,
+                    batch_size=settings.FACTCHECK_NLP_BATCH_SIZE,
+                    n_process=n_process
+                )
+                return [self._claims_from_doc(doc) for doc in docs]
+        except Exception as e:
+            logger.error(f"Error extracting claims in batch, falling back to single posts: {e}")
+            return [self._extract_claims_with_nlp(text) for text in texts]
+    
+    def _unused_claim_pipes(self) -> List[str]:
+        """Names of the loaded pipeline components claim extraction can skip"""
+        unused = set(UNUSED_CLAIM_PIPES)
+        if "senter" in self.nlp.pipe_names:
+            unused.update(PARSER_PIPES)
+        return [name for name in self.nlp.pipe_names if name in unused]
+    
+    def _extract_claims_from_sentences(self, text: str) -> List[Dict[str, Any]]:
+        """Fallback claim extraction without an NLP model: every longer sentence"""
+        claims = []
+        sentences = re.split(r'[.!?]+', text)
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if len(sentence) > 20:  # Filter short sentences
+                claims.append({
+                    'text': sentence,
+                    'type': 'statement',
+                    'confidence': 0.5
+                })
+        return claims
+    
+    def _claims_from_doc(self, doc: Any) -> List[Dict[str, Any]]:
+        """
+        Extract factual claims from a processed spaCy Doc
+        
+        Args:
+            doc: spaCy Doc
             
-            # Extract sentences
-            for sent in doc.sents:
-                sent_text = sent.text.strip()
-                if len(sent_text) < 20:
-                    continue
+        Returns:
+            List of claim dictionaries
+        """
+        claims = []
+        
+        # Extract sentences
+        for sent in doc.sents:
+            sent_text = sent.text.strip()
+            if len(sent_text) < 20:
+                continue
+            
+            # Check if sentence contains factual claims
+            # Look for numbers, dates, named entities
+            has_numbers = bool(re.search(r'\d+', sent_text))
+            has_entities = len(sent.ents) > 0
+            has_verbs = any(token.pos_ == "VERB" for token in sent)
+            
+            if has_numbers or (has_entities and has_verbs):
+                # Extract named entities
+                entities = [
+                    {
+                        'text': ent.text,
+                        'label': ent.label_,
+                        'start': ent.start_char,
+                        'end': ent.end_char
+                    }
+                    for ent in sent.ents
+                ]
                 
-                # Check if sentence contains factual claims
-                # Look for numbers, dates, named entities
-                has_numbers = bool(re.search(r'\d+', sent_text))
-                has_entities = len(sent.ents) > 0
-                has_verbs = any(token.pos_ == "VERB" for token in sent)
+                # Extract numbers/dates
+                numbers = re.findall(r'\d+[.,]?\d*', sent_text)
                 
-                if has_numbers or (has_entities and has_verbs):
-                    # Extract named entities
-                    entities = [
-                        {
-                            'text': ent.text,
-                            'label': ent.label_,
-                            'start': ent.start_char,
-                            'end': ent.end_char
-                        }
-                        for ent in sent.ents
-                    ]
-                    
-                    # Extract numbers/dates
-                    numbers = re.findall(r'\d+[.,]?\d*', sent_text)
-                    
-                    claims.append({
-                        'text': sent_text,
-                        'type': 'factual_claim',
-                        'entities': entities,
-                        'numbers': numbers,
-                        'confidence': 0.7 if has_numbers and has_entities else 0.5
-                    })
-        except Exception as e:
-            logger.error(f"Error extracting claims with NLP: {e}")
+                claims.append({
+                    'text': sent_text,
+                    'type': 'factual_claim',
+                    'entities': entities,
+                    'numbers': numbers,
+                    'confidence': 0.7 if has_numbers and has_entities else 0.5
+                })
         
         return claims
     
     def _search_internal_sources(
         self,
         claim: str,
-        keywords: List[str]
+        exclude_post_ids: Optional[List[ObjectId]] = None,
+        timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for references in internal sources (posts, articles)
         
         Args:
             claim: Claim text to search for
-            keywords: Keywords extracted from claim
+            exclude_post_ids: Post being checked and its near-duplicates
+                (copies of a story do not confirm each other)
+            timeout: Time budget of the index search in seconds
             
         Returns:
-            List of reference dictionaries
+            List of reference dictionaries, most relevant first
         """
         references = []
         
         try:
-            # Search in posts
-            query = {"$or": [
-                {"content": {"$regex": keyword, "$options": "i"}}
-                for keyword in keywords[:3]  # Limit to 3 keywords
-            ]}
+            hits = BM25Index(self.db).search(
+                claim,
+                limit=5,
+                exclude_ids=exclude_post_ids or None,
+                timeout=timeout
+            )
+            if not hits:
+                return references
             
-            posts = self.db.posts.find(query).limit(5)
+            post_docs = {
+                post_doc["_id"]: post_doc
+                for post_doc in self.db.posts.find({"_id": {"$in": [hit["post_id"] for hit in hits]}})
+            }
             
-            for post_doc in posts:
+            for hit in hits:
+                post_doc = post_docs.get(hit["post_id"])
+                if post_doc is None:
+                    continue
                 post = Post.from_dict(post_doc)
                 references.append({
                     'type': 'internal_post',
@@ -206,7 +267,8 @@ class FactCheckService:
                     'post_id': str(post._id),
                     'content': post.content[:200],  # First 200 chars
                     'posted_at': post.posted_at.isoformat(),
-                    'relevance_score': 0.7  # Could be improved with similarity
+                    'relevance_score': round(hit["relevance"], 3),
+                    'bm25_score': round(hit["score"], 3)
                 })
         
         except Exception as e:
@@ -214,109 +276,245 @@ class FactCheckService:
         
         return references
     
-    def _search_external_sources(
-        self,
-        claim: str,
-        keywords: List[str],
-        manual_sources: Optional[List[str]] = None
-    ) -> List[Dict[str, Any]]:
+    def _search_eurostat(self, keywords: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
         """
-        Search for references in external sources
+        Search EUROSTAT datasets with stored data relevant to the keywords
         
         Args:
-            claim: Claim text
             keywords: Keywords
-            manual_sources: Manually provided source URLs
+            timeout: Time budget of the dataset searches in seconds
             
         Returns:
             List of reference dictionaries
         """
         references = []
+        eurostat_datasets = self.eurostat_service.search_for_statistics(
+            keywords=keywords,
+            max_results=3,
+            timeout=timeout
+        )
         
-        # Add manual sources
-        if manual_sources:
-            for source_url in manual_sources:
+        for dataset in eurostat_datasets:
+            # Get stored data if available
+            stored_data = self.eurostat_service.get_stored_dataset(dataset["code"])
+            if stored_data:
                 references.append({
-                    'type': 'manual',
-                    'source': 'user_provided',
-                    'url': source_url,
-                    'relevance_score': 1.0
+                    "type": "statistics",
+                    "source": "eurostat",
+                    "dataset_code": dataset["code"],
+                    "title": dataset.get("label", dataset["code"]),
+                    "url": f"https://ec.europa.eu/eurostat/web/main/data/database?node_code={dataset['code']}",
+                    "relevance_score": 0.7,
+                    "last_updated": stored_data.get("updated_at", "").isoformat() if stored_data.get("updated_at") else ""
                 })
+        return references
+    
+    def _search_ksh(self, keywords: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Search KSH (Hungarian statistics) datasets with stored data relevant to the keywords
         
-        # Search using Google Custom Search API
-        if self.google_search.is_configured():
-            try:
-                google_results = self.google_search.search_for_fact_check(
-                    claim=claim,
-                    keywords=keywords,
-                    num_results=5
-                )
-                references.extend(google_results)
-            except Exception as e:
-                logger.error(f"Error searching with Google: {e}")
+        Args:
+            keywords: Keywords
+            timeout: Time budget of the dataset searches in seconds
+            
+        Returns:
+            List of reference dictionaries
+        """
+        references = []
+        ksh_datasets = self.ksh_service.search_for_statistics(
+            keywords=keywords,
+            max_results=3,
+            timeout=timeout
+        )
         
-        # Search using Bing Web Search API (as fallback or additional source)
-        if self.bing_search.is_configured() and len(references) < 5:
-            try:
-                bing_results = self.bing_search.search_for_fact_check(
-                    claim=claim,
-                    keywords=keywords,
-                    num_results=5
-                )
-                references.extend(bing_results)
-            except Exception as e:
-                logger.error(f"Error searching with Bing: {e}")
+        for dataset in ksh_datasets:
+            # Get stored data if available
+            stored_data = self.ksh_service.get_stored_dataset(dataset["code"])
+            if stored_data:
+                references.append({
+                    "type": "statistics",
+                    "source": "ksh",
+                    "dataset_code": dataset["code"],
+                    "title": dataset.get("label", dataset["code"]),
+                    "url": dataset.get("url", f"https://www.ksh.hu/stadat_files/hun/hun/xls/hun/stadat_nyito.html"),
+                    "relevance_score": 0.8,  # Higher relevance for Hungarian statistics
+                    "last_updated": stored_data.get("updated_at", "").isoformat() if stored_data.get("updated_at") else ""
+                })
+        return references
+    
+    @staticmethod
+    def _timed(deadline: float, func, *args, **kwargs) -> Tuple[Any, float]:
+        """
+        Run a provider with the time left until the deadline as its timeout,
+        returning its result and run time in milliseconds
+        """
+        started = time.monotonic()
+        remaining = deadline - started
+        if remaining <= 0:
+            raise TimeoutError("fact-check deadline passed before the provider started")
+        result = func(*args, timeout=remaining, **kwargs)
+        return result, (time.monotonic() - started) * 1000
+    
+    def _gather_references(
+        self,
+        post: Post,
+        claims: List[Dict[str, Any]],
+        keywords: List[str],
+        manual_sources: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Search all evidence providers concurrently
         
-        # Search EUROSTAT statistics for relevant data
-        try:
-            # Search for relevant datasets
-            eurostat_datasets = self.eurostat_service.search_for_statistics(
+        Internal searches (one per claim, on their own thread pool), Google,
+        EUROSTAT and KSH start together. Bing starts only once Google returned
+        fewer than 5 references (or right away when Google is not
+        configured). Every provider gets the time left until the
+        FACTCHECK_EVIDENCE_TIMEOUT deadline as its timeout. At the deadline,
+        providers still queued are cancelled and running ones are abandoned
+        (their threads end at the provider timeout); their results are dropped.
+        
+        Args:
+            post: Post being fact-checked
+            claims: Extracted claims
+            keywords: Keywords of the claims
+            manual_sources: Manually provided source URLs
+            
+        Returns:
+            Tuple of (internal references, external references, provider
+            report keyed by provider name with status, references and
+            elapsed_ms)
+        """
+        executor = registry.get_evidence_executor()
+        internal_executor = registry.get_internal_search_executor()
+        deadline = time.monotonic() + get_settings().FACTCHECK_EVIDENCE_TIMEOUT
+        
+        manual_refs = [
+            {
+                'type': 'manual',
+                'source': 'user_provided',
+                'url': source_url,
+                'relevance_score': 1.0
+            }
+            for source_url in manual_sources or []
+        ]
+        
+        futures = {}
+        
+        def submit(name, func, *args, pool=None, **kwargs):
+            future = (pool or executor).submit(self._timed, deadline, func, *args, **kwargs)
+            futures[future] = name
+            return future
+        
+        def submit_bing():
+            return submit(
+                "bing",
+                self.bing_search.search_for_fact_check,
+                claim=post.content,
                 keywords=keywords,
-                max_results=3
+                num_results=5
             )
-            
-            for dataset in eurostat_datasets:
-                # Get stored data if available
-                stored_data = self.eurostat_service.get_stored_dataset(dataset["code"])
-                if stored_data:
-                    references.append({
-                        "type": "statistics",
-                        "source": "eurostat",
-                        "dataset_code": dataset["code"],
-                        "title": dataset.get("label", dataset["code"]),
-                        "url": f"https://ec.europa.eu/eurostat/web/main/data/database?node_code={dataset['code']}",
-                        "relevance_score": 0.7,
-                        "last_updated": stored_data.get("updated_at", "").isoformat() if stored_data.get("updated_at") else ""
-                    })
-        except Exception as e:
-            logger.error(f"Error searching EUROSTAT statistics: {e}")
         
-        # Search KSH (Hungarian statistics) for relevant data
-        try:
-            ksh_datasets = self.ksh_service.search_for_statistics(
+        excluded_posts = [post._id] if post._id else []
+        if post._id and claims:
+            try:
+                excluded_posts += NearDuplicateIndex(self.db).cluster_members(post._id)
+            except Exception as e:
+                logger.warning(f"Error reading near-duplicates of post {post._id}: {e}")
+        for index, claim in enumerate(claims):
+            submit(
+                f"internal:{index}",
+                self._search_internal_sources,
+                claim['text'],
+                exclude_post_ids=excluded_posts,
+                pool=internal_executor
+            )
+        if self.google_search.is_configured():
+            submit(
+                "google",
+                self.google_search.search_for_fact_check,
+                claim=post.content,
                 keywords=keywords,
-                max_results=3
+                num_results=5
+            )
+        elif self.bing_search.is_configured() and len(manual_refs) < 5:
+            submit_bing()
+        submit("eurostat", self._search_eurostat, keywords)
+        submit("ksh", self._search_ksh, keywords)
+        
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        report: Dict[str, Dict[str, Any]] = {}
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name], elapsed_ms = future.result()
+                    report[name] = {
+                        "status": "ok",
+                        "references": len(results[name]),
+                        "elapsed_ms": round(elapsed_ms, 1)
+                    }
+                except RateLimited as e:
+                    report[name] = {"status": "rate_limited", "retry_after": round(e.retry_after, 1)}
+                except Exception as e:
+                    logger.error(f"Error searching evidence provider {name}: {e}")
+                    report[name] = {"status": "error", "error": str(e)}
+                
+                # Bing as fallback when Google found too few references
+                if (name == "google" and self.bing_search.is_configured()
+                        and len(manual_refs) + len(results.get("google", [])) < 5):
+                    pending.add(submit_bing())
+        
+        for future in pending:
+            name = futures[future]
+            # A running provider cannot be stopped; it ends at its timeout
+            report[name] = {"status": "cancelled" if future.cancel() else "abandoned"}
+            logger.warning(
+                f"Evidence provider {name} missed the fact-check deadline for post {post._id} "
+                f"({report[name]['status']})"
             )
-            
-            for dataset in ksh_datasets:
-                # Get stored data if available
-                stored_data = self.ksh_service.get_stored_dataset(dataset["code"])
-                if stored_data:
-                    references.append({
-                        "type": "statistics",
-                        "source": "ksh",
-                        "dataset_code": dataset["code"],
-                        "title": dataset.get("label", dataset["code"]),
-                        "url": dataset.get("url", f"https://www.ksh.hu/stadat_files/hun/hun/xls/hun/stadat_nyito.html"),
-                        "relevance_score": 0.8,  # Higher relevance for Hungarian statistics
-                        "last_updated": stored_data.get("updated_at", "").isoformat() if stored_data.get("updated_at") else ""
-                    })
-        except Exception as e:
-            logger.error(f"Error searching KSH statistics: {e}")
         
-        # TODO: Implement fact-checking websites search
+        # Internal references: best score per post across claims
+        internal_by_post = {}
+        for index in range(len(claims)):
+            for ref in results.get(f"internal:{index}", []):
+                known = internal_by_post.get(ref['post_id'])
+                if known is None or ref['relevance_score'] > known['relevance_score']:
+                    internal_by_post[ref['post_id']] = ref
+        internal_refs = sorted(
+            internal_by_post.values(),
+            key=lambda ref: ref['relevance_score'],
+            reverse=True
+        )
         
-        return references
+        external_refs = manual_refs
+        for name in ("google", "bing", "eurostat", "ksh"):
+            external_refs.extend(results.get(name, []))
+        
+        return internal_refs, external_refs, self._merge_internal_report(report)
+    
+    @staticmethod
+    def _merge_internal_report(report: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Combine the per-claim internal search entries of a provider report into one"""
+        merged = {}
+        internal = [entry for name, entry in report.items() if name.startswith("internal:")]
+        if internal:
+            statuses = {entry["status"] for entry in internal}
+            merged["internal"] = {
+                "status": next(
+                    (status for status in ("abandoned", "cancelled", "rate_limited", "error") if status in statuses),
+                    "ok"
+                ),
+                "searches": len(internal),
+                "references": sum(entry.get("references", 0) for entry in internal),
+                "elapsed_ms": max((entry.get("elapsed_ms", 0.0) for entry in internal), default=0.0)
+            }
+        merged.update({name: entry for name, entry in report.items() if not name.startswith("internal:")})
+        return merged
     
     def _calculate_verdict(
         self,
@@ -339,19 +537,19 @@ class FactCheckService:
         if not references:
             return "disputed", 0.3  # Disputed if no references found
         
-        # Simple scoring algorithm
-        # Count supporting vs contradicting references
-        supporting = 0
-        contradicting = 0
+        # Weigh supporting vs contradicting references by relevance, so a
+        # few weak matches do not count as much as strong ones
+        contradicting = 0.0
         
         # For now, assume all references are supporting
         # In future, implement sentiment/similarity analysis
-        supporting = len(references)
+        supporting = sum(ref.get('relevance_score', 0.5) for ref in references)
         
-        total_references = len(references)
+        if supporting < MIN_REFERENCE_SUPPORT:
+            return "disputed", 0.3  # Only marginally related references
         
         if supporting > contradicting * 2:
-            if total_references >= 3:
+            if supporting >= VERIFIED_REFERENCE_SUPPORT:
                 return "verified", 0.8
             else:
                 return "true", 0.6
@@ -367,7 +565,8 @@ class FactCheckService:
     def factcheck_post(
         self,
         post: Post,
-        manual_sources: Optional[List[str]] = None
+        manual_sources: Optional[List[str]] = None,
+        claims: Optional[List[Dict[str, Any]]] = None
     ) -> FactCheckResult:
         """
         Perform fact-checking on a post
@@ -375,14 +574,19 @@ class FactCheckService:
         Args:
             post: Post object to fact-check
             manual_sources: Optional list of manual source URLs
+            claims: Claims already extracted with extract_claims_batch
             
         Returns:
             FactCheckResult object
+            
+        Raises:
+            RateLimited: When no web search ran because of the API rate limits
         """
         logger.info(f"Starting fact-check for post {post._id}")
         
         # Extract claims
-        claims = self._extract_claims_with_nlp(post.content)
+        if claims is None:
+            claims = self._extract_claims_with_nlp(post.content)
         logger.info(f"Extracted {len(claims)} claims from post")
         
         if not claims:
@@ -407,19 +611,25 @@ class FactCheckService:
         # Remove duplicates
         keywords = list(set(all_keywords))[:10]  # Top 10 unique keywords
         
-        # Search for references
-        internal_refs = []
-        for claim in claims:
-            claim_keywords = re.findall(r'\b\w{4,}\b', claim['text'].lower())[:3]
-            refs = self._search_internal_sources(claim['text'], claim_keywords)
-            internal_refs.extend(refs)
-        
-        external_refs = self._search_external_sources(
-            post.content,
+        # Search for references (all providers at once, under one deadline)
+        internal_refs, external_refs, providers = self._gather_references(
+            post,
+            claims,
             keywords,
             manual_sources
         )
         
+        # Without any web search result only because of the shared API
+        # budget, the verdict would be weaker than it has to be: retry later
+        web_searches = [providers[name] for name in ("google", "bing") if name in providers]
+        limited = [
+            (entry["retry_after"], name) for name, entry in providers.items()
+            if entry["status"] == "rate_limited"
+        ]
+        if limited and not any(entry["status"] == "ok" for entry in web_searches):
+            retry_after, api = min(limited)
+            raise RateLimited(api, retry_after)
+        
         all_references = internal_refs + external_refs
         
         # Calculate verdict
@@ -441,7 +651,11 @@ class FactCheckService:
             metadata={
                 "keywords": keywords,
                 "internal_refs_count": len(internal_refs),
-                "external_refs_count": len(external_refs)
+                "external_refs_count": len(external_refs),
+                "evidence_providers": providers,
+                "timed_out_providers": [
+                    name for name, entry in providers.items() if entry["status"] in ("abandoned", "cancelled")
+                ]
             }
         )
         
@@ -459,16 +673,97 @@ class FactCheckService:
         """
         try:
             self.db.factcheck_results.insert_one(result.to_dict())
+            increment_counters(self.db, "factcheck_results", "verdict", {result.verdict: 1})
+            self.mark_posts_checked([result.post_id], checked_at=result.checked_at)
             logger.info(f"Saved fact-check result for post {result.post_id}")
             return True
         except Exception as e:
             logger.error(f"Error saving fact-check result: {e}")
             return False
     
+    def mark_posts_checked(
+        self,
+        post_ids: List[str],
+        checked_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Remove posts from the pending fact-check queue
+        
+        Args:
+            post_ids: Post IDs that have a fact-check result
+            checked_at: Time of the fact-check
+        """
+        object_ids = [ObjectId(post_id) for post_id in post_ids if ObjectId.is_valid(post_id)]
+        if not object_ids:
+            return
+        
+        self.db.posts.update_many(
+            {"_id": {"$in": object_ids}},
+            {"$set": {
+                "factcheck_status": "checked",
+                "factcheck_checked_at": checked_at or datetime.utcnow()
+            }}
+        )
+    
+    def get_pending_posts(
+        self,
+        limit: int,
+        source_id: Optional[str] = None,
+        after_id: Optional[ObjectId] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[ObjectId]]:
+        """
+        Get a batch of posts that are waiting for fact-checking
+        
+        Posts stored before the status field existed have no
+        factcheck_status; they are pending too unless a result already
+        exists, in which case they are marked as checked and skipped.
+        
+        Args:
+            limit: Maximum number of posts to return
+            source_id: Optional source ID filter
+            after_id: Only return posts with a greater _id (resume cursor)
+            
+        Returns:
+            Tuple of (post documents in _id order, _id to resume after)
+        """
+        pending = []
+        cursor = after_id
+        
+        while len(pending) < limit:
+            query = {"factcheck_status": {"$in": [None, "pending"]}}
+            if source_id:
+                query["source_id"] = source_id
+            if cursor:
+                query["_id"] = {"$gt": cursor}
+            
+            post_docs = list(
+                self.db.posts.find(query).sort("_id", 1).limit(limit - len(pending))
+            )
+            if not post_docs:
+                break
+            cursor = post_docs[-1]["_id"]
+            
+            # Catch up legacy posts that were checked before the status field existed
+            legacy_ids = [str(doc["_id"]) for doc in post_docs if "factcheck_status" not in doc]
+            already_checked = set()
+            if legacy_ids:
+                already_checked = set(self.db.factcheck_results.distinct(
+                    "post_id", {"post_id": {"$in": legacy_ids}}
+                ))
+                if already_checked:
+                    self.mark_posts_checked(list(already_checked))
+            
+            pending.extend(doc for doc in post_docs if str(doc["_id"]) not in already_checked)
+        
+        return pending, cursor
+    
     def get_factcheck_result(self, post_id: str) -> Optional[FactCheckResult]:
         """
         Get fact-check result for a post
         
+        Near-duplicates of a story get the result of the cluster's
+        representative post.
+        
         Args:
             post_id: Post ID
             
@@ -480,6 +775,13 @@ class FactCheckService:
                 {"post_id": post_id},
                 sort=[("checked_at", -1)]  # Get most recent
             )
+            if not doc and ObjectId.is_valid(post_id):
+                post_doc = self.db.posts.find_one({"_id": ObjectId(post_id)}, {"duplicate_of": 1})
+                if post_doc and post_doc.get("duplicate_of"):
+                    doc = self.db.factcheck_results.find_one(
+                        {"post_id": post_doc["duplicate_of"]},
+                        sort=[("checked_at", -1)]
+                    )
             if doc:
                 return FactCheckResult.from_dict(doc)
         except Exception as e:
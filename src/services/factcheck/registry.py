@@ -0,0 +1,143 @@
+"""
+Fact-check Resource Registry
+Per-process lazy singletons for the spaCy model, MongoDB database and the
+search/statistics services used by FactCheckService
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.config.settings import get_settings
+from src.models.database import get_sync_db
+
+try:
+    import spacy
+    SPACY_AVAILABLE = True
+except ImportError:
+    SPACY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tried in order
+NLP_MODELS = ("hu_core_news_lg", "hu_core_news_sm", "en_core_web_sm")
+
+_lock = threading.RLock()
+_resources: Dict[str, Any] = {}
+_resources_pid: Optional[int] = None
+
+
+def _get(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Get a resource of this process, creating it on first use
+
+    Resources created before a fork are dropped in the child, so it never
+    uses a parent's MongoDB client.
+    """
+    global _resources_pid
+    with _lock:
+        if _resources_pid != os.getpid():
+            _resources.clear()
+            _resources_pid = os.getpid()
+        if name not in _resources:
+            _resources[name] = factory()
+        return _resources[name]
+
+
+def load_nlp_model():
+    """
+    Load the Hungarian spaCy model (English model as fallback)
+
+    Returns:
+        spaCy Language or None if no model is available
+    """
+    if not SPACY_AVAILABLE:
+        logger.warning("spaCy not available, skipping NLP model loading")
+        return None
+
+    for model_name in NLP_MODELS:
+        try:
+            nlp = spacy.load(model_name)
+            if model_name.startswith("hu_"):
+                logger.info(f"Loaded Hungarian spaCy model: {model_name}")
+            else:
+                logger.warning(f"Using {model_name} model as fallback")
+            return nlp
+        except OSError:
+            if model_name == "hu_core_news_sm":
+                logger.warning(
+                    "Hungarian spaCy model not found. "
+                    "Please install: python -m spacy download hu_core_news_lg"
+                )
+        except Exception as e:
+            logger.error(f"Error loading NLP model {model_name}: {e}")
+            return None
+
+    logger.error("No spaCy models available")
+    return None
+
+
+def get_nlp():
+    """Get the spaCy model of this process (None if unavailable)"""
+    return _get("nlp", load_nlp_model)
+
+
+def get_db():
+    """Get the MongoDB database shared by the fact-check services of this process"""
+    return _get("db", get_sync_db)
+
+
+def get_google_search():
+    """Get the Google search service of this process"""
+    from src.services.search import GoogleSearchService
+    return _get("google_search", GoogleSearchService)
+
+
+def get_bing_search():
+    """Get the Bing search service of this process"""
+    from src.services.search import BingSearchService
+    return _get("bing_search", BingSearchService)
+
+
+def get_eurostat_service():
+    """Get the EUROSTAT service of this process"""
+    from src.services.collection.statistics import EurostatService
+    return _get("eurostat", lambda: EurostatService(db=get_db()))
+
+
+def get_ksh_service():
+    """Get the KSH service of this process"""
+    from src.services.collection.statistics import KSHService
+    return _get("ksh", lambda: KSHService(db=get_db(), eurostat_service=get_eurostat_service()))
+
+
+def get_evidence_executor() -> ThreadPoolExecutor:
+    """Get the thread pool running the evidence lookups of fact-checks in this process"""
+    return _get("evidence_executor", lambda: ThreadPoolExecutor(
+        max_workers=get_settings().FACTCHECK_EVIDENCE_WORKERS,
+        thread_name_prefix="factcheck-evidence"
+    ))
+
+
+def get_internal_search_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool running the internal (BM25) searches of fact-checks
+
+    Separate from the evidence pool, so the one search per claim cannot
+    occupy the threads the external providers need.
+    """
+    return _get("internal_search_executor", lambda: ThreadPoolExecutor(
+        max_workers=get_settings().FACTCHECK_INTERNAL_SEARCH_WORKERS,
+        thread_name_prefix="factcheck-internal"
+    ))
+
+
+def warm_up() -> None:
+    """Create all resources now instead of in the first task"""
+    get_nlp()
+    get_db()
+    get_google_search()
+    get_bing_search()
+    get_eurostat_service()
+    get_ksh_service()
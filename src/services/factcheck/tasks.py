@@ -2,26 +2,36 @@
 Celery Tasks for Fact-checking
 """
 import logging
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from celery import shared_task
 from bson import ObjectId
 
-from src.models.database import connect_mongodb_sync
+from src.config.settings import get_settings
 from src.models.mongodb_models import Post
+from src.services.factcheck import registry
 from src.services.factcheck.factcheck_service import FactCheckService
+from src.services.search.rate_limiter import RateLimited
 
 logger = logging.getLogger(__name__)
 
+# Retries of a post whose web searches were rate limited
+MAX_RATE_LIMIT_RETRIES = 5
 
-@shared_task(name="factcheck.check_post")
+
+@shared_task(name="factcheck.check_post", bind=True, max_retries=MAX_RATE_LIMIT_RETRIES)
 def factcheck_post_task(
+    self,
     post_id: str,
     manual_sources: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Celery task to fact-check a post
     
+    When the web searches are rate limited the task is retried once the
+    budget allows it; the post stays pending meanwhile.
+    
     Args:
         post_id: Post ID to fact-check
         manual_sources: Optional list of manual source URLs
@@ -32,7 +42,7 @@ def factcheck_post_task(
     logger.info(f"Starting fact-check task for post {post_id}")
     
     try:
-        db = connect_mongodb_sync()
+        db = registry.get_db()
         
         # Get post
         post_doc = db.posts.find_one({"_id": ObjectId(post_id)})
@@ -76,6 +86,9 @@ def factcheck_post_task(
                 'error': error_msg
             }
         
+    except RateLimited as e:
+        logger.info(f"Fact-check of post {post_id} deferred: {e}")
+        raise self.retry(exc=e, countdown=max(1, round(e.retry_after)))
     except Exception as e:
         error_msg = f"Error in factcheck_post_task: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -87,12 +100,24 @@ def factcheck_post_task(
 
 
 @shared_task(name="factcheck.check_new_posts")
-def factcheck_new_posts_task(source_id: Optional[str] = None) -> Dict[str, Any]:
+def factcheck_new_posts_task(
+    source_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    after_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Celery task to fact-check all new posts (without fact-check results)
+    Celery task to fact-check a batch of new posts (without fact-check results)
+    
+    Only posts with a pending fact-check status are read. The position in the
+    pending queue is stored in the task_state collection, so consecutive runs
+    continue where the previous one stopped. When the web searches are rate
+    limited the batch stops there; the remaining posts stay pending and the
+    next run resumes with them.
     
     Args:
         source_id: Optional source ID to filter posts
+        limit: Maximum number of posts to check (default: FACTCHECK_BATCH_LIMIT)
+        after_id: Optional post ID to resume after (overrides the stored cursor)
         
     Returns:
         Dictionary with fact-check results
@@ -100,44 +125,50 @@ def factcheck_new_posts_task(source_id: Optional[str] = None) -> Dict[str, Any]:
     logger.info("Starting fact-check task for new posts")
     
     try:
-        db = connect_mongodb_sync()
+        db = registry.get_db()
         factcheck_service = FactCheckService()
+        limit = limit or get_settings().FACTCHECK_BATCH_LIMIT
         
-        # Find posts without fact-check results
-        # Get all post IDs that have fact-check results
-        checked_post_ids = {
-            result['post_id']
-            for result in db.factcheck_results.find({}, {'post_id': 1})
-        }
-        
-        # Build query
-        query = {}
-        if source_id:
-            query['source_id'] = source_id
+        # Resume from the stored cursor unless one was given
+        state_key = f"factcheck_new_posts:{source_id or 'all'}"
+        if after_id:
+            cursor = ObjectId(after_id)
+        else:
+            state = db.task_state.find_one({"_id": state_key})
+            cursor = state.get("cursor") if state else None
         
-        # Get unchecked posts
-        unchecked_posts = db.posts.find(query)
+        pending_posts, next_cursor = factcheck_service.get_pending_posts(
+            limit, source_id=source_id, after_id=cursor
+        )
+        if not pending_posts and cursor is not None:
+            # End of the queue reached, start over for posts that were left pending
+            cursor = None
+            pending_posts, next_cursor = factcheck_service.get_pending_posts(
+                limit, source_id=source_id
+            )
         
         results = {
             'total_posts': 0,
             'checked': 0,
             'failed': 0,
+            'deferred': 0,
             'post_results': []
         }
         
-        for post_doc in unchecked_posts:
-            post = Post.from_dict(post_doc)
+        # Run claim extraction for the whole batch at once
+        posts = [Post.from_dict(post_doc) for post_doc in pending_posts]
+        claims_per_post = factcheck_service.extract_claims_batch(posts)
+        
+        # Last post handled, where a run deferred by rate limits resumes
+        resume_after = cursor
+        for post, claims in zip(posts, claims_per_post):
             post_id_str = str(post._id)
             
-            # Skip if already checked
-            if post_id_str in checked_post_ids:
-                continue
-            
             results['total_posts'] += 1
             
             try:
                 # Fact-check post
-                result = factcheck_service.factcheck_post(post)
+                result = factcheck_service.factcheck_post(post, claims=claims)
                 
                 # Save result
                 saved = factcheck_service.save_factcheck_result(result)
@@ -158,6 +189,14 @@ def factcheck_new_posts_task(source_id: Optional[str] = None) -> Dict[str, Any]:
                         'error': 'Failed to save result'
                     })
                 
+            except RateLimited as e:
+                # The rest of the batch would be rate limited too: leave this
+                # post and the following ones pending, resume before them
+                logger.info(f"Fact-check batch stopped at post {post_id_str}: {e}")
+                results['total_posts'] -= 1
+                results['deferred'] = len(posts) - results['total_posts']
+                results['retry_after'] = round(e.retry_after, 1)
+                break
             except Exception as e:
                 logger.error(f"Error fact-checking post {post_id_str}: {e}")
                 results['failed'] += 1
@@ -166,6 +205,23 @@ def factcheck_new_posts_task(source_id: Optional[str] = None) -> Dict[str, Any]:
                     'success': False,
                     'error': str(e)
                 })
+            resume_after = post._id
+        
+        # A short batch means the end of the queue; the next run starts over
+        has_more = len(pending_posts) >= limit
+        if results['deferred']:
+            has_more = True
+            next_cursor = resume_after
+        db.task_state.update_one(
+            {"_id": state_key},
+            {"$set": {
+                "cursor": next_cursor if has_more else None,
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        results['has_more'] = has_more
+        results['next_cursor'] = str(next_cursor) if has_more and next_cursor else None
         
         logger.info(
             f"Fact-check task completed: "
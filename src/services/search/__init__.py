@@ -5,6 +5,12 @@ Provides search functionality for fact-checking using various search engines
 
 from .google_search import GoogleSearchService
 from .bing_search import BingSearchService
+from .post_search import PostSearchService
+from .bm25_index import BM25Index
+from .near_duplicates import NearDuplicateIndex
+from .search_cache import SearchCache
+from .rate_limiter import RateLimited, TokenBucketRateLimiter
 
-__all__ = ["GoogleSearchService", "BingSearchService"]
+__all__ = ["GoogleSearchService", "BingSearchService", "PostSearchService", "BM25Index", "SearchCache",
+           "TokenBucketRateLimiter", "RateLimited", "NearDuplicateIndex"]
 
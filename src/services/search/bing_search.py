@@ -6,9 +6,10 @@ import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import requests
-import time
 
 from src.config.settings import get_settings
+from src.services.search.rate_limiter import RateLimited, get_rate_limiter
+from src.services.search.search_cache import SearchCache
 
 logger = logging.getLogger(__name__)
 
@@ -21,28 +22,21 @@ class BingSearchService:
         self.api_key = os.getenv("BING_SEARCH_API_KEY", getattr(self.settings, "BING_SEARCH_API_KEY", None))
         self.base_url = "https://api.bing.microsoft.com/v7.0/search"
         self.max_results_per_query = 50
-        self.rate_limit_delay = 0.5  # seconds between requests
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter("bing")
+        self.cache = SearchCache("bing", ttl=self.settings.SEARCH_CACHE_TTL_BING)
     
     def is_configured(self) -> bool:
         """Check if Bing Search API is configured"""
         return bool(self.api_key)
     
-    def _rate_limit(self):
-        """Rate limiting to avoid exceeding API limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
-    
     def search(
         self,
         query: str,
         num_results: int = 10,
         market: str = "hu-HU",
         safe_search: str = "Strict",
-        freshness: Optional[str] = None
+        freshness: Optional[str] = None,
+        timeout: float = 10.0
     ) -> List[Dict[str, Any]]:
         """
         Perform a Bing search
@@ -53,22 +47,42 @@ class BingSearchService:
             market: Market code (e.g., 'hu-HU' for Hungary, 'en-US' for US)
             safe_search: Safe search setting ('Off', 'Moderate', 'Strict')
             freshness: Date filter ('Day', 'Week', 'Month', 'Year')
+            timeout: HTTP timeout in seconds
             
         Returns:
             List of search result dictionaries
+            
+        Raises:
+            RateLimited: When the shared request budget is used up
         """
         if not self.is_configured():
             logger.warning("Bing Search API not configured. Set BING_SEARCH_API_KEY")
             return []
         
+        # Limit num_results to API maximum
+        num_results = min(num_results, self.max_results_per_query)
+        
+        cache_params = {
+            "count": num_results,
+            "market": market,
+            "safe_search": safe_search,
+            "freshness": freshness,
+        }
+        cached = self.cache.get(query, cache_params)
+        if cached is not None:
+            logger.info(f"Bing Search: {len(cached)} cached results for query: {query}")
+            return cached
+        
+        # Over the shared budget: fail fast instead of waiting, so the caller
+        # can retry later rather than treat the query as having no results
+        allowed, retry_after = self.rate_limiter.acquire()
+        if not allowed:
+            logger.warning(f"Bing Search rate limited (retry in {retry_after:.1f}s): {query}")
+            raise RateLimited("bing", retry_after)
+        
         results = []
         
         try:
-            self._rate_limit()
-            
-            # Limit num_results to API maximum
-            num_results = min(num_results, self.max_results_per_query)
-            
             # Prepare headers
             headers = {
                 "Ocp-Apim-Subscription-Key": self.api_key
@@ -88,7 +102,7 @@ class BingSearchService:
                 params["freshness"] = freshness
             
             # Make API request
-            response = requests.get(self.base_url, headers=headers, params=params, timeout=10)
+            response = requests.get(self.base_url, headers=headers, params=params, timeout=timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -106,6 +120,7 @@ class BingSearchService:
                     })
             
             logger.info(f"Bing Search: Found {len(results)} results for query: {query}")
+            self.cache.set(query, cache_params, results)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Bing Search API error: {e}")
@@ -121,7 +136,8 @@ class BingSearchService:
         claim: str,
         keywords: List[str],
         num_results: int = 5,
-        market: str = "hu-HU"
+        market: str = "hu-HU",
+        timeout: float = 10.0
     ) -> List[Dict[str, Any]]:
         """
         Search for fact-checking references
@@ -131,9 +147,13 @@ class BingSearchService:
             keywords: Keywords extracted from the claim
             num_results: Number of results to return
             market: Market code
+            timeout: HTTP timeout in seconds
             
         Returns:
             List of reference dictionaries
+            
+        Raises:
+            RateLimited: When the shared request budget is used up
         """
         # Build search query from keywords and claim
         query_parts = []
@@ -155,7 +175,8 @@ class BingSearchService:
             query=query,
             num_results=num_results,
             market=market,
-            freshness="Year"  # Last year
+            freshness="Year",  # Last year
+            timeout=timeout
         )
         
         # Convert to reference format
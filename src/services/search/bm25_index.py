@@ -0,0 +1,307 @@
+"""
+BM25 Post Index
+Inverted index over post text stored in MongoDB, kept up to date at ingest
+and queried with BM25 scoring for fact-check reference retrieval
+"""
+import heapq
+import logging
+import math
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterable
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ExecutionTimeout
+
+from src.models.database import get_sync_db
+from src.models.indexes import ensure_indexes
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters (Robertson/Lucene defaults)
+K1 = 1.2
+B = 0.75
+
+# Terms in more than this share of the posts add little to the ranking but
+# have the longest posting lists, so they are left out of queries
+MAX_DOCUMENT_FREQUENCY_RATIO = 0.05
+MAX_QUERY_TERMS = 32
+# Posts read per query term at most (the newest ones)
+MAX_CANDIDATES_PER_TERM = 2000
+
+DUPLICATE_KEY_ERROR = 11000
+
+STATS_ID = "posts"
+
+# Frequent Hungarian function words (accent folded)
+STOPWORDS = frozenset({
+    "a", "az", "es", "is", "hogy", "nem", "egy", "de", "ez", "azt", "van",
+    "volt", "mint", "csak", "mar", "meg", "vagy", "ha", "pedig", "mert",
+    "aki", "ami", "amely", "ezt", "el", "fel", "ki", "be", "le", "the", "and",
+    "of", "to", "in",
+})
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_indexes_ensured = False
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms
+
+    Terms are lowercased and accent folded ("Közlöny" -> "kozlony"), so
+    queries match regardless of how accents were typed.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of terms in order of appearance
+    """
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return [
+        term for term in _TOKEN_PATTERN.findall(folded)
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+def post_terms(post: Dict[str, Any]) -> Counter:
+    """Term frequencies of the searchable text of a post document"""
+    metadata = post.get("metadata") or {}
+    return Counter(tokenize(" ".join(
+        part for part in (
+            post.get("title"),
+            metadata.get("description"),
+            post.get("content"),
+        ) if isinstance(part, str)
+    )))
+
+
+class BM25Index:
+    """
+    Inverted index of posts with BM25 ranking
+
+    Collections:
+        search_documents: one document per post (_id = post _id) with its
+            terms, their frequencies (tf) and the post length; the terms
+            index lists the posts of a term newest first
+        search_terms: document frequency per term (_id = term)
+        search_stats: number of indexed posts and their total length
+    """
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_sync_db()
+
+    def _ensure_indexes(self) -> None:
+        global _indexes_ensured
+        if not _indexes_ensured:
+            ensure_indexes(self.db, ["search_documents"])
+            _indexes_ensured = True
+
+    def index_posts(self, posts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add posts to the index
+
+        Each post is one inserted document; posts indexed before are
+        skipped, so indexing a post again does not change the statistics.
+
+        Args:
+            posts: Post documents with _id
+
+        Returns:
+            Number of posts added
+        """
+        self._ensure_indexes()
+
+        documents = []
+        for post in posts:
+            if post.get("_id") is None:
+                continue
+            terms = post_terms(post)
+            if not terms:
+                continue
+            documents.append({
+                "_id": post["_id"],
+                "terms": list(terms),
+                "tf": dict(terms),
+                "length": sum(terms.values()),
+            })
+
+        if not documents:
+            return 0
+
+        try:
+            self.db.search_documents.insert_many(documents, ordered=False)
+            new_documents = documents
+        except BulkWriteError as e:
+            errors = (e.details or {}).get("writeErrors", [])
+            failed = {error["index"] for error in errors}
+            new_documents = [document for index, document in enumerate(documents) if index not in failed]
+            unexpected = [error for error in errors if error.get("code") != DUPLICATE_KEY_ERROR]
+            if unexpected:
+                logger.warning(f"BM25 indexing: {len(unexpected)} posts not written")
+
+        new_terms = Counter(term for document in new_documents for term in document["terms"])
+        if new_terms:
+            self.db.search_terms.bulk_write([
+                UpdateOne({"_id": term}, {"$inc": {"df": count}}, upsert=True)
+                for term, count in new_terms.items()
+            ], ordered=False)
+        if new_documents:
+            self.db.search_stats.update_one(
+                {"_id": STATS_ID},
+                {"$inc": {
+                    "documents": len(new_documents),
+                    "total_length": sum(document["length"] for document in new_documents),
+                }},
+                upsert=True
+            )
+        return len(new_documents)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        exclude_ids: Optional[Iterable[Any]] = None,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the posts most relevant to a query
+
+        Terms are read rarest first and every post found is scored in full
+        from its own term frequencies. Reading stops (MaxScore) once a post
+        containing only the terms not read yet could not beat the current
+        top results, so frequent terms are usually never read. At most
+        MAX_CANDIDATES_PER_TERM posts, the newest, are read per term. When the
+        timeout runs out, the best posts read so far are returned.
+
+        Args:
+            query: Query text (e.g. a claim)
+            limit: Number of posts to return
+            exclude_ids: Post _ids to leave out (e.g. the post being checked)
+            timeout: Time budget in seconds (MongoDB maxTimeMS of the reads)
+
+        Returns:
+            List of {"post_id", "score", "relevance"} dictionaries, best first.
+            relevance is the score divided by the highest score any post
+            could reach for this query (0-1).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        stats = self.db.search_stats.find_one({"_id": STATS_ID}) if terms else None
+        if not stats or not stats.get("documents"):
+            return []
+
+        documents = stats["documents"]
+        average_length = stats["total_length"] / documents
+        frequencies = {
+            term_doc["_id"]: term_doc["df"]
+            for term_doc in self.db.search_terms.find({"_id": {"$in": terms}})
+        }
+        selective = {
+            term: df for term, df in frequencies.items()
+            if df / documents <= MAX_DOCUMENT_FREQUENCY_RATIO
+        }
+        # A query of common terms only is still answered
+        frequencies = selective or frequencies
+        if not frequencies:
+            return []
+
+        idf = {
+            term: math.log(1 + (documents - df + 0.5) / (df + 0.5))
+            for term, df in frequencies.items()
+        }
+        # Highest score a term can add to a post (tf -> infinity)
+        upper_bounds = {term: weight * (K1 + 1) for term, weight in idf.items()}
+        max_score = sum(upper_bounds.values())
+        remaining_bound = max_score
+
+        projection = {"length": 1, **{f"tf.{term}": 1 for term in idf}}
+        seen = {post_id for post_id in (exclude_ids or []) if post_id is not None}
+        deadline = time.monotonic() + timeout if timeout else None
+        top = []  # Min-heap of (score, post_id)
+        for term in sorted(idf, key=idf.get, reverse=True):
+            if len(top) >= limit and remaining_bound <= top[0][0]:
+                break
+            remaining_bound -= upper_bounds[term]
+
+            cursor = (
+                self.db.search_documents
+                .find({"terms": term}, projection)
+                .sort("_id", -1)
+                .limit(MAX_CANDIDATES_PER_TERM)
+            )
+            if deadline is not None:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    logger.warning(f"BM25 search out of time after {len(seen)} posts: {query[:80]}")
+                    break
+                cursor = cursor.max_time_ms(remaining_ms)
+            try:
+                for document in cursor:
+                    if document["_id"] in seen:
+                        continue
+                    seen.add(document["_id"])
+                    norm = K1 * (1 - B + B * document["length"] / average_length)
+                    score = sum(
+                        idf[post_term] * tf * (K1 + 1) / (tf + norm)
+                        for post_term, tf in document.get("tf", {}).items()
+                    )
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, document["_id"]))
+                    elif score > top[0][0]:
+                        heapq.heapreplace(top, (score, document["_id"]))
+            except ExecutionTimeout:
+                logger.warning(f"BM25 search out of time after {len(seen)} posts: {query[:80]}")
+                break
+
+        return [
+            {"post_id": post_id, "score": score, "relevance": min(score / max_score, 1.0)}
+            for score, post_id in sorted(top, key=lambda item: item[0], reverse=True)
+        ]
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        """
+        Drop the index and build it from all stored posts
+
+        Args:
+            batch_size: Posts per insert
+
+        Returns:
+            Number of indexed posts
+        """
+        self.db.search_documents.drop()
+        # Per-(term, post) postings of the previous index layout
+        self.db.search_postings.drop()
+        self.db.search_terms.drop()
+        self.db.search_stats.delete_one({"_id": STATS_ID})
+        global _indexes_ensured
+        _indexes_ensured = False
+
+        indexed = 0
+        batch = []
+        projection = {"title": 1, "content": 1, "metadata.description": 1}
+        for post in self.db.posts.find({}, projection).sort("_id", 1):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                self.index_posts(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            self.index_posts(batch)
+            indexed += len(batch)
+        logger.info(f"BM25 index rebuilt from {indexed} posts")
+        return indexed
+
+
+if __name__ == "__main__":
+    # python -m src.services.search.bm25_index --rebuild
+    logging.basicConfig(level=logging.INFO)
+    if "--rebuild" in sys.argv:
+        BM25Index().rebuild()
@@ -9,6 +9,8 @@ import requests
 from urllib.parse import quote_plus
 
 from src.config.settings import get_settings
+from src.services.search.rate_limiter import RateLimited, get_rate_limiter
+from src.services.search.search_cache import SearchCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,8 @@ class GoogleSearchService:
         self.search_engine_id = os.getenv("GOOGLE_SEARCH_ENGINE_ID", getattr(self.settings, "GOOGLE_SEARCH_ENGINE_ID", None))
         self.base_url = "https://www.googleapis.com/customsearch/v1"
         self.max_results_per_query = 10
-        self.rate_limit_delay = 1.0  # seconds between requests
+        self.rate_limiter = get_rate_limiter("google")
+        self.cache = SearchCache("google", ttl=self.settings.SEARCH_CACHE_TTL_GOOGLE)
     
     def is_configured(self) -> bool:
         """Check if Google Search API is configured"""
@@ -34,7 +37,8 @@ class GoogleSearchService:
         num_results: int = 10,
         language: str = "hu",
         date_restrict: Optional[str] = None,
-        site_search: Optional[str] = None
+        site_search: Optional[str] = None,
+        timeout: float = 10.0
     ) -> List[Dict[str, Any]]:
         """
         Perform a Google search
@@ -45,20 +49,42 @@ class GoogleSearchService:
             language: Language code (e.g., 'hu' for Hungarian, 'en' for English)
             date_restrict: Date restriction (e.g., 'd' for past day, 'w' for week, 'm' for month, 'y' for year)
             site_search: Restrict search to specific site (e.g., 'site:ksh.hu')
+            timeout: HTTP timeout in seconds
             
         Returns:
             List of search result dictionaries
+            
+        Raises:
+            RateLimited: When the shared request budget is used up
         """
         if not self.is_configured():
             logger.warning("Google Search API not configured. Set GOOGLE_SEARCH_API_KEY and GOOGLE_SEARCH_ENGINE_ID")
             return []
         
+        # Limit num_results to API maximum
+        num_results = min(num_results, self.max_results_per_query)
+        
+        cache_params = {
+            "num": num_results,
+            "language": language,
+            "date_restrict": date_restrict,
+            "site_search": site_search,
+        }
+        cached = self.cache.get(query, cache_params)
+        if cached is not None:
+            logger.info(f"Google Search: {len(cached)} cached results for query: {query}")
+            return cached
+        
+        # Over the shared budget: fail fast instead of waiting, so the caller
+        # can retry later rather than treat the query as having no results
+        allowed, retry_after = self.rate_limiter.acquire()
+        if not allowed:
+            logger.warning(f"Google Search rate limited (retry in {retry_after:.1f}s): {query}")
+            raise RateLimited("google", retry_after)
+        
         results = []
         
         try:
-            # Limit num_results to API maximum
-            num_results = min(num_results, self.max_results_per_query)
-            
             # Build search query
             search_query = query
             if site_search:
@@ -78,7 +104,7 @@ class GoogleSearchService:
                 params["dateRestrict"] = date_restrict
             
             # Make API request
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = requests.get(self.base_url, params=params, timeout=timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -96,6 +122,7 @@ class GoogleSearchService:
                     })
             
             logger.info(f"Google Search: Found {len(results)} results for query: {query}")
+            self.cache.set(query, cache_params, results)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Google Search API error: {e}")
@@ -109,7 +136,8 @@ class GoogleSearchService:
         claim: str,
         keywords: List[str],
         num_results: int = 5,
-        language: str = "hu"
+        language: str = "hu",
+        timeout: float = 10.0
     ) -> List[Dict[str, Any]]:
         """
         Search for fact-checking references
@@ -119,9 +147,13 @@ class GoogleSearchService:
             keywords: Keywords extracted from the claim
             num_results: Number of results to return
             language: Language code
+            timeout: HTTP timeout in seconds
             
         Returns:
             List of reference dictionaries
+            
+        Raises:
+            RateLimited: When the shared request budget is used up
         """
         # Build search query from keywords and claim
         query_parts = []
@@ -143,7 +175,8 @@ class GoogleSearchService:
             query=query,
             num_results=num_results,
             language=language,
-            date_restrict="y"  # Last year
+            date_restrict="y",  # Last year
+            timeout=timeout
         )
         
         # Convert to reference format
@@ -0,0 +1,284 @@
+"""
+Near-Duplicate Post Index
+MinHash signatures of post text with LSH bands stored in MongoDB; copies of
+the same story from different sources are grouped into clusters at ingest
+"""
+import hashlib
+import logging
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+import numpy as np
+from bson import Binary
+from pymongo import UpdateMany
+from pymongo.errors import BulkWriteError
+
+from src.config.settings import get_settings
+from src.models.database import get_sync_db
+from src.models.indexes import ensure_indexes
+from src.services.search.bm25_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+# Posts are compared when one of their bands (ROWS values of the signature)
+# is equal: likely from a Jaccard similarity of about
+# (1 / BANDS) ** (1 / ROWS) = 0.71 on, almost surely from 0.85 on
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+# Prime below 2**32, so permuted values fit 32 bits
+_PRIME = 4294967291
+
+
+def _permutation_coefficients() -> Tuple[np.ndarray, np.ndarray]:
+    # Derived from blake2b rather than a RNG so signatures never change
+    # between processes or numpy versions
+    values = [
+        int.from_bytes(hashlib.blake2b(f"minhash:{index}".encode(), digest_size=4).digest(), "big") >> 1
+        for index in range(2 * NUM_PERMUTATIONS)
+    ]
+    coefficients = np.array(values, dtype=np.uint64)
+    return coefficients[:NUM_PERMUTATIONS] | np.uint64(1), coefficients[NUM_PERMUTATIONS:]
+
+
+_A, _B = _permutation_coefficients()
+
+_indexes_ensured = False
+
+
+def signature_text(post: Dict[str, Any]) -> str:
+    """Text a post's signature is computed from (titles differ between outlets)"""
+    metadata = post.get("metadata") or {}
+    for text in (post.get("content"), metadata.get("description"), post.get("title")):
+        if isinstance(text, str) and text.strip():
+            return text
+    return ""
+
+
+def minhash(tokens: List[str]) -> Optional[np.ndarray]:
+    """
+    MinHash signature of the word shingles of a token list
+
+    Each shingle is hashed once (blake2b, stable across processes) and
+    permuted NUM_PERMUTATIONS times with (a * x + b) mod p; the signature is
+    the minimum per permutation. The share of equal values of two signatures
+    estimates the Jaccard similarity of the shingle sets.
+
+    Returns:
+        uint32 array of NUM_PERMUTATIONS values, None when there are fewer
+        tokens than a shingle
+    """
+    shingles = {
+        " ".join(tokens[position:position + SHINGLE_SIZE])
+        for position in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+    if not shingles:
+        return None
+    hashes = np.array(
+        [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "big")
+            for shingle in shingles
+        ],
+        dtype=np.uint64
+    )
+    permuted = (hashes[:, None] * _A + _B) % np.uint64(_PRIME)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_bands(signature: np.ndarray) -> List[str]:
+    """LSH band keys of a signature ("<band>:<hash of its rows>")"""
+    rows = signature.astype("<u4").tobytes()
+    return [
+        f"{band}:{hashlib.blake2b(rows[band * ROWS * 4:(band + 1) * ROWS * 4], digest_size=8).hexdigest()}"
+        for band in range(BANDS)
+    ]
+
+
+def _post_time(post_id) -> datetime:
+    """When a post was stored (ObjectId generation time, naive UTC)"""
+    if hasattr(post_id, "generation_time"):
+        return post_id.generation_time.replace(tzinfo=None)
+    return datetime.utcnow()
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(first == second)) / NUM_PERMUTATIONS
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate clusters of posts
+
+    Collection post_signatures holds one document per signed post: the
+    MinHash (binary), its band keys, and cluster_id, the _id of the first
+    post of the story, which represents the cluster. A new post joins the
+    cluster of the most similar post (at least NEAR_DUPLICATE_THRESHOLD)
+    sharing a band with it and stored within NEAR_DUPLICATE_WINDOW_DAYS
+    before it. Only the representative is fact-checked; the other posts are
+    marked as duplicates of it.
+    """
+
+    def __init__(self, db=None):
+        self.settings = get_settings()
+        self.db = db if db is not None else get_sync_db()
+
+    def _ensure_indexes(self) -> None:
+        global _indexes_ensured
+        if not _indexes_ensured:
+            ensure_indexes(self.db, ["post_signatures"])
+            _indexes_ensured = True
+
+    def _sign(self, posts: Iterable[Dict[str, Any]]) -> List[Tuple[Any, datetime, np.ndarray, List[str]]]:
+        signed = []
+        for post in posts:
+            if post.get("_id") is None:
+                continue
+            tokens = tokenize(signature_text(post))
+            if len(tokens) < self.settings.NEAR_DUPLICATE_MIN_TOKENS:
+                # Short posts look alike without being the same story
+                continue
+            signature = minhash(tokens)
+            if signature is not None:
+                signed.append((post["_id"], _post_time(post["_id"]), signature, signature_bands(signature)))
+        return signed
+
+    def assign_clusters(self, posts: Iterable[Dict[str, Any]]) -> Dict[Any, Any]:
+        """
+        Sign new posts and put each one into a cluster
+
+        Posts of the same batch can form a cluster too. Duplicates still
+        pending fact-checking get factcheck_status "duplicate" and
+        duplicate_of, the representative's post ID.
+
+        Args:
+            posts: Post documents with _id (stored in _id order)
+
+        Returns:
+            Dictionary of duplicate post _id -> representative post _id
+        """
+        self._ensure_indexes()
+        signed = self._sign(posts)
+        if not signed:
+            return {}
+
+        # The window is relative to each post's own time, so a rebuild
+        # clusters old posts the same way ingest did
+        window = timedelta(days=self.settings.NEAR_DUPLICATE_WINDOW_DAYS)
+        candidates = defaultdict(list)
+        for document in self.db.post_signatures.find(
+            {
+                "bands": {"$in": sorted({band for _, _, _, bands in signed for band in bands})},
+                "created_at": {
+                    "$gte": min(post_time for _, post_time, _, _ in signed) - window,
+                    "$lte": max(post_time for _, post_time, _, _ in signed),
+                },
+                "_id": {"$nin": [post_id for post_id, _, _, _ in signed]},
+            },
+            {"minhash": 1, "bands": 1, "cluster_id": 1, "created_at": 1}
+        ):
+            entry = (
+                document["created_at"],
+                np.frombuffer(document["minhash"], dtype="<u4"),
+                document["cluster_id"]
+            )
+            for band in document["bands"]:
+                candidates[band].append(entry)
+
+        threshold = self.settings.NEAR_DUPLICATE_THRESHOLD
+        documents = []
+        duplicates = {}
+        for post_id, post_time, signature, bands in signed:
+            since = post_time - window
+            best = None
+            for band in bands:
+                for created_at, candidate_signature, cluster_id in candidates.get(band, ()):
+                    if not since <= created_at <= post_time:
+                        continue
+                    score = similarity(signature, candidate_signature)
+                    # Most similar copy first, the oldest cluster on ties
+                    if score >= threshold and (best is None or (-score, cluster_id) < best):
+                        best = (-score, cluster_id)
+
+            cluster_id = best[1] if best else post_id
+            if best:
+                duplicates[post_id] = cluster_id
+            for band in bands:
+                candidates[band].append((post_time, signature, cluster_id))
+            documents.append({
+                "_id": post_id,
+                "minhash": Binary(signature.astype("<u4").tobytes()),
+                "bands": bands,
+                "cluster_id": cluster_id,
+                "created_at": post_time,
+            })
+
+        try:
+            self.db.post_signatures.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # Posts signed before (re-ingested) keep their cluster
+            logger.debug(f"Near-duplicate index: {len(e.details.get('writeErrors', []))} signatures existed")
+
+        if duplicates:
+            members = defaultdict(list)
+            for post_id, cluster_id in duplicates.items():
+                members[cluster_id].append(post_id)
+            self.db.posts.bulk_write([
+                UpdateMany(
+                    {"_id": {"$in": post_ids}, "factcheck_status": {"$in": [None, "pending"]}},
+                    {"$set": {"factcheck_status": "duplicate", "duplicate_of": str(cluster_id)}}
+                )
+                for cluster_id, post_ids in members.items()
+            ], ordered=False)
+            logger.info(f"Near-duplicate index: {len(duplicates)} of {len(signed)} posts joined a cluster")
+        return duplicates
+
+    def cluster_members(self, post_id, limit: int = 100) -> List[Any]:
+        """_ids of the other posts in the cluster of a post"""
+        signature = self.db.post_signatures.find_one({"_id": post_id}, {"cluster_id": 1})
+        if not signature:
+            return []
+        return [
+            document["_id"]
+            for document in self.db.post_signatures.find(
+                {"cluster_id": signature["cluster_id"], "_id": {"$ne": post_id}},
+                {"_id": 1}
+            ).limit(limit)
+        ]
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        """
+        Drop the signatures and cluster all stored posts again
+
+        Args:
+            batch_size: Posts signed per batch
+
+        Returns:
+            Number of posts that are duplicates of an earlier one
+        """
+        self.db.post_signatures.drop()
+        global _indexes_ensured
+        _indexes_ensured = False
+
+        duplicates = 0
+        batch = []
+        projection = {"title": 1, "content": 1, "metadata.description": 1}
+        for post in self.db.posts.find({}, projection).sort("_id", 1):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                duplicates += len(self.assign_clusters(batch))
+                batch = []
+        if batch:
+            duplicates += len(self.assign_clusters(batch))
+        logger.info(f"Near-duplicate index rebuilt: {duplicates} duplicates")
+        return duplicates
+
+
+if __name__ == "__main__":
+    # python -m src.services.search.near_duplicates --rebuild
+    logging.basicConfig(level=logging.INFO)
+    if "--rebuild" in sys.argv:
+        NearDuplicateIndex().rebuild()
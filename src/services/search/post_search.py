@@ -0,0 +1,85 @@
+"""
+Internal Post Search Service
+Full-text search over collected posts using the Hungarian text index
+"""
+import logging
+import re
+from typing import List, Dict, Any, Optional
+
+from src.models.database import get_sync_db
+
+logger = logging.getLogger(__name__)
+
+# Terms passed to $text; longer queries are cut (each term is an index lookup)
+MAX_QUERY_TERMS = 32
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_text_query(query: str) -> str:
+    """
+    Turn user input into a safe $text search string
+
+    Only word characters are kept, so the input can neither be a regex nor
+    use $text operators (phrases in quotes, negation with '-').
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        Space separated search terms (empty if the query has none)
+    """
+    return " ".join(_TERM_PATTERN.findall(query or "")[:MAX_QUERY_TERMS])
+
+
+class PostSearchService:
+    """
+    Relevance-ranked search over the posts collection
+
+    Backed by the posts_text index (see src/models/indexes.py): Hungarian
+    stemming, case and diacritic folding, title and description weighted
+    above the body.
+    """
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_sync_db()
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        exclude_ids: Optional[List[Any]] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search posts by relevance
+
+        Args:
+            query: User query (any text)
+            filters: Additional equality/range filters (e.g. {"source": "mti"})
+            limit: Maximum results
+            exclude_ids: Post _ids to leave out
+            projection: Optional projection (the score is always included)
+
+        Returns:
+            Matching post documents with a "score" field, best first
+        """
+        text_query = build_text_query(query)
+        if not text_query:
+            return []
+
+        search_filter = {"$text": {"$search": text_query}, **(filters or {})}
+        if exclude_ids:
+            search_filter["_id"] = {"$nin": list(exclude_ids)}
+
+        score = {"score": {"$meta": "textScore"}}
+        try:
+            return list(
+                self.db.posts.find(search_filter, {**(projection or {}), **score})
+                .sort([("score", {"$meta": "textScore"}), ("posted_at", -1)])
+                .limit(limit)
+            )
+        except Exception as e:
+            logger.error(f"Error searching posts for '{text_query}': {e}")
+            return []
@@ -0,0 +1,173 @@
+"""
+Search API Rate Limiter
+Token bucket and daily budget per external API, shared by all processes through Redis
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+
+from src.config.settings import get_settings
+from src.models.database import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rate_limit"
+
+# Refills the bucket from the Redis clock (the same for every worker host),
+# then takes one token if there is one and the daily budget is not used up.
+# Returns {allowed, seconds to wait}; -1 means the daily budget is exhausted.
+_ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local daily_limit = tonumber(ARGV[3])
+local day_ttl = tonumber(ARGV[4])
+
+if daily_limit > 0 then
+    local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if used >= daily_limit then
+        return {0, '-1'}
+    end
+end
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+if tokens < 1 then
+    return {0, tostring((1 - tokens) / rate)}
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+if daily_limit > 0 then
+    redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], day_ttl)
+end
+return {1, '0'}
+"""
+
+
+class RateLimited(Exception):
+    """A search was not sent because the API's shared budget is used up"""
+
+    def __init__(self, api: str, retry_after: float):
+        super().__init__(f"{api} search rate limited, retry in {retry_after:.1f}s")
+        self.api = api
+        self.retry_after = retry_after
+
+
+class TokenBucketRateLimiter:
+    """
+    Cluster-wide request budget of one external API
+
+    A token bucket (rate per second, burst) bounds the request rate of all
+    workers together, and a counter per UTC day bounds the daily quota.
+    acquire() never sleeps: it either takes a token or reports how long the
+    caller would have to wait, so workers can skip the call and move on.
+    When Redis is unavailable requests are allowed (fail open).
+    """
+
+    def __init__(
+        self,
+        api: str,
+        rate_per_second: float,
+        burst: int,
+        daily_limit: int = 0,
+        client=None
+    ):
+        self.api = api
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.daily_limit = daily_limit
+        self._client = client
+        self._script = None
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else get_redis_client()
+
+    def _keys(self, now: datetime) -> Tuple[str, str]:
+        return (
+            f"{KEY_PREFIX}:{self.api}:bucket",
+            f"{KEY_PREFIX}:{self.api}:day:{now.strftime('%Y%m%d')}",
+        )
+
+    @staticmethod
+    def _seconds_until_tomorrow(now: datetime) -> float:
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (tomorrow - now).total_seconds()
+
+    def acquire(self) -> Tuple[bool, float]:
+        """
+        Try to take one request from the budget
+
+        Returns:
+            (allowed, retry_after) where retry_after is the number of seconds
+            until a request could be allowed (0 when allowed)
+        """
+        if self.rate_per_second <= 0:
+            return True, 0.0
+
+        now = datetime.utcnow()
+        try:
+            client = self.client
+            if self._script is None or self._script.registered_client is not client:
+                self._script = client.register_script(_ACQUIRE_SCRIPT)
+            allowed, wait = self._script(
+                keys=list(self._keys(now)),
+                args=[self.rate_per_second, self.burst, self.daily_limit, 2 * 86400]
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter ({self.api}) unavailable, allowing request: {e}")
+            return True, 0.0
+
+        wait = float(wait)
+        if int(allowed):
+            return True, 0.0
+        if wait < 0:
+            return False, self._seconds_until_tomorrow(now)
+        return False, wait
+
+    def status(self) -> Dict[str, Any]:
+        """Today's usage of the daily budget"""
+        now = datetime.utcnow()
+        used = int(self.client.get(self._keys(now)[1]) or 0)
+        return {
+            "api": self.api,
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "daily_limit": self.daily_limit,
+            "used_today": used,
+            "remaining_today": max(self.daily_limit - used, 0) if self.daily_limit else None,
+        }
+
+
+_limiters: Dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(api: str) -> Optional[TokenBucketRateLimiter]:
+    """
+    Get the limiter of an API ("google" or "bing") configured in settings
+
+    Returns:
+        Limiter shared by the services of this process, None for unknown APIs
+    """
+    if api not in _limiters:
+        settings = get_settings()
+        prefix = f"{api.upper()}_SEARCH"
+        if not hasattr(settings, f"{prefix}_RATE_PER_SECOND"):
+            return None
+        _limiters[api] = TokenBucketRateLimiter(
+            api,
+            rate_per_second=getattr(settings, f"{prefix}_RATE_PER_SECOND"),
+            burst=getattr(settings, f"{prefix}_BURST"),
+            daily_limit=getattr(settings, f"{prefix}_DAILY_LIMIT")
+        )
+    return _limiters[api]
@@ -0,0 +1,133 @@
+"""
+Search Result Cache
+Redis cache shared by all processes in front of the paid Google and Bing APIs
+"""
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from typing import List, Dict, Any, Optional
+
+from src.config.settings import get_settings
+from src.models.database import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "search_cache"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for use in a cache key
+
+    Unicode is normalized (NFC), case is folded and whitespace collapsed, so
+    "Infláció  2023" and "infláció 2023" share one entry. Accents are kept,
+    since the search APIs treat them as significant.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", query or "")).strip().casefold()
+
+
+class SearchCache:
+    """
+    Cached search results per source (google, bing)
+
+    Keys are the normalized query plus all request parameters that change
+    the results. Empty results are cached too (negative caching), with a
+    shorter TTL. Hits, negative hits and misses are counted in Redis per
+    source. When Redis is unavailable the cache is bypassed.
+    """
+
+    def __init__(self, source: str, ttl: int, client=None):
+        self.settings = get_settings()
+        self.source = source
+        self.ttl = ttl
+        self.negative_ttl = min(self.settings.SEARCH_CACHE_NEGATIVE_TTL, ttl)
+        self.enabled = self.settings.SEARCH_CACHE_ENABLED
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else get_redis_client()
+
+    def make_key(self, query: str, params: Dict[str, Any]) -> str:
+        """Cache key of a query and its parameters"""
+        payload = json.dumps(
+            {"q": normalize_query(query), **params},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}:{self.source}:{digest}"
+
+    def get(self, query: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached results
+
+        Args:
+            query: Search query
+            params: Request parameters (language, date_restrict, market, ...)
+
+        Returns:
+            Cached result list (possibly empty), None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            cached = self.client.get(self.make_key(query, params))
+            if cached is None:
+                self._count("misses")
+                return None
+            results = json.loads(cached)
+            self._count("hits" if results else "negative_hits")
+            return results
+        except Exception as e:
+            logger.warning(f"Search cache ({self.source}) unavailable: {e}")
+            return None
+
+    def set(self, query: str, params: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        """
+        Store results of a successful request
+
+        Args:
+            query: Search query
+            params: Request parameters used in get()
+            results: Result list (an empty list is cached with the negative TTL)
+        """
+        if not self.enabled:
+            return
+        try:
+            self.client.set(
+                self.make_key(query, params),
+                json.dumps(results, ensure_ascii=False),
+                ex=self.ttl if results else self.negative_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Search cache ({self.source}) unavailable: {e}")
+
+    def _count(self, counter: str) -> None:
+        self.client.hincrby(STATS_KEY, f"{self.source}:{counter}", 1)
+
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters of the search cache, per source
+
+    Returns:
+        {"google": {"hits", "negative_hits", "misses", "hit_ratio"}, "bing": {...}}
+    """
+    raw = get_redis_client().hgetall(STATS_KEY) or {}
+    stats: Dict[str, Dict[str, Any]] = {}
+    for field, value in raw.items():
+        source, _, counter = field.partition(":")
+        stats.setdefault(source, {"hits": 0, "negative_hits": 0, "misses": 0})[counter] = int(value)
+    for counters in stats.values():
+        lookups = counters["hits"] + counters["negative_hits"] + counters["misses"]
+        counters["hit_ratio"] = round(
+            (counters["hits"] + counters["negative_hits"]) / lookups, 3
+        ) if lookups else 0.0
+    return stats
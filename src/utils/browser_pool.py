@@ -0,0 +1,260 @@
+"""
+Headless Chrome Pool
+Per-process pool of reusable Selenium WebDrivers for the scrapers
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from src.config.settings import get_settings
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def chrome_options(headless: bool = True) -> Options:
+    """Chrome options of the scrapers"""
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    # User agent to avoid detection
+    options.add_argument(f"user-agent={USER_AGENT}")
+    return options
+
+
+def start_chrome(headless: bool = True) -> webdriver.Chrome:
+    """Start a Chrome WebDriver with the scraper options"""
+    driver = webdriver.Chrome(options=chrome_options(headless))
+    # Hide navigator.webdriver on every page, not only the current one
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"}
+    )
+    return driver
+
+
+class PooledBrowser:
+    """A pooled WebDriver and its usage counters"""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pages = 0
+        self.started_at = time.monotonic()
+
+    def memory_mb(self) -> Optional[float]:
+        """Resident memory of chromedriver and its Chrome processes (None without psutil)"""
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(proc.memory_info().rss for proc in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def is_healthy(self) -> bool:
+        """Whether the browser still answers commands"""
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self) -> None:
+        """Forget the session of the last source: cookies, storage, cache and open page"""
+        origin = self.driver.execute_script("return window.location.origin")
+        if origin and origin.startswith("http"):
+            self.driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin",
+                {"origin": origin, "storageTypes": "all"}
+            )
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        self.driver.get("about:blank")
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser: {e}")
+
+
+class BrowserPool:
+    """
+    Bounded pool of headless Chrome browsers
+
+    Browsers are started on demand up to max_size and handed out with
+    borrow(); callers wait when all are in use. A returned browser is reset
+    (cookies, storage, cache) before the next source uses it, and replaced
+    when it failed its health check, served max_pages pages or uses more
+    than max_memory_mb. Like the HTTP engine, a forked process starts with
+    an empty pool.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2,
+        max_pages: int = 50,
+        max_memory_mb: int = 1024,
+        headless: bool = True,
+        borrow_timeout: float = 300.0
+    ):
+        self.max_size = max(1, max_size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.headless = headless
+        self.borrow_timeout = borrow_timeout
+        self._condition = threading.Condition()
+        self._idle: List[PooledBrowser] = []
+        self._size = 0
+        self._pid = os.getpid()
+        self.stats = {"started": 0, "recycled": 0, "borrowed": 0}
+
+    def _check_fork(self) -> None:
+        if self._pid != os.getpid():
+            # The parent's browsers belong to the parent process
+            self._idle = []
+            self._size = 0
+            self._pid = os.getpid()
+
+    def _acquire(self) -> PooledBrowser:
+        deadline = time.monotonic() + self.borrow_timeout
+        with self._condition:
+            self._check_fork()
+            while True:
+                while self._idle:
+                    browser = self._idle.pop()
+                    if browser.is_healthy():
+                        self.stats["borrowed"] += 1
+                        return browser
+                    logger.warning("Discarding unresponsive pooled browser")
+                    self._size -= 1
+                    threading.Thread(target=browser.quit, daemon=True).start()
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser available within {self.borrow_timeout}s")
+                self._condition.wait(remaining)
+
+        # Start Chrome outside the lock so other borrowers are not blocked
+        try:
+            browser = PooledBrowser(start_chrome(self.headless))
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats["started"] += 1
+            self.stats["borrowed"] += 1
+        return browser
+
+    def _should_recycle(self, browser: PooledBrowser) -> bool:
+        if browser.pages >= self.max_pages:
+            return True
+        memory = browser.memory_mb()
+        return memory is not None and memory > self.max_memory_mb
+
+    def _release(self, browser: PooledBrowser, failed: bool) -> None:
+        keep = False
+        if not failed and not self._should_recycle(browser):
+            try:
+                browser.reset()
+                keep = True
+            except Exception as e:
+                logger.warning(f"Error resetting pooled browser, recycling it: {e}")
+
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            if keep:
+                self._idle.append(browser)
+            else:
+                self._size -= 1
+                self.stats["recycled"] += 1
+            self._condition.notify()
+        if not keep:
+            browser.quit()
+
+    @contextmanager
+    def borrow(self):
+        """
+        Borrow a browser for one source
+
+        Yields:
+            PooledBrowser (count page loads in its pages attribute)
+        """
+        browser = self._acquire()
+        failed = False
+        try:
+            yield browser
+        except Exception:
+            # The page may have left the browser in a bad state
+            failed = not browser.is_healthy()
+            raise
+        finally:
+            self._release(browser, failed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool size and counters of this process"""
+        with self._condition:
+            return {
+                "pid": os.getpid(),
+                "max_size": self.max_size,
+                "open": self._size if self._pid == os.getpid() else 0,
+                "idle": len(self._idle) if self._pid == os.getpid() else 0,
+                **self.stats,
+            }
+
+    def close(self) -> None:
+        """Quit all idle browsers"""
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for browser in idle:
+            browser.quit()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the browser pool of this process"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = get_settings()
+                _pool = BrowserPool(
+                    max_size=settings.BROWSER_POOL_SIZE,
+                    max_pages=settings.BROWSER_MAX_PAGES,
+                    max_memory_mb=settings.BROWSER_MAX_MEMORY_MB,
+                    borrow_timeout=settings.BROWSER_BORROW_TIMEOUT
+                )
+    return _pool
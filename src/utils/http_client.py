@@ -0,0 +1,267 @@
+"""
+Shared HTTP Fetch Engine
+Async httpx client with pooled connections and a synchronous facade for the collectors
+"""
+import asyncio
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Union, Iterator
+from urllib.parse import urlparse
+
+import httpx
+
+from src.config.settings import get_settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; NincsenekFenyek/1.0; +https://github.com/nincsenekfenyek)"
+}
+
+
+class StreamedResponse:
+    """
+    Response whose body is read chunk by chunk from the engine loop
+
+    Status and headers are available right away (attributes of the
+    underlying httpx.Response); iter_bytes() pulls the decoded body.
+    """
+
+    def __init__(self, engine: "HttpFetchEngine", response: httpx.Response):
+        self._engine = engine
+        self.response = response
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def iter_bytes(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Yield the body as it arrives (stop iterating to abandon the rest)"""
+        chunks = self.response.aiter_bytes(chunk_size)
+
+        async def _next_chunk() -> Optional[bytes]:
+            try:
+                return await chunks.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        while True:
+            chunk = self._engine._submit(_next_chunk())
+            if chunk is None:
+                return
+            yield chunk
+
+
+class HttpFetchEngine:
+    """
+    Async fetch engine running on a dedicated event loop thread
+
+    One httpx.AsyncClient keeps connections alive per host (HTTP/2 when the
+    h2 package is installed). A global and a per-host semaphore bound the
+    number of requests in flight. The synchronous methods submit coroutines
+    to the loop thread, so existing blocking services can use the engine
+    unchanged.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 8,
+        timeout: float = 30.0,
+        http2: bool = True
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._pid = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_started(self):
+        """Start the loop thread (again after a fork)"""
+        if self._loop is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="http-fetch-engine",
+                daemon=True
+            )
+            thread.start()
+
+            async def _setup():
+                self._client = httpx.AsyncClient(
+                    http2=self.http2,
+                    timeout=self.timeout,
+                    headers=DEFAULT_HEADERS,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections
+                    )
+                )
+                self._global_semaphore = asyncio.Semaphore(self.max_connections)
+                self._host_semaphores = {}
+
+            asyncio.run_coroutine_threadsafe(_setup(), loop).result()
+            self._loop = loop
+            self._pid = os.getpid()
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter of the URL's host"""
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_semaphores[host]
+
+    async def request_async(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the engine loop
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx.AsyncClient.request (params, headers, timeout, ...)
+
+        Returns:
+            httpx.Response with the body read
+        """
+        async with self._global_semaphore, self._host_semaphore(url):
+            return await self._client.request(method, url, **kwargs)
+
+    async def _open_stream(self, url: str, **kwargs):
+        """Send a GET and return the response before its body is read"""
+        host_semaphore = self._host_semaphore(url)
+        await self._global_semaphore.acquire()
+        try:
+            await host_semaphore.acquire()
+        except BaseException:
+            self._global_semaphore.release()
+            raise
+        try:
+            request = self._client.build_request("GET", url, **kwargs)
+            return await self._client.send(request, stream=True), host_semaphore
+        except BaseException:
+            host_semaphore.release()
+            self._global_semaphore.release()
+            raise
+
+    async def _close_stream(self, response: httpx.Response, host_semaphore: asyncio.Semaphore):
+        try:
+            await response.aclose()
+        finally:
+            host_semaphore.release()
+            self._global_semaphore.release()
+
+    def _submit(self, coroutine):
+        """Run a coroutine on the engine loop and wait for its result"""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Blocking GET through the shared pool
+
+        Args:
+            url: Request URL
+            **kwargs: Passed to httpx (params, headers, timeout, ...)
+
+        Returns:
+            httpx.Response
+        """
+        return self._submit(self.request_async("GET", url, **kwargs))
+
+    @contextmanager
+    def stream(self, url: str, **kwargs):
+        """
+        Blocking streamed GET through the shared pool
+
+        The connection slot is held until the block exits; leaving early
+        closes the connection without downloading the rest of the body.
+
+        Args:
+            url: Request URL
+            **kwargs: Passed to httpx (params, headers, timeout, ...)
+
+        Yields:
+            StreamedResponse
+        """
+        response, host_semaphore = self._submit(self._open_stream(url, **kwargs))
+        try:
+            yield StreamedResponse(self, response)
+        finally:
+            self._submit(self._close_stream(response, host_semaphore))
+
+    def get_many(
+        self,
+        urls: List[str],
+        headers: Optional[List[Dict[str, str]]] = None,
+        **kwargs
+    ) -> List[Union[httpx.Response, Exception]]:
+        """
+        Fetch several URLs concurrently
+
+        Args:
+            urls: Request URLs
+            headers: Optional request headers per URL (same order as urls)
+            **kwargs: Passed to httpx for every request
+
+        Returns:
+            Responses (or the raised exception) in input order
+        """
+        if not urls:
+            return []
+        headers = headers or [{}] * len(urls)
+
+        async def _gather():
+            return await asyncio.gather(
+                *(
+                    self.request_async("GET", url, headers=url_headers, **kwargs)
+                    for url, url_headers in zip(urls, headers)
+                ),
+                return_exceptions=True
+            )
+
+        return self._submit(_gather())
+
+    def close(self):
+        """Close the client and stop the loop thread"""
+        if self._loop is None or self._pid != os.getpid():
+            return
+        self._submit(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+        self._client = None
+
+
+_engine: Optional[HttpFetchEngine] = None
+
+
+def get_http_engine() -> HttpFetchEngine:
+    """Get the process-wide fetch engine"""
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        _engine = HttpFetchEngine(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_connections_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            timeout=settings.HTTP_TIMEOUT,
+            http2=settings.HTTP_HTTP2
+        )
+    return _engine
@@ -0,0 +1,125 @@
+"""
+Streamed feed reads with a stored feed state
+
+Reading stops at a known entry only for newest-first feeds and never at a
+pinned first entry; the content hash always covers the same bytes.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from src.services.collection.news import rss_reader
+from src.services.collection.news.rss_reader import RSSReaderService
+
+FEED_URL = "https://example.hu/rss"
+START = datetime(2024, 12, 1, 8, 0)
+
+
+def rss(items, padding: int = 0) -> bytes:
+    """RSS body with (guid, hour offset) items in the given order"""
+    body = "".join(
+        f"<item><guid>item-{guid}</guid><title>Cikk {guid}</title>"
+        f"<link>https://example.hu/cikk/{guid}</link>"
+        f"<description>{'Szöveg. ' * padding}</description>"
+        f"<pubDate>{(START + timedelta(hours=hour)).strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate></item>"
+        for guid, hour in items
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Példa</title><link>https://example.hu/</link>{body}</channel></rss>"
+    ).encode("utf-8")
+
+
+class StubResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body: bytes, chunk_size: int):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.bytes_sent = 0
+
+    def raise_for_status(self):
+        pass
+
+    def iter_bytes(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[start:start + self.chunk_size]
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+
+class StubEngine:
+    """HTTP engine stub streaming one body in small chunks"""
+
+    def __init__(self, body: bytes, chunk_size: int = 256):
+        self.response = StubResponse(body, chunk_size)
+
+    @contextmanager
+    def stream(self, url, **kwargs):
+        yield self.response
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    monkeypatch.setattr(rss_reader, "get_sync_db", lambda: mongomock.MongoClient().nincsenekfenyek)
+    return RSSReaderService()
+
+
+def fetch(reader, monkeypatch, body: bytes, state):
+    engine = StubEngine(body)
+    monkeypatch.setattr(rss_reader, "get_http_engine", lambda: engine)
+    return reader._fetch_feed_stream(FEED_URL, max_items=50, timeout=10, state=state), engine.response
+
+
+def entry_guids(feed_data):
+    return [entry["entry_id"] for entry in feed_data["entries"]]
+
+
+def test_pinned_known_entry_does_not_end_the_read(reader, monkeypatch):
+    # Item 1 is pinned above the newest items; 5 and 6 are new
+    state = {"newest_first": True, "entry_ids": ["rss_item_1", "rss_item_4", "rss_item_3"]}
+    body = rss([(1, 0), (6, 6), (5, 5), (4, 4), (3, 3), (2, 2)])
+
+    feed_data, _ = fetch(reader, monkeypatch, body, state)
+
+    assert entry_guids(feed_data) == ["rss_item_6", "rss_item_5"]
+    assert feed_data["stopped"] == "known_entry"
+    assert feed_data["feed_state"]["newest_first"] is True
+
+
+def test_oldest_first_feed_is_read_in_full(reader, monkeypatch):
+    # States saved before the order was recorded are not newest-first
+    state = {"entry_ids": ["rss_item_1", "rss_item_2"]}
+    body = rss([(1, 1), (2, 2), (3, 3), (4, 4)])
+
+    feed_data, _ = fetch(reader, monkeypatch, body, state)
+
+    assert entry_guids(feed_data) == ["rss_item_3", "rss_item_4"]
+    assert feed_data["stopped"] == "end"
+    # Not stopped early until a read finds newest-first order
+    assert feed_data["feed_state"]["newest_first"] is False
+
+
+def test_early_stop_hashes_the_fixed_prefix(reader, monkeypatch):
+    monkeypatch.setattr(reader.settings, "FEED_HASH_BYTES", 4096)
+    items = [(guid, guid) for guid in range(40, 0, -1)]
+    state = {"newest_first": True, "entry_ids": [f"rss_item_{guid}" for guid in range(1, 39)]}
+
+    first, response = fetch(reader, monkeypatch, rss(items, padding=5), state)
+    assert entry_guids(first) == ["rss_item_40", "rss_item_39"]
+    # Read past the known entry up to the end of the hashed prefix only
+    assert 4096 <= response.bytes_sent < len(response.body)
+
+    # The same feed after one more entry was stored reads fewer entries
+    # but is still recognised as unchanged
+    state = {**state, **first["feed_state"], "entry_ids": state["entry_ids"] + ["rss_item_39"]}
+    second, _ = fetch(reader, monkeypatch, rss(items, padding=5), state)
+    assert second.get("not_modified") is True
+
+    # A new top entry changes the prefix
+    changed, _ = fetch(reader, monkeypatch, rss([(41, 41)] + items, padding=5), state)
+    assert entry_guids(changed) == ["rss_item_41", "rss_item_40"]
+    assert "not_modified" not in changed
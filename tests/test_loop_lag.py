@@ -0,0 +1,74 @@
+"""
+Event loop lag of handlers calling slow upstreams
+
+A handler awaiting a slow upstream through run_blocking must leave the loop
+free; one calling it directly blocks the loop for the whole call.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.concurrency import LoopLagMonitor, run_blocking
+from src.config.settings import get_settings
+
+UPSTREAM_DELAY = 0.5  # Seconds a stubbed upstream call takes
+CONCURRENT_REQUESTS = 8
+SAMPLE_INTERVAL = 0.02
+
+
+def slow_upstream(query: str) -> dict:
+    """Blocking upstream stub (stands in for requests/pymongo calls)"""
+    time.sleep(UPSTREAM_DELAY)
+    return {"query": query, "results": []}
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/offloaded")
+    async def offloaded(q: str):
+        return await run_blocking(slow_upstream, q)
+
+    @app.get("/blocking")
+    async def blocking(q: str):
+        return slow_upstream(q)
+
+    return app
+
+
+async def measure_max_lag(path: str, requests: int = CONCURRENT_REQUESTS) -> float:
+    """Max loop lag (seconds) while concurrent requests hit a handler"""
+    monitor = LoopLagMonitor(interval=SAMPLE_INTERVAL)
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        monitor.start()
+        # Let the monitor take a baseline sample first
+        await asyncio.sleep(SAMPLE_INTERVAL * 2)
+        responses = await asyncio.gather(*(
+            client.get(path, params={"q": f"claim {index}"})
+            for index in range(requests)
+        ))
+        await asyncio.sleep(SAMPLE_INTERVAL * 2)
+        await monitor.stop()
+
+    assert all(response.status_code == 200 for response in responses)
+    assert monitor.samples > 0
+    return monitor.max_lag
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_keeps_loop_lag_below_threshold():
+    max_lag = await measure_max_lag("/offloaded")
+
+    assert max_lag < get_settings().API_LOOP_LAG_WARNING
+
+
+@pytest.mark.asyncio
+async def test_blocking_handler_is_detected_as_loop_lag():
+    max_lag = await measure_max_lag("/blocking", requests=2)
+
+    # The monitor must see the blocked loop, or the test above proves nothing
+    assert max_lag >= UPSTREAM_DELAY * 0.8
@@ -0,0 +1,71 @@
+"""
+Magyar Közlöny page parsing
+
+Parse errors are logged and swallowed by the service, so these tests check
+that stored pages actually yield publications rather than just not raising.
+"""
+from pathlib import Path
+
+import pytest
+
+from src.services.collection.news import magyar_kozlony
+from src.services.collection.news.magyar_kozlony import MagyarKozlonyService
+
+FIXTURES = Path(__file__).parent / "fixtures" / "magyar_kozlony"
+
+
+class StubResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class StubEngine:
+    """HTTP engine stub serving a stored page for every URL"""
+
+    def __init__(self, page: str):
+        self.content = (FIXTURES / page).read_bytes()
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return StubResponse(self.content)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(magyar_kozlony, "get_sync_db", lambda: None)
+    return MagyarKozlonyService()
+
+
+def test_fetch_latest_publications_parses_listing(service, monkeypatch):
+    engine = StubEngine("listing.html")
+    monkeypatch.setattr(magyar_kozlony, "get_http_engine", lambda: engine)
+
+    publications = service.fetch_latest_publications(year=2024)
+
+    assert engine.urls == ["https://magyarkozlony.hu/?ev=2024"]
+    assert [publication["publication_number"] for publication in publications] == ["128/2024", "127/2024"]
+    first, second = publications
+    assert first["title"] == "Magyar Közlöny 2024. évi 128. szám"
+    assert first["link"] == "https://magyarkozlony.hu/dokumentumok/a1b2c3/megtekintes"
+    assert first["publication_id"] == "kozlony_128_2024"
+    assert first["publication_date"].date().isoformat() == "2024-12-27"
+    assert "Megjelent: 2024.12.27." in first["metadata"]["raw_text"]
+    assert second["metadata"]["is_pdf"]
+
+
+def test_fetch_publication_details_extracts_content(service, monkeypatch):
+    monkeypatch.setattr(magyar_kozlony, "get_http_engine", lambda: StubEngine("detail.html"))
+
+    details = service.fetch_publication_details("https://magyarkozlony.hu/dokumentumok/a1b2c3/megtekintes")
+
+    assert details is not None
+    assert details["full_content"] == (
+        "Magyar Közlöny 2024. évi 128. szám "
+        "A Kormány 412/2024. (XII. 27.) Korm. rendelete "
+        "a veszélyhelyzet ideje alatt alkalmazandó egyes szabályokról"
+    )
+    assert 'class="content"' in details["html_content"]
@@ -0,0 +1,109 @@
+"""
+Fact-check results of near-duplicate posts
+
+A copy of a story is clustered with the first post of it, only that post is
+fact-checked, and the API serves its result for the copy too.
+"""
+from datetime import datetime
+
+import httpx
+import mongomock
+import pytest
+from fastapi import FastAPI
+from mongomock_motor import AsyncMongoMockClient
+
+from src.api.routers import factcheck as factcheck_router
+from src.models.mongodb_models import Post
+from src.services.factcheck import registry
+from src.services.factcheck.factcheck_service import FactCheckService
+from src.services.search.near_duplicates import NearDuplicateIndex
+
+STORY = (
+    "A Központi Statisztikai Hivatal szerint az éves infláció novemberben 4,8 "
+    "százalék volt, ami két tizedszázalékponttal magasabb az októberinél, és "
+    "az élelmiszerek ára egy év alatt 5,3 százalékkal emelkedett, a háztartási "
+    "energia pedig 7,1 százalékkal drágult a tavalyi év azonos időszakához képest"
+)
+
+
+class UnconfiguredSearch:
+    def is_configured(self) -> bool:
+        return False
+
+
+class EmptyStatistics:
+    def search_for_statistics(self, keywords, max_results=10, timeout=None):
+        return []
+
+
+@pytest.fixture
+def client():
+    return mongomock.MongoClient()
+
+
+@pytest.fixture
+def db(client):
+    return client.nincsenekfenyek
+
+
+@pytest.fixture
+def service(db, monkeypatch):
+    monkeypatch.setattr(registry, "get_db", lambda: db)
+    monkeypatch.setattr(registry, "get_nlp", lambda: None)
+    monkeypatch.setattr(registry, "get_google_search", UnconfiguredSearch)
+    monkeypatch.setattr(registry, "get_bing_search", UnconfiguredSearch)
+    monkeypatch.setattr(registry, "get_eurostat_service", EmptyStatistics)
+    monkeypatch.setattr(registry, "get_ksh_service", EmptyStatistics)
+    return FactCheckService()
+
+
+@pytest.fixture
+def api(client, monkeypatch):
+    async_db = AsyncMongoMockClient(mock_mongo_client=client).nincsenekfenyek
+
+    async def get_mongodb():
+        return async_db
+
+    monkeypatch.setattr(factcheck_router, "get_mongodb", get_mongodb)
+    app = FastAPI()
+    app.include_router(factcheck_router.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def store_post(db, source_id: str, content: str) -> Post:
+    post = Post(source_id=source_id, content=content, posted_at=datetime.utcnow())
+    db.posts.insert_one({**post.to_dict(), "factcheck_status": "pending"})
+    return post
+
+
+@pytest.mark.asyncio
+async def test_duplicate_post_gets_result_of_its_representative(db, service, api):
+    original = store_post(db, "telex", STORY)
+    copy = store_post(db, "index", f"MTI: {STORY}.")
+
+    duplicates = NearDuplicateIndex(db).assign_clusters([original.to_dict(), copy.to_dict()])
+    assert duplicates == {copy._id: original._id}
+    assert db.posts.find_one({"_id": copy._id})["duplicate_of"] == str(original._id)
+
+    claims = [{"text": STORY, "type": "factual_claim", "entities": [], "numbers": ["4,8"], "confidence": 0.5}]
+    result = service.factcheck_post(original, claims=claims)
+    assert service.save_factcheck_result(result)
+
+    async with api:
+        original_response = await api.get(f"/api/factcheck/{original._id}")
+        copy_response = await api.get(f"/api/factcheck/{copy._id}")
+
+    assert original_response.status_code == 200
+    assert copy_response.status_code == 200
+    assert copy_response.json()["post_id"] == str(original._id)
+    assert copy_response.json() == original_response.json()
+
+
+@pytest.mark.asyncio
+async def test_post_without_result_or_representative_is_not_found(db, api):
+    post = store_post(db, "telex", STORY)
+
+    async with api:
+        response = await api.get(f"/api/factcheck/{post._id}")
+
+    assert response.status_code == 404
@@ -0,0 +1,56 @@
+"""
+Index coverage of the hot queries
+
+explain() needs a real MongoDB (mongomock has no query planner): set
+MONGODB_TEST_URL, e.g. mongodb://localhost:27017, to run these tests. Each
+run uses a throwaway database.
+"""
+import os
+import uuid
+
+import pytest
+from pymongo import MongoClient
+
+from src.models.indexes import HOT_QUERIES, ensure_indexes, verify_query_plans
+
+MONGODB_TEST_URL = os.getenv("MONGODB_TEST_URL")
+
+pytestmark = pytest.mark.skipif(not MONGODB_TEST_URL, reason="MONGODB_TEST_URL is not set")
+
+
+@pytest.fixture
+def db():
+    client = MongoClient(MONGODB_TEST_URL, serverSelectionTimeoutMS=5000)
+    name = f"nincsenekfenyek_test_{uuid.uuid4().hex[:8]}"
+    try:
+        yield client[name]
+    finally:
+        client.drop_database(name)
+        client.close()
+
+
+def test_hot_queries_use_an_index(db):
+    ensure_indexes(db)
+
+    failures = verify_query_plans(db, seed=True)
+
+    assert failures == []
+    # Placeholders used for the explain are removed again
+    assert all(db[name].count_documents({}) == 0 for name in {query["collection"] for query in HOT_QUERIES})
+
+
+def test_collection_scan_fails_verification(db):
+    ensure_indexes(db, ["posts"])
+    query = {"collection": "posts", "filter": {"not_indexed": "x"}, "sort": None}
+
+    failures = verify_query_plans(db, [query], seed=True)
+
+    assert [failure["reason"] for failure in failures] == ["collscan"]
+
+
+def test_empty_collection_is_not_verified(db):
+    query = {"collection": "posts", "filter": {"not_indexed": "x"}, "sort": None}
+
+    failures = verify_query_plans(db, [query])
+
+    assert [failure["reason"] for failure in failures] == ["not_verified"]